@@ -0,0 +1,7 @@
+"""
+Shared scraping toolkit for the GC-Internship scrapers.
+
+The per-intern folders each carry their own fetch -> extract -> save loop.
+This package collects the common pieces behind one interface so new
+scrapers (and the CLI in ``src.main``) can reuse them.
+"""
@@ -0,0 +1,463 @@
+"""
+SERP backends behind one interface.
+
+Every backend answers ``search(query, num, hl, gl, start)`` with rows in the
+shared result schema (see ``src.helpers.RESULT_FIELDS``) so callers do not
+care whether the page came from a browser or a paid API.
+"""
+
+import os
+from typing import Dict, List, Optional
+from urllib.parse import quote_plus
+
+from .helpers import make_result
+from .tracing import span
+
+
+class BackendError(Exception):
+    """Raised when a backend cannot answer a query."""
+
+
+class QuotaExhausted(BackendError):
+    """Raised when a backend has no requests left in its quota."""
+
+
+class CircuitOpen(BackendError):
+    """Raised instead of calling a backend whose circuit breaker is open."""
+
+
+class RequestRejected(BackendError):
+    """Raised when a backend refuses the request itself (HTTP 4xx); retrying will not help."""
+
+
+def _request_error(name: str, error: Exception) -> BackendError:
+    """BackendError for a failed HTTP request; client errors other than 429 are RequestRejected."""
+    status = getattr(getattr(error, "response", None), "status_code", None)
+    if status is not None and 400 <= status < 500 and status != 429:
+        return RequestRejected(f"{name}: {error}")
+    return BackendError(f"{name}: {error}")
+
+
+class SearchBackend:
+    """
+    Base class for SERP backends.
+
+    Subclasses implement ``_fetch``; ``fetch`` wraps it with quota
+    bookkeeping, waits for a slot from the optional ``scheduler`` (a
+    ``src.ratelimit.RateScheduler``, keyed by backend name), retries
+    through the optional ``retry`` policy and guards every attempt with the
+    optional ``breaker`` (``src.resilience.RetryPolicy`` and
+    ``CircuitBreaker``), and tags every row with the query and backend
+    name. ``search`` consults the optional ``cache`` (a
+    ``src.cache.SerpCache``) before doing any network or browser work.
+
+    Attributes:
+        name (str): Short identifier used by the router and in reports
+        cost_per_request (float): Price of one request in USD
+        expected_latency (float): Latency prior in seconds, used until
+            the router has measured the backend
+        max_per_request (int): Most results one request can return
+    """
+
+    name = "base"
+    cost_per_request = 0.0
+    expected_latency = 1.0
+    max_per_request = 10
+    cache = None
+    scheduler = None
+    retry = None
+    breaker = None
+
+    def __init__(self, quota: Optional[int] = None):
+        """
+        Args:
+            quota (int): Requests left for this backend, None for unlimited
+        """
+        self.quota = quota
+
+    def available(self) -> bool:
+        """
+        Return True while the backend still has quota left, here and in the
+        scheduler's daily ledger, and its circuit breaker lets calls through.
+        """
+        if self.breaker is not None and not self.breaker.allows():
+            return False
+        if self.scheduler is not None and self.scheduler.remaining(self.name) == 0:
+            return False
+        return self.quota is None or self.quota > 0
+
+    def search(self, query: str, num: int = 10, hl: str = "en", gl: str = "us", start: int = 0) -> List[Dict]:
+        """
+        Return one page of results for ``query``, from the cache if possible.
+
+        Args:
+            query (str): The search query
+            num (int): Number of results wanted
+            hl (str): Interface language
+            gl (str): Country of search
+            start (int): 0-based offset of the first result
+
+        Returns:
+            list: Result rows in the shared schema
+        """
+        rows = self.cached(query, num=num, hl=hl, gl=gl, start=start)
+        if rows is not None:
+            return rows
+        return self.fetch(query, num=num, hl=hl, gl=gl, start=start)
+
+    def cached(self, query: str, num: int = 10, hl: str = "en", gl: str = "us", start: int = 0) -> Optional[List[Dict]]:
+        """Rows from ``self.cache`` (a SerpCache) for this backend, or None."""
+        if self.cache is None:
+            return None
+        rows = self.cache.get(query, num=num, hl=hl, gl=gl, start=start, backend=self.name)
+        if rows is not None:
+            for row in rows:
+                row["query"] = query
+        return rows
+
+    def fetch(self, query: str, num: int = 10, hl: str = "en", gl: str = "us", start: int = 0) -> List[Dict]:
+        """Fetch from the network or browser, bypassing but filling the cache."""
+        if not self.available():
+            if self.breaker is not None and not self.breaker.allows():
+                raise CircuitOpen(f"{self.name}: circuit open")
+            raise QuotaExhausted(f"{self.name}: quota exhausted")
+        if self.retry is not None:
+            rows = self.retry.call(self._attempt, query, num, hl, gl, start)
+        else:
+            rows = self._attempt(query, num, hl, gl, start)
+        if self.quota is not None:
+            self.quota -= 1
+        for row in rows:
+            row["query"] = query
+            row["backend"] = self.name
+        if self.cache is not None and rows:
+            self.cache.put(query, rows, num=num, hl=hl, gl=gl, start=start, backend=self.name)
+        return rows
+
+    def _attempt(self, query, num, hl, gl, start):
+        """One request: admitted by the breaker, paced by the scheduler, its outcome fed back to the breaker."""
+        breaker = self.breaker
+        if breaker is not None:
+            breaker.before()
+        try:
+            if self.scheduler is not None:
+                with span("rate_wait", backend=self.name):
+                    self.scheduler.acquire(self.name)
+        except BaseException:
+            if breaker is not None:
+                breaker.cancel()
+            raise
+        try:
+            with span("fetch", backend=self.name, query=query, offset=start) as s:
+                rows = self._fetch(query, num=num, hl=hl, gl=gl, start=start)
+                s.set(rows=len(rows))
+        except Exception as e:
+            if breaker is not None:
+                breaker.failure(e)
+            raise
+        if breaker is not None:
+            breaker.success()
+        return rows
+
+    def _fetch(self, query: str, num: int, hl: str, gl: str, start: int) -> List[Dict]:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Release any resources held by the backend."""
+
+
+class SeleniumBackend(SearchBackend):
+    """
+    Scrape google.com with Chrome.
+
+    With a ``DriverPool`` each query leases a warm session from the pool;
+    without one the backend keeps a single session of its own across queries.
+    Time spent navigating, waiting for readiness and extracting is recorded
+    per phase in ``self.waits``, and bytes transferred per query in
+    ``self.network`` when the session has performance logging enabled.
+    With ``tabs`` set, requests for more than one page of results load
+    their pages in that many parallel tabs (``src.pagination``) instead of
+    scrolling one page.
+    """
+
+    name = "selenium"
+    cost_per_request = 0.0
+    expected_latency = 6.0
+    max_per_request = 100
+
+    def __init__(self, headless: bool = True, pool=None, quota: Optional[int] = None,
+                 page_load_strategy: str = "eager", quiet_ms: int = 200, block_resources=False,
+                 search_url: str = "https://www.google.com/search", tabs: int = 0):
+        """
+        Args:
+            headless (bool): Run Chrome without a window
+            pool (DriverPool): Pool to lease sessions from
+            quota (int): Requests left, None for unlimited
+            page_load_strategy (str): Passed to build_driver for the backend's own session
+            quiet_ms (int): DOM silence that counts as "results rendered"
+            block_resources (bool or list): Passed to build_driver for the backend's own session
+            search_url (str): Search endpoint, e.g. a src.replay.ReplayServer for offline runs
+            tabs (int): Tabs to load result pages in when ``num`` exceeds one page, 0 to scroll instead
+        """
+        from .network import NetworkMeter
+        from .waits import WaitRecorder
+
+        super().__init__(quota=quota)
+        self.headless = headless
+        self.pool = pool
+        self.page_load_strategy = page_load_strategy
+        self.quiet_ms = quiet_ms
+        self.block_resources = block_resources
+        self.search_url = search_url
+        self.tabs = tabs
+        self.waits = WaitRecorder()
+        self.network = NetworkMeter()
+        self.driver = None
+
+    def _fetch(self, query, num, hl, gl, start):
+        if self.pool is not None:
+            with self.pool.lease() as driver:
+                return self._scrape(driver, query, num, hl, gl, start)
+
+        from .driver import build_driver
+
+        if self.driver is None:
+            self.driver = build_driver(headless=self.headless, page_load_strategy=self.page_load_strategy,
+                                       block_resources=self.block_resources, performance_log=True)
+        return self._scrape(self.driver, query, num, hl, gl, start)
+
+    def _scrape(self, driver, query, num, hl, gl, start):
+        from .extract import extract_results
+        from .waits import wait_ready
+
+        if self.tabs and num > 10:
+            return self._scrape_tabs(driver, query, num, hl, gl, start)
+        url = (
+            f"{self.search_url}?q={quote_plus(query)}"
+            f"&hl={hl}&gl={gl}&start={start}&num={num}&pws=0"
+        )
+        self.network.drain(driver)
+        with self.waits.phase("navigate"):
+            driver.get(url)
+        wait_ready(driver, selector="#search h3", quiet_ms=self.quiet_ms, recorder=self.waits)
+        with self.waits.phase("extract"):
+            if num > 10:
+                # Later results only appear as the page is scrolled.
+                from .scroll import iter_scroll_results
+
+                rows = list(iter_scroll_results(driver, limit=num, quiet_ms=self.quiet_ms))
+            else:
+                rows = extract_results(driver, limit=num)
+        self.network.collect(driver)
+        for row in rows:
+            row["position"] += start
+        return rows
+
+    def _scrape_tabs(self, driver, query, num, hl, gl, start):
+        from .pagination import fetch_pages_in_tabs
+
+        self.network.drain(driver)
+        with self.waits.phase("tabs"):
+            rows = fetch_pages_in_tabs(driver, query, pages=-(-num // 10), max_tabs=self.tabs, hl=hl, gl=gl,
+                                       start=start, search_url=self.search_url, recorder=self.waits)[:num]
+        self.network.collect(driver)
+        for row in rows:
+            row["position"] += start
+        return rows
+
+    def close(self):
+        if self.driver is not None:
+            self.driver.quit()
+            self.driver = None
+
+
+class PlaywrightBackend(SearchBackend):
+    """
+    Scrape google.com in Playwright browser contexts.
+
+    Queries run in fresh contexts of a shared ``PlaywrightEngine`` instead of
+    a Chrome process per session, so many concurrent batch workers cost a
+    few browser processes. One page per request (no scrolling), so at most
+    ``num`` results from the first page of the given ``start``.
+    """
+
+    name = "playwright"
+    cost_per_request = 0.0
+    expected_latency = 4.0
+    max_per_request = 10
+
+    def __init__(self, headless: bool = True, engine=None, processes: int = 1, contexts_per_process: int = 8,
+                 quota: Optional[int] = None, quiet_ms: int = 200, block_resources=False,
+                 search_url: str = "https://www.google.com/search"):
+        """
+        Args:
+            headless (bool): Run Chromium without a window
+            engine (PlaywrightEngine): Engine to share, started on first use; one is built from
+                the other arguments if omitted and closed with the backend
+            processes (int): Chromium processes of the backend's own engine
+            contexts_per_process (int): Concurrent contexts per process of the backend's own engine
+            quota (int): Requests left, None for unlimited
+            quiet_ms (int): DOM silence that counts as "results rendered"
+            block_resources (bool or list): Resource blocking of the backend's own engine
+            search_url (str): Search endpoint, e.g. a src.replay.ReplayServer for offline runs
+        """
+        from .waits import WaitRecorder
+
+        super().__init__(quota=quota)
+        self.owns_engine = engine is None
+        if engine is None:
+            from .playwright_engine import PlaywrightEngine
+
+            engine = PlaywrightEngine(processes=processes, contexts_per_process=contexts_per_process,
+                                      headless=headless, block_resources=block_resources)
+        self.engine = engine
+        self.quiet_ms = quiet_ms
+        self.search_url = search_url
+        self.waits = WaitRecorder()
+
+    def available(self):
+        import importlib.util
+
+        return importlib.util.find_spec("playwright") is not None and super().available()
+
+    def _fetch(self, query, num, hl, gl, start):
+        url = (
+            f"{self.search_url}?q={quote_plus(query)}"
+            f"&hl={hl}&gl={gl}&start={start}&num={num}&pws=0"
+        )
+        rows = self.engine.fetch(url, limit=num, quiet_ms=self.quiet_ms, recorder=self.waits)
+        for row in rows:
+            row["position"] += start
+        return rows
+
+    def close(self):
+        if self.owns_engine:
+            self.engine.close()
+
+
+class SerpApiBackend(SearchBackend):
+    """Google results through SerpAPI (https://serpapi.com)."""
+
+    name = "serpapi"
+    cost_per_request = 0.015
+    expected_latency = 1.5
+    max_per_request = 100
+    base_url = "https://serpapi.com/search.json"
+    account_url = "https://serpapi.com/account.json"
+
+    def __init__(self, api_key: Optional[str] = None, quota: Optional[int] = None, timeout: float = 15):
+        """
+        Args:
+            api_key (str): SerpAPI key, defaults to the SERPAPI_API_KEY env var
+            quota (int): Searches left on the account, None for unlimited
+            timeout (float): HTTP timeout in seconds
+        """
+        super().__init__(quota=quota)
+        self.api_key = api_key or os.getenv("SERPAPI_API_KEY")
+        self.timeout = timeout
+
+    def available(self):
+        return bool(self.api_key) and super().available()
+
+    def refresh_quota(self) -> Optional[int]:
+        """Read the remaining searches from the SerpAPI account endpoint."""
+        import requests
+
+        resp = requests.get(self.account_url, params={"api_key": self.api_key}, timeout=self.timeout)
+        resp.raise_for_status()
+        left = resp.json().get("total_searches_left")
+        if left is not None:
+            self.quota = int(left)
+        return self.quota
+
+    def _fetch(self, query, num, hl, gl, start):
+        import requests
+
+        params = {
+            "engine": "google",
+            "q": query,
+            "num": num,
+            "start": start,
+            "hl": hl,
+            "gl": gl,
+            "api_key": self.api_key,
+        }
+        try:
+            resp = requests.get(self.base_url, params=params, timeout=self.timeout)
+            resp.raise_for_status()
+        except requests.RequestException as e:
+            raise _request_error(self.name, e) from e
+        with span("parse", backend=self.name):
+            return self.parse_response(resp.json(), start=start)
+
+    @staticmethod
+    def parse_response(data: Dict, start: int = 0) -> List[Dict]:
+        """Convert a SerpAPI JSON response to result rows."""
+        rows = []
+        for i, item in enumerate(data.get("organic_results") or [], 1):
+            snippet = item.get("snippet") or item.get("rich_snippet", {}).get("top", {}).get("text")
+            rows.append(make_result(item.get("position") or start + i, item.get("title"), item.get("link"), snippet))
+        return rows
+
+
+class CustomSearchBackend(SearchBackend):
+    """Google Custom Search JSON API, as used by prime-sequence/search-api.sh."""
+
+    name = "customsearch"
+    cost_per_request = 0.005
+    expected_latency = 0.5
+    max_per_request = 10
+    base_url = "https://www.googleapis.com/customsearch/v1"
+
+    def __init__(self, api_key: Optional[str] = None, cx: Optional[str] = None,
+                 quota: Optional[int] = 100, timeout: float = 15):
+        """
+        Args:
+            api_key (str): API key, defaults to the GOOGLE_CSE_KEY env var
+            cx (str): Search engine id, defaults to the GOOGLE_CSE_CX env var
+            quota (int): Requests left today (the free tier allows 100)
+            timeout (float): HTTP timeout in seconds
+        """
+        super().__init__(quota=quota)
+        self.api_key = api_key or os.getenv("GOOGLE_CSE_KEY")
+        self.cx = cx or os.getenv("GOOGLE_CSE_CX")
+        self.timeout = timeout
+
+    def available(self):
+        return bool(self.api_key and self.cx) and super().available()
+
+    def _fetch(self, query, num, hl, gl, start):
+        import requests
+
+        params = {
+            "key": self.api_key,
+            "cx": self.cx,
+            "q": query,
+            "num": min(num, self.max_per_request),
+            "start": start + 1,
+            "hl": hl,
+            "gl": gl,
+        }
+        try:
+            resp = requests.get(self.base_url, params=params, timeout=self.timeout)
+            resp.raise_for_status()
+        except requests.RequestException as e:
+            raise _request_error(self.name, e) from e
+        with span("parse", backend=self.name):
+            return self.parse_response(resp.json(), start=start)
+
+    @staticmethod
+    def parse_response(data: Dict, start: int = 0) -> List[Dict]:
+        """Convert a Custom Search JSON response to result rows."""
+        return [
+            make_result(start + i, item.get("title"), item.get("link"), item.get("snippet"))
+            for i, item in enumerate(data.get("items") or [], 1)
+        ]
+
+
+BACKENDS = {
+    SeleniumBackend.name: SeleniumBackend,
+    PlaywrightBackend.name: PlaywrightBackend,
+    SerpApiBackend.name: SerpApiBackend,
+    CustomSearchBackend.name: CustomSearchBackend,
+}
@@ -0,0 +1,215 @@
+"""
+Batch mode: run many queries across a bounded number of browser workers.
+
+Queries are read from a file (one per line) or stdin, fanned out to
+``workers`` threads and streamed back in input order as soon as every
+earlier query has finished, so output starts long before the batch ends.
+
+The search function can be any existing single-query scraper, loaded by
+path, e.g. ``Sagnik_Dey/scrape.py:scrape_google`` or
+``Sagar_Bawankule/google_scraper.py:GoogleScraper.search_google`` (one
+instance per worker thread). Duplicate queries in a batch are fetched once.
+"""
+
+import copy
+import importlib.util
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+from .helpers import normalize_query
+from .tracing import span
+
+
+def read_queries(source: str = "-") -> List[str]:
+    """
+    Read queries one per line; blank lines and ``#`` comments are skipped.
+
+    Args:
+        source (str): Path to a text file, or "-" for stdin
+    """
+    if source == "-":
+        lines = sys.stdin.read().splitlines()
+    else:
+        with open(source, encoding="utf-8") as f:
+            lines = f.read().splitlines()
+    return [line.strip() for line in lines if line.strip() and not line.lstrip().startswith("#")]
+
+
+def load_module(path: str):
+    """
+    Import a scraper script by file path, with its folder on ``sys.path``
+    so its sibling imports (``from utils import ...``) resolve.
+    """
+    module_name = "scraper_" + os.path.splitext(os.path.basename(path))[0].replace("-", "_").replace(" ", "_")
+    module_spec = importlib.util.spec_from_file_location(module_name, path)
+    if module_spec is None:
+        raise ValueError(f"cannot load {path!r}")
+    module = importlib.util.module_from_spec(module_spec)
+    sys.path.insert(0, os.path.dirname(os.path.abspath(path)))
+    try:
+        module_spec.loader.exec_module(module)
+    finally:
+        sys.path.pop(0)
+    return module
+
+
+def load_search_function(spec: str, **kwargs) -> Callable[[str], List[Dict]]:
+    """
+    Load a scraper entry point from a ``path/to/file.py:name`` spec.
+
+    ``name`` is either a function taking the query as first argument or
+    ``Class.method``; for the latter each calling thread gets its own
+    instance so every worker drives its own browser.
+
+    Args:
+        spec (str): "file.py:function" or "file.py:Class.method"
+        **kwargs: Extra keyword arguments passed on every call
+
+    Returns:
+        callable: fn(query) -> list of result rows
+    """
+    path, _, attr = spec.rpartition(":")
+    if not path or not attr:
+        raise ValueError(f"expected 'file.py:function', got {spec!r}")
+    module = load_module(path)
+
+    if "." not in attr:
+        fn = getattr(module, attr)
+        return lambda query: fn(query, **kwargs)
+
+    class_name, method_name = attr.split(".", 1)
+    cls = getattr(module, class_name)
+    local = threading.local()
+
+    def call(query):
+        if not hasattr(local, "instance"):
+            local.instance = cls()
+        return getattr(local.instance, method_name)(query, **kwargs)
+
+    return call
+
+
+class BatchStats:
+    """Aggregate counters for one batch run."""
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.finished = None
+        self.queries = 0
+        self.failed = 0
+        self.results = 0
+        self.deduplicated = 0
+
+    @property
+    def elapsed(self) -> float:
+        end = self.finished if self.finished is not None else time.monotonic()
+        return end - self.started
+
+    @property
+    def queries_per_min(self) -> float:
+        return self.queries / self.elapsed * 60 if self.elapsed > 0 else 0.0
+
+    def summary(self) -> Dict:
+        return {
+            "queries": self.queries,
+            "failed": self.failed,
+            "results": self.results,
+            "deduplicated": self.deduplicated,
+            "elapsed_s": round(self.elapsed, 2),
+            "queries_per_min": round(self.queries_per_min, 1),
+        }
+
+
+class BatchItem:
+    """Outcome of one query in a batch."""
+
+    def __init__(self, index: int, query: str, results: Optional[List[Dict]] = None,
+                 error: Optional[BaseException] = None, elapsed: float = 0.0):
+        self.index = index
+        self.query = query
+        self.results = results or []
+        self.error = error
+        self.elapsed = elapsed
+
+
+def run_batch(queries: Iterable[str], search_fn: Callable[[str], List[Dict]], workers: int = 4,
+              stats: Optional[BatchStats] = None, dedupe: bool = True) -> Iterator[BatchItem]:
+    """
+    Run ``search_fn`` over ``queries`` with at most ``workers`` in flight.
+
+    Items are yielded strictly in input order; each is yielded as soon as
+    it and every query before it have finished. A failing query yields an
+    item with ``error`` set instead of stopping the batch.
+
+    Args:
+        queries (iterable): Queries to run
+        search_fn (callable): fn(query) -> list of result rows
+        workers (int): Number of concurrent workers (browsers)
+        stats (BatchStats): Counters to update, created if omitted
+        dedupe (bool): Fetch each normalized query once; later duplicates
+            (case, whitespace or URL-encoding variants) reuse its result
+
+    Yields:
+        BatchItem: One per query, in input order
+    """
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+    stats = stats if stats is not None else BatchStats()
+
+    def run_one(index, query):
+        t0 = time.monotonic()
+        try:
+            with span("query", query=query):
+                results = search_fn(query)
+            return BatchItem(index, query, results, elapsed=time.monotonic() - t0)
+        except Exception as e:
+            return BatchItem(index, query, error=e, elapsed=time.monotonic() - t0)
+
+    # Keep a bounded window of submitted work so a slow head query cannot
+    # make the backlog of finished-but-unyielded results grow without limit.
+    window = workers * 2
+    pending = {}
+    first_of = {}
+    resolved = {}
+    source = enumerate(queries)
+    next_index = 0
+    exhausted = False
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        while True:
+            while not exhausted and len(pending) < window:
+                try:
+                    index, query = next(source)
+                except StopIteration:
+                    exhausted = True
+                    break
+                key = normalize_query(query)
+                if dedupe and key in first_of:
+                    # The original precedes this index, so its item is
+                    # resolved by the time this one is yielded.
+                    pending[index] = (query, key)
+                    continue
+                first_of[key] = index
+                pending[index] = executor.submit(run_one, index, query)
+            if next_index not in pending:
+                break
+            entry = pending.pop(next_index)
+            if isinstance(entry, tuple):
+                query, key = entry
+                original = resolved[key]
+                item = BatchItem(next_index, query, copy.deepcopy(original.results), original.error)
+                stats.deduplicated += 1
+            else:
+                item = entry.result()
+                if dedupe:
+                    resolved[normalize_query(item.query)] = item
+            next_index += 1
+            stats.queries += 1
+            stats.results += len(item.results)
+            if item.error is not None:
+                stats.failed += 1
+            yield item
+    stats.finished = time.monotonic()
@@ -0,0 +1,358 @@
+"""
+Benchmarks for the scraping pipeline.
+
+Usage:
+    python -m src.bench extract --url "https://www.google.com/search?q=python" --repeat 5
+    python -m src.bench extract --html saved_serp.html --repeat 20
+    python -m src.bench parse --pages tests/fixtures/serp --repeat 50
+    python -m src.bench compare --pages tests/fixtures/serp --repeat 20
+    python -m src.bench engines --pages tests/fixtures/serp --queries 64 --concurrency 8
+"""
+
+import argparse
+import glob
+import math
+import os
+import statistics
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Tuple
+
+
+def count_commands(driver) -> Dict[str, int]:
+    """
+    Count WebDriver commands sent by ``driver`` from now on.
+
+    WebElement calls go through their parent driver's ``execute``, so
+    wrapping it on the instance counts every chromedriver round-trip.
+    """
+    counter = {"commands": 0}
+    original = driver.execute
+
+    def execute(command, params=None):
+        counter["commands"] += 1
+        return original(command, params)
+
+    driver.execute = execute
+    return counter
+
+
+def time_calls(fn: Callable[[], List], repeat: int) -> Dict:
+    """Run ``fn`` ``repeat`` times and summarize the wall times."""
+    times = []
+    rows = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        rows = fn()
+        times.append(time.perf_counter() - t0)
+    return {
+        "median_ms": round(statistics.median(times) * 1000, 2),
+        "min_ms": round(min(times) * 1000, 2),
+        "max_ms": round(max(times) * 1000, 2),
+        "results": len(rows),
+        "rows": rows,
+    }
+
+
+def bench_extract(args) -> Dict[str, Dict]:
+    """Compare script vs per-element extraction on the same loaded page."""
+    from .driver import build_driver
+    from .extract import extract_results
+
+    driver = build_driver(headless=not args.headed)
+    try:
+        driver.get(args.url or "file://" + os.path.abspath(args.html))
+        counter = count_commands(driver)
+        report = {}
+        for mode in ("elements", "script"):
+            counter["commands"] = 0
+            stats = time_calls(lambda: extract_results(driver, limit=args.limit, mode=mode), args.repeat)
+            stats["commands_per_page"] = counter["commands"] // args.repeat
+            report[mode] = stats
+    finally:
+        driver.quit()
+
+    same = [(r["title"], r["link"]) for r in report["elements"]["rows"]] == \
+        [(r["title"], r["link"]) for r in report["script"]["rows"]]
+    print(f"{'mode':<10}{'median ms':>12}{'min ms':>10}{'max ms':>10}{'commands':>10}{'results':>9}")
+    for mode, s in report.items():
+        print(f"{mode:<10}{s['median_ms']:>12}{s['min_ms']:>10}{s['max_ms']:>10}"
+              f"{s['commands_per_page']:>10}{s['results']:>9}")
+    speedup = report["elements"]["median_ms"] / max(report["script"]["median_ms"], 1e-6)
+    print(f"[INFO] script mode is {speedup:.1f}x faster; identical results: {same}")
+    return report
+
+
+def load_pages(path: str) -> List[str]:
+    """Read one .html file, or every .html file below a directory."""
+    if os.path.isdir(path):
+        files = sorted(glob.glob(os.path.join(path, "**", "*.html"), recursive=True))
+    else:
+        files = [path]
+    pages = []
+    for name in files:
+        with open(name, encoding="utf-8", errors="replace") as f:
+            pages.append(f.read())
+    return pages
+
+
+def bench_parse(args) -> Dict[str, Dict]:
+    """Parser throughput in pages/sec for each installed HTML engine."""
+    from .parsers import available_parsers, get_parser
+
+    pages = load_pages(args.pages)
+    if not pages:
+        raise SystemExit(f"no .html pages found in {args.pages}")
+    engines = available_parsers() if args.engine == "all" else [args.engine]
+
+    report = {}
+    for name in engines:
+        parse = get_parser(name)
+        results = sum(len(parse(html)) for html in pages)
+        t0 = time.perf_counter()
+        for _ in range(args.repeat):
+            for html in pages:
+                parse(html)
+        elapsed = time.perf_counter() - t0
+        report[name] = {
+            "pages_per_sec": round(len(pages) * args.repeat / elapsed, 1),
+            "ms_per_page": round(elapsed / (len(pages) * args.repeat) * 1000, 3),
+            "results": results,
+        }
+
+    print(f"[INFO] {len(pages)} pages, {args.repeat} passes")
+    print(f"{'engine':<12}{'pages/sec':>12}{'ms/page':>10}{'results':>9}")
+    for name, s in report.items():
+        print(f"{name:<12}{s['pages_per_sec']:>12}{s['ms_per_page']:>10}{s['results']:>9}")
+    return report
+
+
+def measure(extract: Callable, target, repeat: int):
+    """
+    Run ``extract(target)`` once to warm up (lazy imports, caches), once
+    under tracemalloc for its peak Python heap, then ``repeat`` times for
+    the wall time.
+
+    Returns:
+        tuple: (rows, seconds for the timed runs, peak bytes)
+    """
+    extract(target)
+    tracemalloc.start()
+    try:
+        rows = extract(target)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        extract(target)
+    return rows, time.perf_counter() - t0, peak
+
+
+def bench_compare(args) -> Dict[str, Dict]:
+    """Every extraction strategy in src.extractors on the same recorded pages."""
+    from .extractors import ADAPTERS, field_completeness
+    from .replay import ReplayServer, load_corpus, score
+
+    pages = load_corpus(args.pages)
+    if not pages:
+        raise SystemExit(f"no .html pages found in {args.pages}")
+    names = args.adapter or list(ADAPTERS)
+    loaded = {}
+    for name in names:
+        adapter = ADAPTERS[name]
+        if adapter.kind == "driver" and args.no_browser:
+            continue
+        try:
+            loaded[name] = adapter.load()
+        except ImportError as e:
+            print(f"[INFO] skipping {name}: {e}")
+
+    stats = {name: {"seconds": 0.0, "peak": 0, "rows": [], "recall": []} for name in loaded}
+
+    def run(name, target, page):
+        try:
+            rows, seconds, peak = measure(loaded[name], target, args.repeat)
+        except Exception as e:
+            print(f"[ERROR] {name} on {page.name}: {e}")
+            rows, seconds, peak = [], 0.0, 0
+        s = stats[name]
+        s["seconds"] += seconds
+        s["peak"] = max(s["peak"], peak)
+        s["rows"].extend(rows)
+        if page.expected is not None:
+            s["recall"].append(score(rows, page.expected)["recall"])
+
+    for page in pages:
+        for name in loaded:
+            if ADAPTERS[name].kind == "html":
+                run(name, page.html, page)
+
+    if any(ADAPTERS[name].kind == "driver" for name in loaded):
+        from .driver import build_driver
+
+        driver = build_driver(headless=not args.headed)
+        try:
+            with ReplayServer(args.pages) as server:
+                for page in pages:
+                    driver.get(f"{server.base_url}/pages/{page.name}.html")
+                    for name in loaded:
+                        if ADAPTERS[name].kind == "driver":
+                            run(name, driver, page)
+        finally:
+            driver.quit()
+
+    report = {}
+    for name, s in stats.items():
+        runs = len(pages) * args.repeat
+        report[name] = {
+            "kind": ADAPTERS[name].kind,
+            "pages_per_sec": round(runs / s["seconds"], 1) if s["seconds"] else 0.0,
+            "peak_kb": round(s["peak"] / 1024, 1),
+            "results": len(s["rows"]),
+            "recall": round(sum(s["recall"]) / len(s["recall"]), 3) if s["recall"] else None,
+            "complete": field_completeness(s["rows"]),
+        }
+
+    print(f"[INFO] {len(pages)} pages, {args.repeat} passes; peak memory is the Python heap only")
+    print(f"{'adapter':<18}{'kind':<8}{'pages/sec':>11}{'peak KB':>9}{'results':>9}{'recall':>8}"
+          f"{'title':>7}{'link':>6}{'snippet':>9}")
+    for name, r in sorted(report.items(), key=lambda kv: -kv[1]["pages_per_sec"]):
+        c = r["complete"]
+        recall = "-" if r["recall"] is None else r["recall"]
+        print(f"{name:<18}{r['kind']:<8}{r['pages_per_sec']:>11}{r['peak_kb']:>9}{r['results']:>9}{recall:>8}"
+              f"{c['title']:>7}{c['link']:>6}{c['snippet']:>9}")
+    return report
+
+
+def _engine_backend(name: str, args, search_url: str) -> Tuple:
+    """(backend, warm, close) for one fetch engine pointed at ``search_url``."""
+    if name == "selenium":
+        from .backends import SeleniumBackend
+        from .pool import DriverPool
+
+        pool = DriverPool(size=args.concurrency, headless=not args.headed, page_load_strategy="eager",
+                          block_resources=args.block_resources)
+        backend = SeleniumBackend(pool=pool, search_url=search_url)
+        return backend, pool.warm, pool.close
+    from .backends import PlaywrightBackend
+    from .playwright_engine import PlaywrightEngine
+
+    engine = PlaywrightEngine(processes=args.processes,
+                              contexts_per_process=math.ceil(args.concurrency / args.processes),
+                              headless=not args.headed, block_resources=args.block_resources)
+    backend = PlaywrightBackend(engine=engine, search_url=search_url)
+    return backend, engine.start, engine.close
+
+
+def bench_engines(args) -> Dict[str, Dict]:
+    """
+    Selenium (a Chrome process per worker) vs Playwright (contexts in shared
+    processes) on the same recorded SERPs served from a local ReplayServer.
+
+    Both engines are started before the clock runs, so the figures are
+    steady-state throughput. CPU is read from /proc for this process and
+    every browser process below it, exited renderers included.
+    """
+    from .batch import BatchStats, run_batch
+    from .pool import process_tree_cpu
+    from .replay import ReplayServer, load_corpus
+
+    pages = [page for page in load_corpus(args.pages) if page.start == 0]
+    if not pages:
+        raise SystemExit(f"no first-page .html pages found in {args.pages}")
+    queries = [pages[i % len(pages)].query for i in range(args.queries)]
+
+    report = {}
+    with ReplayServer(args.pages) as server:
+        for name in args.engine or ["selenium", "playwright"]:
+            try:
+                backend, warm, close = _engine_backend(name, args, server.search_url)
+                warm()
+            except Exception as e:
+                print(f"[INFO] skipping {name}: {e}")
+                continue
+            try:
+                stats = BatchStats()
+                cpu0 = process_tree_cpu(os.getpid())
+                t0 = time.perf_counter()
+                items = run_batch(queries, lambda q: backend.fetch(q, num=10),
+                                  workers=args.concurrency, stats=stats, dedupe=False)
+                errors = [item.error for item in items if item.error is not None]
+                wall = time.perf_counter() - t0
+                cpu1 = process_tree_cpu(os.getpid())
+            finally:
+                backend.close()
+                close()
+            if errors:
+                print(f"[ERROR] {name}: {len(errors)} failed queries, first: {errors[0]}")
+            cpu = None if cpu0 is None else cpu1 - cpu0
+            report[name] = {
+                "queries": stats.queries,
+                "failed": stats.failed,
+                "results": stats.results,
+                "wall_s": round(wall, 2),
+                "cpu_s": None if cpu is None else round(cpu, 2),
+                "queries_per_sec": round(stats.queries / wall, 2) if wall else 0.0,
+                "queries_per_sec_per_core": round(stats.queries / cpu, 2) if cpu else None,
+            }
+
+    print(f"[INFO] {len(queries)} queries over {len(pages)} recorded pages, {args.concurrency} concurrent; "
+          f"{os.cpu_count()} cores")
+    print(f"{'engine':<12}{'queries':>8}{'failed':>8}{'wall s':>8}{'cpu s':>8}{'q/sec':>8}{'q/sec/core':>12}")
+    for name, r in report.items():
+        per_core = "-" if r["queries_per_sec_per_core"] is None else r["queries_per_sec_per_core"]
+        cpu = "-" if r["cpu_s"] is None else r["cpu_s"]
+        print(f"{name:<12}{r['queries']:>8}{r['failed']:>8}{r['wall_s']:>8}{cpu:>8}"
+              f"{r['queries_per_sec']:>8}{per_core:>12}")
+    return report
+
+
+def parse_args(argv=None):
+    p = argparse.ArgumentParser(description="Benchmarks for the shared scraper")
+    sub = p.add_subparsers(dest="command", required=True)
+
+    ex = sub.add_parser("extract", help="Script vs per-element DOM extraction")
+    page = ex.add_mutually_exclusive_group(required=True)
+    page.add_argument("--url", help="Live SERP URL to load once")
+    page.add_argument("--html", help="Saved SERP HTML file to load once")
+    ex.add_argument("--repeat", type=int, default=5, help="Extractions per mode")
+    ex.add_argument("--limit", type=int, default=10, help="Results per extraction")
+    ex.add_argument("--headed", action="store_true", help="Show the browser window")
+    ex.set_defaults(func=bench_extract)
+
+    pa = sub.add_parser("parse", help="Offline HTML parser throughput")
+    pa.add_argument("--pages", required=True, help="Recorded SERP .html file or directory")
+    pa.add_argument("--engine", default="all", help="Parser engine name, or 'all' installed engines")
+    pa.add_argument("--repeat", type=int, default=20, help="Passes over the page set")
+    pa.set_defaults(func=bench_parse)
+
+    co = sub.add_parser("compare", help="All extraction strategies on the same recorded pages")
+    co.add_argument("--pages", required=True, help="Recorded SERP corpus directory (see src.replay)")
+    co.add_argument("--adapter", action="append", help="Adapter from src.extractors (repeatable, default all)")
+    co.add_argument("--repeat", type=int, default=20, help="Timed runs per page")
+    co.add_argument("--no-browser", action="store_true", help="Only run adapters that need no browser")
+    co.add_argument("--headed", action="store_true", help="Show the browser window")
+    co.set_defaults(func=bench_compare)
+
+    en = sub.add_parser("engines", help="Selenium vs Playwright queries/sec/core on recorded pages")
+    en.add_argument("--pages", required=True, help="Recorded SERP corpus directory (see src.replay)")
+    en.add_argument("--engine", action="append", choices=["selenium", "playwright"],
+                    help="Engine to run (repeatable, default both)")
+    en.add_argument("--queries", type=int, default=64, help="Queries per engine, cycling over the corpus")
+    en.add_argument("--concurrency", type=int, default=8,
+                    help="Concurrent queries: Selenium sessions, or Playwright contexts in total")
+    en.add_argument("--processes", type=int, default=1, help="Playwright browser processes")
+    en.add_argument("--block-resources", action="store_true", help="Block images, fonts, media and trackers")
+    en.add_argument("--headed", action="store_true", help="Show the browser windows")
+    en.set_defaults(func=bench_engines)
+    return p.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    main()
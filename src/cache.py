@@ -0,0 +1,203 @@
+"""
+Persistent on-disk SERP response cache.
+
+Entries are content addressed by a SHA-256 of the normalized request
+(query, hl, gl, start, backend) and stored in a single SQLite file, so the
+cache survives between runs and is shared by every worker thread. Entries
+older than ``ttl`` seconds are treated as misses, and once the cache grows
+past ``max_bytes`` the least recently used entries are evicted.
+
+Usage:
+    cache = SerpCache(".cache/serp.sqlite", ttl=24 * 3600)
+    rows = cache.get("python", backend="serpapi")
+    if rows is None:
+        rows = fetch(...)
+        cache.put("python", rows, backend="serpapi")
+    print(cache.stats())
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .helpers import normalize_query
+
+DEFAULT_CACHE_PATH = os.path.join(".cache", "serp.sqlite")
+
+
+def cache_key(query: str, hl: str = "en", gl: str = "us", start: int = 0, backend: str = "") -> str:
+    """Content address of a request; equal for case and whitespace variants of a query."""
+    payload = json.dumps(
+        {"q": normalize_query(query), "hl": hl.lower(), "gl": gl.lower(), "start": int(start), "backend": backend},
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SerpCache:
+    """SQLite backed result cache with TTL, LRU size cap and hit/miss stats."""
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, ttl: Optional[float] = 24 * 3600,
+                 max_bytes: Optional[int] = 256 * 1024 * 1024):
+        """
+        Args:
+            path (str): SQLite file, or ":memory:"
+            ttl (float): Seconds an entry stays fresh, None for no expiry
+            max_bytes (int): Evict least recently used entries above this size, None for no cap
+        """
+        folder = os.path.dirname(path)
+        if path != ":memory:" and folder:
+            os.makedirs(folder, exist_ok=True)
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            """CREATE TABLE IF NOT EXISTS entries (
+                   key TEXT PRIMARY KEY,
+                   payload TEXT NOT NULL,
+                   num INTEGER NOT NULL,
+                   size INTEGER NOT NULL,
+                   created REAL NOT NULL,
+                   accessed REAL NOT NULL
+               )"""
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)")
+        self._db.commit()
+        # Running payload total, so a put only scans the table when it has to evict.
+        self._bytes = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        self.hits = self.misses = self.expired = self.evictions = self.puts = 0
+
+    def get(self, query: str, num: int = 10, hl: str = "en", gl: str = "us", start: int = 0,
+            backend: str = "") -> Optional[List[Dict]]:
+        """
+        Return cached rows, or None on a miss.
+
+        An entry only satisfies requests for at most as many results as it
+        was stored with.
+        """
+        hit = self.lookup(query, [backend], num=num, hl=hl, gl=gl, start=start)
+        return hit[1] if hit else None
+
+    def lookup(self, query: str, backends: List[str], num: int = 10, hl: str = "en", gl: str = "us",
+               start: int = 0) -> Optional[Tuple[str, List[Dict]]]:
+        """
+        Return ``(backend, rows)`` for the first backend with a fresh entry.
+
+        Counts as a single hit or miss however many backends are checked.
+        """
+        now = time.time()
+        with self._lock:
+            for backend in backends:
+                key = cache_key(query, hl, gl, start, backend)
+                row = self._db.execute("SELECT payload, num, created, size FROM entries WHERE key = ?",
+                                       (key,)).fetchone()
+                if row is None or row[1] < num:
+                    continue
+                payload, _, created, size = row
+                if self.ttl is not None and now - created > self.ttl:
+                    self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+                    self._db.commit()
+                    self._bytes -= size
+                    self.expired += 1
+                    continue
+                self._db.execute("UPDATE entries SET accessed = ? WHERE key = ?", (now, key))
+                self._db.commit()
+                self.hits += 1
+                return backend, json.loads(payload)[:num]
+            self.misses += 1
+        return None
+
+    def put(self, query: str, rows: List[Dict], num: int = 10, hl: str = "en", gl: str = "us", start: int = 0,
+            backend: str = "") -> None:
+        """Store the rows returned for a request of ``num`` results."""
+        key = cache_key(query, hl, gl, start, backend)
+        payload = json.dumps(rows, ensure_ascii=False)
+        size = len(payload.encode("utf-8"))
+        now = time.time()
+        with self._lock:
+            old = self._db.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries (key, payload, num, size, created, accessed) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, payload, int(num), size, now, now),
+            )
+            self._bytes += size - (old[0] if old else 0)
+            self.puts += 1
+            self._evict()
+            self._db.commit()
+
+    def _evict(self) -> None:
+        if self.max_bytes is None or self._bytes <= self.max_bytes:
+            return
+        # Recount before evicting: other processes may share the file.
+        self._bytes = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if self._bytes <= self.max_bytes:
+            return
+        victims = []
+        for key, size in self._db.execute("SELECT key, size FROM entries ORDER BY accessed ASC"):
+            if self._bytes <= self.max_bytes:
+                break
+            victims.append((key,))
+            self._bytes -= size
+        self._db.executemany("DELETE FROM entries WHERE key = ?", victims)
+        self.evictions += len(victims)
+
+    def purge_expired(self) -> int:
+        """Delete every expired entry; returns how many were removed."""
+        if self.ttl is None:
+            return 0
+        cutoff = time.time() - self.ttl
+        with self._lock:
+            freed = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries WHERE created < ?",
+                                     (cutoff,)).fetchone()[0]
+            cur = self._db.execute("DELETE FROM entries WHERE created < ?", (cutoff,))
+            self._db.commit()
+            self._bytes -= freed
+            return cur.rowcount
+
+    def stats(self) -> Dict:
+        with self._lock:
+            entries, size = self._db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+            lookups = self.hits + self.misses
+            return {
+                "entries": entries,
+                "bytes": size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "expired": self.expired,
+                "evictions": self.evictions,
+                "puts": self.puts,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+def cached_search(cache: SerpCache, search_fn: Callable[[str], List[Dict]], backend: str,
+                  num: int = 10) -> Callable[[str], List[Dict]]:
+    """
+    Wrap a plain ``fn(query)`` scraper (e.g. one loaded by src.batch) with ``cache``.
+
+    Args:
+        cache (SerpCache): Cache to consult and fill
+        search_fn (callable): fn(query) -> list of result rows
+        backend (str): Name the entries are stored under, e.g. the scraper spec
+        num (int): Result count the entries are stored with
+    """
+    def search(query):
+        rows = cache.get(query, num=num, backend=backend)
+        if rows is None:
+            rows = search_fn(query)
+            if rows:
+                cache.put(query, rows, num=num, backend=backend)
+        return rows
+
+    return search
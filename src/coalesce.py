@@ -0,0 +1,85 @@
+"""
+In-flight request coalescing.
+
+When several workers ask for the same (normalized) request at the same
+time, only the first one fetches; the others wait for it. Every caller,
+the first included, receives its own copy of the result, so callers may
+change their rows freely. Batch-level duplicate removal lives in ``src.batch.run_batch``.
+
+Usage:
+    flight = SingleFlight()
+    rows = flight.do(normalize_query(query), lambda: backend.search(query))
+    print(flight.stats())
+"""
+
+import copy
+import threading
+from typing import Callable, Dict, Hashable, List
+
+from .helpers import normalize_query
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Run at most one call per key at a time and share its outcome."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.executed = 0
+        self.shared = 0
+
+    def do(self, key: Hashable, fn: Callable):
+        """
+        Call ``fn()`` unless a call for ``key`` is already running, in which
+        case wait for it. Every caller gets a deep copy of the result.
+
+        Exceptions raised by the running call are re-raised in every waiter.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executed += 1
+            else:
+                self.shared += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return copy.deepcopy(call.result)
+
+        try:
+            call.result = fn()
+            # Waiters copy call.result once done is set; nobody gets the shared object.
+            return copy.deepcopy(call.result)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"executed": self.executed, "shared": self.shared}
+
+
+def coalesced(search_fn: Callable[[str], List[Dict]], flight: SingleFlight = None) -> Callable[[str], List[Dict]]:
+    """Wrap ``fn(query)`` so concurrent calls for equivalent queries share one fetch."""
+    flight = flight if flight is not None else SingleFlight()
+
+    def search(query):
+        return flight.do(normalize_query(query), lambda: search_fn(query))
+
+    search.flight = flight
+    return search
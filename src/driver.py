@@ -0,0 +1,163 @@
+"""
+Chrome WebDriver construction shared by the Selenium based backends.
+
+Most intern scrapers call ``ChromeDriverManager().install()`` on every
+launch, which probes the Chrome version (and sometimes the network) before
+the browser even starts. ``resolve_driver_path`` does that once: the
+resolved chromedriver binary is remembered for the process and in
+``.cache/chromedriver.json`` across runs, and only re-resolved when the
+binary disappears or no longer matches the installed Chrome.
+"""
+
+import json
+import os
+import shutil
+import threading
+import time
+from typing import Optional
+
+DEFAULT_DRIVER_CACHE = os.path.join(".cache", "chromedriver.json")
+
+DEFAULT_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)
+
+
+def build_options(headless: bool = True, window_size: str = "1400,900", user_agent: str = DEFAULT_USER_AGENT,
+                  page_load_strategy: str = "normal", performance_log: bool = False):
+    """
+    Build the Chrome options used by every scraper in this package.
+
+    Args:
+        headless (bool): Run Chrome without a window
+        window_size (str): Window size as "width,height"
+        user_agent (str): User agent string sent with every request
+        page_load_strategy (str): "normal" waits for the load event, "eager"
+            returns at DOMContentLoaded (pair it with src.waits), "none"
+            returns immediately
+        performance_log (bool): Record DevTools network events so
+            src.network.NetworkMeter can count transferred bytes
+
+    Returns:
+        selenium.webdriver.ChromeOptions: Configured options
+    """
+    from selenium import webdriver
+
+    options = webdriver.ChromeOptions()
+    if headless:
+        options.add_argument("--headless=new")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument(f"--window-size={window_size}")
+    options.add_argument("--disable-blink-features=AutomationControlled")
+    if user_agent:
+        options.add_argument(f"user-agent={user_agent}")
+    options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    options.add_experimental_option("useAutomationExtension", False)
+    options.page_load_strategy = page_load_strategy
+    if performance_log:
+        options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    return options
+
+
+_resolved = {}
+_resolve_lock = threading.Lock()
+
+
+def _usable(path: Optional[str]) -> bool:
+    return bool(path) and os.path.isfile(path) and os.access(path, os.X_OK)
+
+
+def resolve_driver_path(cache_file: str = DEFAULT_DRIVER_CACHE, refresh: bool = False) -> Optional[str]:
+    """
+    Path of the chromedriver binary, resolved at most once per Chrome install.
+
+    Looks at, in order: the ``CHROMEDRIVER`` environment variable, this
+    process's earlier answer, ``cache_file``, ``chromedriver`` on ``PATH``,
+    and finally webdriver_manager's download (imported only then). The
+    answer is written to ``cache_file`` for the next run; with ``refresh``
+    only webdriver_manager is asked.
+
+    Args:
+        cache_file (str): JSON file remembering the resolved path, None to disable
+        refresh (bool): Ignore remembered answers, e.g. after a version mismatch
+
+    Returns:
+        str: Path to chromedriver, or None to let Selenium Manager find one
+    """
+    env = os.getenv("CHROMEDRIVER")
+    if _usable(env):
+        return env
+    with _resolve_lock:
+        if refresh:
+            _resolved.pop(cache_file, None)
+        elif _usable(_resolved.get(cache_file)):
+            return _resolved[cache_file]
+        elif cache_file and os.path.exists(cache_file):
+            try:
+                with open(cache_file, encoding="utf-8") as f:
+                    cached = json.load(f).get("path")
+            except (OSError, ValueError):
+                cached = None
+            if _usable(cached):
+                _resolved[cache_file] = cached
+                return cached
+
+        # After a version mismatch the binary on PATH is the stale one.
+        path, source = (None if refresh else shutil.which("chromedriver")), "path"
+        if not path:
+            try:
+                from webdriver_manager.chrome import ChromeDriverManager
+            except ImportError:
+                return None
+            path, source = ChromeDriverManager().install(), "webdriver_manager"
+        _resolved[cache_file] = path
+        if cache_file:
+            folder = os.path.dirname(cache_file)
+            if folder:
+                os.makedirs(folder, exist_ok=True)
+            with open(cache_file, "w", encoding="utf-8") as f:
+                json.dump({"path": path, "source": source, "resolved_at": time.time()}, f)
+        return path
+
+
+def build_driver(headless: bool = True, block_resources=False, driver_cache: str = DEFAULT_DRIVER_CACHE,
+                 **option_kwargs):
+    """
+    Start a Chrome WebDriver session.
+
+    Args:
+        headless (bool): Run Chrome without a window
+        block_resources (bool or list): Block images, fonts, media and
+            third-party scripts (True), or the given URL patterns
+        driver_cache (str): Where resolve_driver_path remembers chromedriver
+        **option_kwargs: Forwarded to build_options
+
+    Returns:
+        selenium.webdriver.Chrome: Running driver
+    """
+    from selenium import webdriver
+    from selenium.common.exceptions import SessionNotCreatedException
+    from selenium.webdriver.chrome.service import Service
+
+    from .tracing import span
+
+    with span("driver_resolve"):
+        path = resolve_driver_path(driver_cache)
+    with span("driver_start", headless=headless):
+        options = build_options(headless=headless, **option_kwargs)
+        try:
+            driver = webdriver.Chrome(service=Service(path), options=options)
+        except SessionNotCreatedException:
+            # Chrome was updated since the driver was cached; resolve again once.
+            if path is None:
+                raise
+            path = resolve_driver_path(driver_cache, refresh=True)
+            driver = webdriver.Chrome(service=Service(path), options=options)
+        driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        if block_resources:
+            from .network import enable_blocking
+
+            enable_blocking(driver, None if block_resources is True else block_resources)
+    return driver
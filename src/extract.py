@@ -0,0 +1,168 @@
+"""
+Extraction of organic results from a loaded Google SERP.
+
+Two modes produce the same rows:
+
+* ``script`` (default) injects one script that waits for the results,
+  walks the DOM in the browser and returns everything as JSON, so a page
+  costs a single WebDriver round-trip.
+* ``elements`` is the classic per-element path (``find_element`` then
+  ``.text`` / ``get_attribute``), one chromedriver round-trip per call,
+  kept for comparison and for drivers that cannot run async scripts.
+"""
+
+import json
+from typing import Dict, List, Optional
+
+from .helpers import make_result
+from .selector_chain import SelectorChain
+
+RESULT_BLOCK_SELECTORS = ["div.tF2Cxc", "div.MjjYud", "div.g"]
+SNIPPET_SELECTORS = ["div.VwiC3b", "span.aCOpRe", "div[data-sncf='1']"]
+
+# Shared by every extraction in the process, so the alternatives that match
+# the current Google markup move to the front.
+BLOCK_CHAIN = SelectorChain("block", RESULT_BLOCK_SELECTORS)
+SNIPPET_CHAIN = SelectorChain("snippet", SNIPPET_SELECTORS)
+
+
+def record_yield(stats: Optional[Dict], rows: int, pages: int = 1) -> None:
+    """Feed the per-selector match counts returned by collectResults into the chains."""
+    stats = stats or {}
+    BLOCK_CHAIN.record(stats.get("blocks"), evaluations=pages)
+    SNIPPET_CHAIN.record(stats.get("snippets"), evaluations=rows)
+
+
+def selector_yields() -> Dict[str, Dict]:
+    """Per-selector yield metrics of the block and snippet chains."""
+    return {chain.name: chain.yields() for chain in (BLOCK_CHAIN, SNIPPET_CHAIN)}
+
+
+# Shared in-page collector. Block alternatives are matched in one combined
+# query, which returns every element once in document order even where
+# alternatives overlap (MjjYud around tF2Cxc); a nested block repeating its
+# wrapper's link is skipped. Snippet alternatives are tried in the given
+# (hit rate) order and matches per selector are counted into ``stats``.
+# With markSeen, blocks already returned are tagged so later calls on the
+# same page (e.g. after scrolling) only return new ones.
+COLLECT_FUNCTION = """
+function collectResults(blockSelectors, snippetSelectors, limit, markSeen, stats) {
+    const out = [];
+    const seen = new Set();
+    const combined = blockSelectors.join(", ");
+    for (const block of document.querySelectorAll(combined)) {
+        if (out.length >= limit) break;
+        if (markSeen && block.dataset.gcSeen) continue;
+        const h3 = block.querySelector("h3");
+        if (!h3) continue;
+        const a = h3.closest("a[href]") || block.querySelector("a[href]");
+        if (!a) continue;
+        const link = a.href || "";
+        if (!link.startsWith("http") || seen.has(link)) continue;
+        let snippet = "";
+        for (const sel of snippetSelectors) {
+            const el = block.querySelector(sel);
+            if (el) {
+                snippet = el.innerText;
+                stats.snippets[sel] = (stats.snippets[sel] || 0) + 1;
+                break;
+            }
+        }
+        const matched = blockSelectors.find((sel) => block.matches(sel));
+        stats.blocks[matched] = (stats.blocks[matched] || 0) + 1;
+        seen.add(link);
+        if (markSeen) block.dataset.gcSeen = "1";
+        out.push({title: h3.innerText, link: link, snippet: snippet});
+    }
+    return out;
+}
+"""
+
+# arguments: limit, block selectors, snippet selectors, timeout (ms), callback
+EXTRACT_SCRIPT = COLLECT_FUNCTION + """
+const [limit, blockSelectors, snippetSelectors, timeoutMs, done] = arguments;
+const deadline = Date.now() + timeoutMs;
+
+(function poll() {
+    if (document.querySelector("h3") || Date.now() >= deadline) {
+        const stats = {blocks: {}, snippets: {}};
+        const rows = collectResults(blockSelectors, snippetSelectors, limit, false, stats);
+        done(JSON.stringify({rows: rows, yield: stats}));
+    } else {
+        setTimeout(poll, 50);
+    }
+})();
+"""
+
+
+def extract_results(driver, limit: int = 10, timeout: float = 10, mode: str = "script") -> List[Dict]:
+    """
+    Extract organic results from the page currently loaded in ``driver``.
+
+    Args:
+        driver: Selenium WebDriver with a SERP loaded
+        limit (int): Maximum number of results to return
+        timeout (float): Seconds to wait for the first <h3> to appear
+        mode (str): "script" for one round-trip, "elements" for per-element calls
+
+    Returns:
+        list: Result rows in the shared schema
+    """
+    if mode == "script":
+        return extract_results_script(driver, limit=limit, timeout=timeout)
+    if mode == "elements":
+        return extract_results_elements(driver, limit=limit, timeout=timeout)
+    raise ValueError(f"unknown extraction mode {mode!r}")
+
+
+def extract_results_script(driver, limit: int = 10, timeout: float = 10) -> List[Dict]:
+    """Wait for and extract all results with a single ``execute_async_script`` call."""
+    driver.set_script_timeout(timeout + 5)
+    raw = driver.execute_async_script(
+        EXTRACT_SCRIPT, limit, BLOCK_CHAIN.ordered(), SNIPPET_CHAIN.ordered(), int(timeout * 1000)
+    )
+    return rows_from_script(raw)
+
+
+def rows_from_script(raw: Optional[str]) -> List[Dict]:
+    """Result rows from the JSON returned by EXTRACT_SCRIPT; records the selector yield."""
+    data = json.loads(raw or "{}")
+    items = data.get("rows", [])
+    record_yield(data.get("yield"), rows=len(items))
+    titled = [item for item in items if item.get("title")]
+    return [make_result(i, item["title"], item["link"], item["snippet"]) for i, item in enumerate(titled, 1)]
+
+
+def extract_results_elements(driver, limit: int = 10, timeout: float = 10) -> List[Dict]:
+    """Extract results with WebElement calls, one round-trip per lookup."""
+    from selenium.common.exceptions import TimeoutException
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    results = []
+    try:
+        WebDriverWait(driver, timeout).until(EC.presence_of_element_located((By.CSS_SELECTOR, "h3")))
+    except TimeoutException:
+        return results
+
+    blocks = driver.find_elements(By.CSS_SELECTOR, BLOCK_CHAIN.combined)
+    seen = set()
+    for block in blocks:
+        if len(results) >= limit:
+            break
+        try:
+            title_el = block.find_element(By.CSS_SELECTOR, "h3")
+            link_el = block.find_element(By.XPATH, ".//a[.//h3]")
+            snippet_el = SNIPPET_CHAIN.find_first(block)
+
+            link = link_el.get_attribute("href") or ""
+            title = title_el.text
+            if not title or not link.startswith("http") or link in seen:
+                continue
+            seen.add(link)
+            snippet = snippet_el.text if snippet_el else ""
+            results.append(make_result(len(results) + 1, title, link, snippet))
+        except Exception:
+            continue
+    return results
@@ -0,0 +1,178 @@
+"""
+Adapters that run the repo's different SERP extraction strategies on the
+same recorded pages, for ``python -m src.bench compare``.
+
+Each adapter wraps one existing extract step without its navigation,
+scrolling or sleeps, and maps its output keys (``Title``/``URL``/``desc``
+...) onto the shared result schema. Adapters come in two kinds:
+
+* ``html``   - fn(html) -> rows, runs without a browser
+* ``driver`` - fn(driver) -> rows, runs against a page already loaded in Chrome
+
+Intern classes are instantiated with ``__new__`` and given only the
+attributes their extract method reads, so their constructors (which start
+browsers and load Google) never run. ``Abhushan/search_scraper.py`` inlines
+its extraction into the search function and cannot be wrapped this way.
+"""
+
+import contextlib
+import io
+import os
+from types import SimpleNamespace
+from typing import Callable, Dict, List
+
+from .batch import load_module
+from .helpers import make_result
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TITLE_KEYS = ("title", "heading")
+LINK_KEYS = ("link", "url", "href")
+SNIPPET_KEYS = ("snippet", "description", "desc")
+PLACEHOLDER_SNIPPETS = {"", "n/a", "no snippet available"}
+
+
+def normalize_rows(rows: List[Dict]) -> List[Dict]:
+    """Map differently named result dicts onto the shared schema."""
+    out = []
+    for row in rows:
+        lower = {str(k).lower(): v for k, v in row.items()}
+
+        def pick(keys):
+            return next((str(lower[k] or "") for k in keys if k in lower), "")
+
+        snippet = pick(SNIPPET_KEYS).strip()
+        if snippet.lower() in PLACEHOLDER_SNIPPETS:
+            snippet = ""
+        out.append(make_result(len(out) + 1, pick(TITLE_KEYS).strip(), pick(LINK_KEYS).strip(), snippet))
+    return out
+
+
+class Adapter:
+    """One extraction strategy under a common call signature."""
+
+    def __init__(self, name: str, kind: str, factory: Callable[[], Callable], description: str = ""):
+        """
+        Args:
+            name (str): Short name used in reports and on the command line
+            kind (str): "html" or "driver"
+            factory (callable): Returns the extract callable; may raise ImportError
+            description (str): Strategy in a few words
+        """
+        self.name = name
+        self.kind = kind
+        self.factory = factory
+        self.description = description
+
+    def load(self) -> Callable:
+        """The extract callable, returning normalized rows."""
+        fn = self.factory()
+        return lambda page: normalize_rows(fn(page))
+
+
+class _NoQuit:
+    """Driver proxy that ignores ``quit()``; some extract steps close the browser when done."""
+
+    def __init__(self, driver):
+        self._driver = driver
+
+    def quit(self):
+        pass
+
+    def __getattr__(self, name):
+        return getattr(self._driver, name)
+
+
+def _intern_class(path: str, class_name: str):
+    return getattr(load_module(os.path.join(REPO_ROOT, path)), class_name)
+
+
+def _quiet(fn: Callable) -> Callable:
+    """Silence the progress prints of an intern extract step."""
+    def call(page):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return fn(page)
+    return call
+
+
+def _src_parser(engine: str):
+    def factory():
+        from .parsers import get_parser
+
+        return get_parser(engine)
+    return factory
+
+
+def _src_extract(mode: str):
+    def factory():
+        from .extract import extract_results
+
+        return lambda driver: extract_results(driver, limit=100, timeout=0, mode=mode)
+    return factory
+
+
+def _komal_bs4():
+    cls = _intern_class("Komal Kumar/scraper.py", "HybridDataSurveyor")
+
+    def extract(html):
+        obj = cls.__new__(cls)
+        obj.driver = SimpleNamespace(page_source=html)
+        obj.results = []
+        obj.parse_with_beautifulsoup()
+        return obj.results
+    return _quiet(extract)
+
+
+def _om_lanjwal():
+    cls = _intern_class("Om_Lanjwal/search_scrapper.py", "Selenium_Scraper")
+
+    def extract(driver):
+        obj = cls.__new__(cls)
+        obj.driver = driver
+        return obj._extract_page_results()
+    return _quiet(extract)
+
+
+def _manikant():
+    cls = _intern_class("Manikant Kumar/Google_search_scrapper.py", "GoogleSearchScraper")
+
+    def extract(driver):
+        obj = cls.__new__(cls)
+        obj.driver = driver
+        obj.result_limit = 100
+        obj.headings, obj.snippets, obj.links = [], [], []
+        obj.collect_results()
+        return [{"title": t, "snippet": s, "link": l} for t, s, l in zip(obj.headings, obj.snippets, obj.links)]
+    return _quiet(extract)
+
+
+def _ashish_yadav():
+    cls = _intern_class("Ashish Yadav/search_result_scraper.py", "GetSearchResults")
+
+    def extract(driver):
+        obj = cls.__new__(cls)
+        obj.driver = _NoQuit(driver)
+        obj.title, obj.description, obj.url = [], [], []
+        obj._extract_info()
+        return [{"title": t, "snippet": d, "link": u} for t, d, u in zip(obj.title, obj.description, obj.url)]
+    return _quiet(extract)
+
+
+ADAPTERS = {a.name: a for a in [
+    Adapter("selectolax", "html", _src_parser("selectolax"), "src.parsers, h3 in #rso, Lexbor"),
+    Adapter("lxml", "html", _src_parser("lxml"), "src.parsers, h3 in #rso, XPath"),
+    Adapter("stdlib", "html", _src_parser("stdlib"), "src.parsers, h3 in #rso, html.parser"),
+    Adapter("komal-bs4", "html", _komal_bs4, "Komal Kumar, BeautifulSoup h3 -> parent a"),
+    Adapter("src-script", "driver", _src_extract("script"), "src.extract, one injected script"),
+    Adapter("src-elements", "driver", _src_extract("elements"), "src.extract, WebElement per field"),
+    Adapter("om-div-g", "driver", _om_lanjwal, "Om_Lanjwal, CSS div.g"),
+    Adapter("manikant-tF2Cxc", "driver", _manikant, "Manikant Kumar, CSS div.tF2Cxc"),
+    Adapter("ashish-MjjYud", "driver", _ashish_yadav, "Ashish Yadav, #main .MjjYud, full class chains"),
+]}
+
+
+def field_completeness(rows: List[Dict]) -> Dict[str, float]:
+    """Share of rows with a non-empty title, link and snippet."""
+    if not rows:
+        return {"title": 0.0, "link": 0.0, "snippet": 0.0}
+    return {f: round(sum(bool(r.get(f)) for r in rows) / len(rows), 3) for f in ("title", "link", "snippet")}
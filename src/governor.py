@@ -0,0 +1,261 @@
+"""
+Browser memory governor for long-running sessions.
+
+``apolloio.py`` drives one undetected_chromedriver session for hours and
+only restarts it on ``y % 100 == 0``; the Safari session in PropertyScraper
+is never restarted at all. Memory grows with every page (renderers that
+never exit, caches, leaked tabs) until the run slows to a crawl.
+``MemoryGovernor`` samples each session's RSS, split into chromedriver,
+browser, renderer and other Chrome processes, every ``every`` pages and
+acts on two thresholds:
+
+* ``soft_mb`` - soft recycle: close extra tabs, go to about:blank, clear
+  the HTTP cache and ask Chrome to release memory through DevTools. If
+  the session is still above ``soft_mb`` afterwards it is hard recycled.
+* ``hard_mb`` - hard recycle: copy every cookie out through DevTools, quit,
+  start a new session from ``factory`` and put the cookies back, so logins
+  survive the restart.
+
+Every sample and recycle is appended to ``log_path`` as JSON lines.
+
+Usage:
+    governor = MemoryGovernor(soft_mb=1200, hard_mb=2000, log_path="logs/memory.jsonl")
+    for company in companies:
+        scrape(driver, company)
+        driver = governor.check(driver, factory=build_driver)
+
+    pool = DriverPool(size=4, governor=MemoryGovernor(soft_mb=800, hard_mb=1500))
+"""
+
+import os
+import sys
+import threading
+import time
+import weakref
+from typing import Callable, Dict, List, Optional
+
+from .pool import process_tree
+
+MB = 1024 * 1024
+
+# Fields of a DevTools Network.Cookie that Network.setCookies accepts back.
+COOKIE_PARAMS = ("name", "value", "domain", "path", "secure", "httpOnly", "sameSite", "expires",
+                 "priority", "sourceScheme", "sourcePort")
+
+
+def _rss(pid: int) -> int:
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        return 0
+
+
+def _process_type(pid: int) -> str:
+    try:
+        with open(f"/proc/{pid}/cmdline", "rb") as f:
+            args = f.read().split(b"\0")
+    except OSError:
+        return "other"
+    for arg in args:
+        if arg.startswith(b"--type="):
+            return "renderer" if arg == b"--type=renderer" else "other"
+    return "browser"
+
+
+def session_memory(driver) -> Optional[Dict]:
+    """
+    Resident memory of one WebDriver session by process kind.
+
+    Returns:
+        dict: ``total_mb``, ``driver_mb`` (chromedriver), ``browser_mb``
+        (Chrome main process), ``renderer_mb``, ``other_mb`` (GPU, utility
+        ...) and ``renderers`` (count), or None where the driver process or
+        /proc is not available
+    """
+    try:
+        root = driver.service.process.pid
+    except AttributeError:
+        return None
+    tree = process_tree(root)
+    if tree is None:
+        return None
+    sizes = {"driver": 0, "browser": 0, "renderer": 0, "other": 0}
+    renderers = 0
+    for pid in tree:
+        kind = "driver" if pid == root else _process_type(pid)
+        sizes[kind] += _rss(pid)
+        renderers += kind == "renderer"
+    usage = {f"{kind}_mb": round(size / MB, 1) for kind, size in sizes.items()}
+    usage["total_mb"] = round(sum(sizes.values()) / MB, 1)
+    usage["renderers"] = renderers
+    return usage
+
+
+def export_cookies(driver) -> List[Dict]:
+    """Every cookie of the session, for all domains, in a form ``import_cookies`` accepts."""
+    cookies = driver.execute_cdp_cmd("Network.getAllCookies", {}).get("cookies", [])
+    out = []
+    for cookie in cookies:
+        param = {k: cookie[k] for k in COOKIE_PARAMS if k in cookie}
+        if cookie.get("session") or param.get("expires", 0) < 0:
+            param.pop("expires", None)
+        out.append(param)
+    return out
+
+
+def import_cookies(driver, cookies: List[Dict]) -> None:
+    if cookies:
+        driver.execute_cdp_cmd("Network.setCookies", {"cookies": cookies})
+
+
+class MemoryGovernor:
+    """Keep WebDriver sessions under a memory budget by recycling them."""
+
+    def __init__(self, soft_mb: float = 1024, hard_mb: float = 2048, every: int = 10,
+                 log_path: Optional[str] = None, restore_url: bool = False, settle: float = 0.5,
+                 sampler: Callable[[object], Optional[Dict]] = session_memory):
+        """
+        Args:
+            soft_mb (float): Session RSS that triggers a soft recycle
+            hard_mb (float): Session RSS that triggers a hard recycle (restart with cookies)
+            every (int): Sample a session every this many ``check`` calls
+            log_path (str): JSON-lines file for sample and recycle events
+            restore_url (bool): After a hard recycle, reopen the page the old session was on
+            settle (float): Seconds Chrome gets to release memory before a soft recycle is measured
+            sampler (callable): fn(driver) -> dict with ``total_mb``, see session_memory
+        """
+        if soft_mb > hard_mb:
+            raise ValueError("soft_mb must not exceed hard_mb")
+        self.soft_mb = soft_mb
+        self.hard_mb = hard_mb
+        self.every = max(1, every)
+        self.restore_url = restore_url
+        self.settle = settle
+        self.sampler = sampler
+        self.events = []
+        self._writer = None
+        if log_path:
+            from .writers import NdjsonWriter
+
+            self._writer = NdjsonWriter(log_path, flush_every=1, fsync=False)
+        self._calls = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self._counts = {"samples": 0, "soft": 0, "hard": 0, "errors": 0}
+
+    def check(self, driver, factory: Optional[Callable] = None, force: bool = False):
+        """
+        Count one page for ``driver``; every ``every`` pages sample it and recycle if needed.
+
+        Args:
+            driver: WebDriver session
+            factory (callable): Builds a replacement session; without it a
+                session over ``hard_mb`` is only soft recycled
+            force (bool): Sample now regardless of ``every``
+
+        Returns:
+            The driver to keep using: ``driver`` itself, or its replacement after a hard recycle
+        """
+        with self._lock:
+            calls = self._calls.get(driver, 0) + 1
+            self._calls[driver] = calls
+        if not force and calls % self.every:
+            return driver
+        usage = self.sampler(driver)
+        if usage is None:
+            return driver
+        self._log("sample", driver, **usage)
+        if usage["total_mb"] >= self.hard_mb and factory is not None:
+            return self.hard_recycle(driver, factory, before_mb=usage["total_mb"])
+        if usage["total_mb"] >= self.soft_mb:
+            after = self.soft_recycle(driver, before_mb=usage["total_mb"])
+            if after is not None and after >= self.soft_mb and factory is not None:
+                return self.hard_recycle(driver, factory, before_mb=after)
+        return driver
+
+    def soft_recycle(self, driver, before_mb: Optional[float] = None) -> Optional[float]:
+        """
+        Close all but one tab, blank it, drop the HTTP cache and ask Chrome to free memory.
+        Cookies, local storage and the session itself are kept.
+
+        Returns:
+            float: Session RSS in MB afterwards, None if it cannot be measured
+        """
+        t0 = time.perf_counter()
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+        driver.get("about:blank")
+        for command, params in (("Network.clearBrowserCache", {}),
+                                ("HeapProfiler.collectGarbage", {}),
+                                ("Memory.simulatePressureNotification", {"level": "critical"})):
+            try:
+                driver.execute_cdp_cmd(command, params)
+            except Exception:
+                # Not Chrome (e.g. Safari) or an older protocol version.
+                pass
+        time.sleep(self.settle)
+        usage = self.sampler(driver)
+        after = usage["total_mb"] if usage else None
+        self._log("soft_recycle", driver, before_mb=before_mb, after_mb=after, tabs_closed=len(handles) - 1,
+                  seconds=round(time.perf_counter() - t0, 3))
+        return after
+
+    def hard_recycle(self, driver, factory: Callable, before_mb: Optional[float] = None):
+        """
+        Restart the session, carrying its cookies over.
+
+        Returns:
+            The new driver
+        """
+        t0 = time.perf_counter()
+        try:
+            cookies = export_cookies(driver)
+        except Exception:
+            cookies = []
+        url = None
+        if self.restore_url:
+            try:
+                url = driver.current_url
+            except Exception:
+                pass
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        new = factory()
+        try:
+            import_cookies(new, cookies)
+        except Exception as e:
+            self._log("error", new, stage="import_cookies", error=str(e))
+        if url and url.startswith("http"):
+            new.get(url)
+        usage = self.sampler(new)
+        self._log("hard_recycle", driver, before_mb=before_mb, after_mb=usage["total_mb"] if usage else None,
+                  cookies=len(cookies), new_session=id(new), seconds=round(time.perf_counter() - t0, 3))
+        return new
+
+    def _log(self, event: str, driver, **fields) -> None:
+        record = {"time": round(time.time(), 3), "event": event, "session": id(driver), **fields}
+        with self._lock:
+            key = {"sample": "samples", "soft_recycle": "soft", "hard_recycle": "hard"}.get(event, "errors")
+            self._counts[key] += 1
+            self.events.append(record)
+            del self.events[:-1000]
+        if event == "error":
+            print(f"[ERROR] memory governor: {fields}", file=sys.stderr)
+        elif event != "sample":
+            print(f"[INFO] memory governor: {event} of session {record['session']}, "
+                  f"{fields.get('before_mb')} MB -> {fields.get('after_mb')} MB", file=sys.stderr)
+        if self._writer is not None:
+            self._writer.write(record)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._counts)
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
@@ -0,0 +1,81 @@
+"""
+Small helpers shared by every module in ``src``.
+"""
+
+import csv
+import json
+import os
+import re
+from typing import Dict, List, Optional
+from urllib.parse import unquote_plus
+
+# Every backend and extractor returns rows with at least these keys.
+RESULT_FIELDS = ["position", "title", "link", "snippet"]
+
+
+def make_result(position: int, title: str, link: str, snippet: Optional[str] = "") -> Dict:
+    """
+    Build a result row in the shared schema.
+
+    Args:
+        position (int): 1-based rank of the result on the SERP
+        title (str): Result title (the <h3> text)
+        link (str): Target URL of the result
+        snippet (str): Description text shown under the title
+
+    Returns:
+        dict: Row with the keys listed in RESULT_FIELDS
+    """
+    return {
+        "position": position,
+        "title": (title or "").strip(),
+        "link": link or "",
+        "snippet": (snippet or "").strip(),
+    }
+
+
+def normalize_query(query: str) -> str:
+    """
+    Canonical form of a query for caching and deduplication.
+
+    Undoes URL encoding left over from building search URLs by hand
+    (``query.replace(' ', '+')`` or ``%20``), lower-cases the query and
+    collapses whitespace. A ``+`` is only read as a space in queries that
+    have no spaces and join words with it, so "c++" stays "c++".
+    """
+    query = query or ""
+    if re.search(r"%[0-9A-Fa-f]{2}", query):
+        query = unquote_plus(query)
+    elif " " not in query and re.search(r"\w\+\w", query):
+        query = query.replace("+", " ")
+    return " ".join(query.split()).lower()
+
+
+def save_results(results: List[Dict], prefix: str) -> None:
+    """
+    Save results as ``<prefix>.json`` and ``<prefix>.csv``.
+
+    Args:
+        results (list): Result rows
+        prefix (str): Output path without extension
+    """
+    folder = os.path.dirname(prefix)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+
+    json_path = f"{prefix}.json"
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+
+    fields = list(RESULT_FIELDS)
+    for row in results:
+        for key in row:
+            if key not in fields:
+                fields.append(key)
+    csv_path = f"{prefix}.csv"
+    with open(csv_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        writer.writeheader()
+        writer.writerows(results)
+
+    print(f"[INFO] Saved {len(results)} results to:\n - {json_path}\n - {csv_path}")
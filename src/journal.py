@@ -0,0 +1,192 @@
+"""
+Resumable job journal for long scraping runs.
+
+``apolloio.py`` remembers how far it got with a hand-edited ``y=0#171``
+index and ``sheet.update_cell`` markers, and ``PropertyScraper`` keeps every
+listing in memory until ``saveToCSV`` at the very end, so a crash at item
+900 loses the whole run. A ``JobJournal`` records the state of every item
+(pending, running, done or failed) and its result in SQLite as soon as it
+changes, so a restarted run skips finished work and picks up the rest.
+
+Usage:
+    journal = JobJournal(".cache/jobs.sqlite", job="apollo-companies")
+    journal.add(companies)
+    for company in journal.pending():
+        rows = journal.run(company, scrape_company)
+    print(journal.counts())
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+DEFAULT_JOURNAL_PATH = os.path.join(".cache", "jobs.sqlite")
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+STATES = (PENDING, RUNNING, DONE, FAILED)
+
+
+class JobJournal:
+    """Per-item progress of one named job, persisted in SQLite."""
+
+    def __init__(self, path: str = DEFAULT_JOURNAL_PATH, job: str = "default"):
+        """
+        Items left ``running`` by a previous process that died are put back
+        to ``pending`` on open.
+
+        Args:
+            path (str): SQLite file, or ":memory:"
+            job (str): Name separating this job's items from other jobs in the same file
+        """
+        folder = os.path.dirname(path)
+        if path != ":memory:" and folder:
+            os.makedirs(folder, exist_ok=True)
+        self.path = path
+        self.job = job
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            """CREATE TABLE IF NOT EXISTS items (
+                   job TEXT NOT NULL,
+                   key TEXT NOT NULL,
+                   position INTEGER NOT NULL,
+                   state TEXT NOT NULL,
+                   attempts INTEGER NOT NULL DEFAULT 0,
+                   result TEXT,
+                   error TEXT,
+                   updated REAL NOT NULL,
+                   PRIMARY KEY (job, key)
+               )"""
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS items_state ON items (job, state, position)")
+        self.recovered = self._db.execute(
+            "UPDATE items SET state = ?, updated = ? WHERE job = ? AND state = ?",
+            (PENDING, time.time(), job, RUNNING),
+        ).rowcount
+        self._db.commit()
+
+    def add(self, keys: Iterable[str]) -> int:
+        """
+        Register items; keys already in the journal keep their state.
+
+        Returns:
+            int: Number of new items
+        """
+        now = time.time()
+        with self._lock:
+            start = self._db.execute(
+                "SELECT COALESCE(MAX(position) + 1, 0) FROM items WHERE job = ?", (self.job,)
+            ).fetchone()[0]
+            before = self._db.total_changes
+            self._db.executemany(
+                "INSERT OR IGNORE INTO items (job, key, position, state, updated) VALUES (?, ?, ?, ?, ?)",
+                ((self.job, str(key), start + i, PENDING, now) for i, key in enumerate(keys)),
+            )
+            self._db.commit()
+            return self._db.total_changes - before
+
+    def _set(self, key: str, state: str, result: Any = None, error: Optional[str] = None) -> None:
+        with self._lock:
+            if state == RUNNING:
+                self._db.execute(
+                    "UPDATE items SET state = ?, attempts = attempts + 1, updated = ? WHERE job = ? AND key = ?",
+                    (state, time.time(), self.job, key),
+                )
+            else:
+                payload = json.dumps(result, ensure_ascii=False) if result is not None else None
+                self._db.execute(
+                    "UPDATE items SET state = ?, result = ?, error = ?, updated = ? WHERE job = ? AND key = ?",
+                    (state, payload, error, time.time(), self.job, key),
+                )
+            self._db.commit()
+
+    def start(self, key: str) -> None:
+        self._set(key, RUNNING)
+
+    def finish(self, key: str, result: Any = None) -> None:
+        """Mark ``key`` done and store its (JSON serializable) result."""
+        self._set(key, DONE, result=result)
+
+    def fail(self, key: str, error: BaseException) -> None:
+        self._set(key, FAILED, error=f"{type(error).__name__}: {error}")
+
+    def state(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._db.execute("SELECT state FROM items WHERE job = ? AND key = ?", (self.job, key)).fetchone()
+        return row[0] if row else None
+
+    def result(self, key: str) -> Any:
+        """Stored result of a finished item, or None."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT result FROM items WHERE job = ? AND key = ? AND state = ?", (self.job, key, DONE)
+            ).fetchone()
+        return json.loads(row[0]) if row and row[0] is not None else None
+
+    def pending(self, retry_failed: bool = True) -> List[str]:
+        """Keys still to do, in the order they were added."""
+        states = (PENDING, FAILED) if retry_failed else (PENDING,)
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT key FROM items WHERE job = ? AND state IN ({','.join('?' * len(states))}) ORDER BY position",
+                (self.job, *states),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def run(self, key: str, fn: Callable[[str], Any]) -> Any:
+        """
+        Return the stored result if ``key`` is done, otherwise call
+        ``fn(key)`` and record its outcome. Exceptions are recorded and
+        re-raised.
+        """
+        state = self.state(key)
+        if state == DONE:
+            return self.result(key)
+        if state is None:
+            self.add([key])
+        self.start(key)
+        try:
+            result = fn(key)
+        except Exception as e:
+            self.fail(key, e)
+            raise
+        self.finish(key, result)
+        return result
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._db.execute("SELECT state, COUNT(*) FROM items WHERE job = ? GROUP BY state", (self.job,))
+            counts = dict.fromkeys(STATES, 0)
+            counts.update(rows.fetchall())
+        return counts
+
+    def failures(self) -> List[Dict]:
+        """Failed items with their last error and attempt count."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT key, attempts, error FROM items WHERE job = ? AND state = ? ORDER BY position",
+                (self.job, FAILED),
+            ).fetchall()
+        return [{"key": key, "attempts": attempts, "error": error} for key, attempts, error in rows]
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+def journaled(journal: JobJournal, search_fn: Callable[[str], List[Dict]]) -> Callable[[str], List[Dict]]:
+    """
+    Wrap ``fn(query)`` so finished queries are answered from ``journal``
+    and every call updates the item's state.
+    """
+    def search(query):
+        return journal.run(query, search_fn)
+
+    return search
@@ -0,0 +1,399 @@
+"""
+Command line entry point for the shared scraper.
+
+Usage:
+    python -m src.main --query "Top universities in India" --num 10 --output results/universities
+    python -m src.main --batch queries.txt --workers 4 --output results/batch
+    cat queries.txt | python -m src.main --batch - --scraper Sagnik_Dey/scrape.py:scrape_google
+    python -m src.main --batch queries.txt --journal .cache/jobs.sqlite   # rerun to resume
+    python -m src.main --batch queries.txt --trace traces/batch.jsonl --metrics metrics/scraper.prom
+    python -m src.main --query "python" --startup-profile
+    python -m src.main --batch queries.txt --rate serpapi=1:5 --daily-quota serpapi=250
+    python -m src.main --batch queries.txt --retries 2 --breaker-failures 5 --breaker-reset 30
+"""
+
+import time
+
+# Taken before the imports below so --startup-profile can show their cost,
+# hence the E402 exemptions.
+LAUNCHED = time.time()
+
+import argparse  # noqa: E402
+import os  # noqa: E402
+import sys  # noqa: E402
+
+from .backends import BACKENDS, BackendError  # noqa: E402
+from .cache import DEFAULT_CACHE_PATH  # noqa: E402
+from .extract import selector_yields  # noqa: E402
+from .helpers import save_results  # noqa: E402
+from .router import build_router  # noqa: E402
+from .tracing import Tracer, install, span  # noqa: E402
+
+IMPORTED = time.time()
+
+
+def parse_args(argv=None):
+    p = argparse.ArgumentParser(description="Fetch Google results through the cheapest available backend")
+    source = p.add_mutually_exclusive_group(required=True)
+    source.add_argument("--query", "-q", help="Search query")
+    source.add_argument("--batch", metavar="FILE",
+                        help="File with one query per line, or - to read stdin")
+    p.add_argument("--num", "-n", type=int, default=10, help="Number of results to fetch")
+    p.add_argument("--backend", "-b", action="append", choices=sorted(BACKENDS),
+                   help="Restrict routing to this backend (repeatable, default: all)")
+    p.add_argument("--hl", default="en", help="Interface language (hl param)")
+    p.add_argument("--gl", default="us", help="Country of search (gl param)")
+    p.add_argument("--usd-per-second", type=float, default=0.01,
+                   help="How much one second of latency is worth when comparing paid backends")
+    p.add_argument("--headed", action="store_true", help="Show the browser window for the Selenium backend")
+    p.add_argument("--page-load-strategy", choices=["normal", "eager", "none"], default="eager",
+                   help="When driver.get returns; readiness is then detected from the DOM")
+    p.add_argument("--block-resources", action="store_true",
+                   help="Block images, fonts, media and third-party scripts in Chrome")
+    p.add_argument("--workers", "-w", type=int, default=4,
+                   help="Batch mode: number of concurrent browser workers")
+    p.add_argument("--memory-soft-mb", type=float,
+                   help="Batch mode: soft recycle a browser session (close tabs, clear caches) above this RSS")
+    p.add_argument("--memory-hard-mb", type=float,
+                   help="Batch mode: restart a browser session, keeping its cookies, above this RSS")
+    p.add_argument("--memory-log", metavar="FILE", help="Batch mode: JSON-lines log of memory samples and recycles")
+    p.add_argument("--tabs", type=int, default=0,
+                   help="Selenium backend: load the result pages of --num above 10 in this many parallel tabs")
+    p.add_argument("--processes", type=int, default=1, help="Chromium processes of the Playwright backend")
+    p.add_argument("--contexts-per-process", type=int, default=8,
+                   help="Concurrent browser contexts per Playwright process")
+    p.add_argument("--scraper", metavar="FILE:FUNC",
+                   help="Batch mode: use an existing scraper instead of the router, "
+                        "e.g. Sagnik_Dey/scrape.py:scrape_google")
+    p.add_argument("--cache", default=DEFAULT_CACHE_PATH, help="SQLite response cache file")
+    p.add_argument("--cache-ttl", type=float, default=24, help="Hours a cached response stays fresh")
+    p.add_argument("--no-cache", action="store_true", help="Always fetch, never read or write the cache")
+    p.add_argument("--rate", action="append", metavar="KEY=RATE[/UNIT][:BURST]", default=[],
+                   help="Pace a backend (or 'scraper' for --scraper) e.g. serpapi=1:5 or selenium=20/min (repeatable)")
+    p.add_argument("--daily-quota", action="append", metavar="KEY=N", default=[],
+                   help="Calls a backend may make per UTC day, counted across runs (repeatable)")
+    p.add_argument("--quota-ledger", default=None, metavar="FILE",
+                   help="SQLite ledger for --daily-quota (default .cache/quota.sqlite)")
+    p.add_argument("--retries", type=int, default=2,
+                   help="Retries per backend request, with jittered exponential backoff (0 to disable)")
+    p.add_argument("--retry-budget", type=float, default=0.2,
+                   help="Retries allowed as a share of all requests, so an outage does not multiply the load")
+    p.add_argument("--breaker-failures", type=int, default=5,
+                   help="Consecutive failures that take a backend out of rotation (0 to disable)")
+    p.add_argument("--breaker-reset", type=float, default=30,
+                   help="Seconds before a backend taken out of rotation is probed again")
+    p.add_argument("--journal", metavar="FILE",
+                   help="Batch mode: record per-query progress in this SQLite journal and resume from it")
+    p.add_argument("--job", help="Job name inside the journal (default: the batch file name)")
+    p.add_argument("--output", "-o",
+                   help="Output path prefix; writes <prefix>.json/.csv, or <prefix>.<format> in batch mode")
+    p.add_argument("--store", metavar="DIR",
+                   help="Batch mode: also append rows to this partitioned Parquet dataset (needs pyarrow)")
+    p.add_argument("--index", metavar="FILE",
+                   help="Batch mode: also add rows to this full-text search index (see src.search_index)")
+    p.add_argument("--format", choices=["ndjson", "csv", "json"], default="ndjson",
+                   help="Batch mode output format, streamed as results arrive (stdout is always ndjson)")
+    p.add_argument("--trace", metavar="FILE", help="Append per-phase timing spans to this JSON-lines file")
+    p.add_argument("--metrics", metavar="FILE",
+                   help="Write per-phase latency percentiles to this Prometheus textfile when done")
+    p.add_argument("--startup-profile", action="store_true",
+                   help="Report how long imports, driver resolution and browser start took before the first request")
+    return p.parse_args(argv)
+
+
+def print_browser_summary(router, file=None):
+    """Print where the browser backends spent their time and bandwidth."""
+    used = [router.stats[name] for name in ("selenium", "playwright") if name in router.stats]
+    used = [stats for stats in used if stats.calls]
+    if not used:
+        return
+    for stats in used:
+        for phase, s in stats.backend.waits.summary().items():
+            print(f"[INFO] {stats.backend.name} {phase}: {s['count']}x, {s['total_s']}s total, "
+                  f"{s['mean_s']}s mean, {s['timeouts']} timeouts", file=file)
+    playwright = router.stats.get("playwright")
+    if playwright in used:
+        print(f"[INFO] playwright engine: {playwright.backend.engine.stats()}", file=file)
+    for chain, yields in selector_yields().items():
+        ranked = sorted(yields.items(), key=lambda kv: kv[1]["rank"])
+        ranked_hits = ", ".join(f"{sel} {y['hits']}" for sel, y in ranked)
+        print(f"[INFO] {chain} selectors by hits: {ranked_hits}", file=file)
+    selenium = router.stats.get("selenium")
+    if selenium not in used:
+        return
+    net = selenium.backend.network.summary()
+    if net["queries"]:
+        print(f"[INFO] network: {net['mb_transferred']} MB over {net['requests']} requests "
+              f"({net['kb_per_query']} KB/query), {net['blocked_requests']} requests blocked", file=file)
+
+
+def print_trace_summary(tracer, file=None):
+    """Print p50/p95/p99 latency per traced phase."""
+    for phase, s in sorted(tracer.summary().items(), key=lambda kv: -kv[1]["total_s"]):
+        print(f"[INFO] {phase}: {s['count']}x, p50 {s['p50_s']}s, p95 {s['p95_s']}s, p99 {s['p99_s']}s, "
+              f"{s['total_s']}s total, {s['errors']} errors", file=file)
+
+
+def print_startup_profile(tracer, file=None):
+    """Print when each phase first ran, relative to process launch, and the time to first request."""
+    print("[INFO] startup profile (ms since launch / duration):", file=file)
+    print(f"  {'imports':<16}{0:>9.1f}{(IMPORTED - LAUNCHED) * 1000:>9.1f}", file=file)
+    first_request = None
+    for rec in tracer.first_spans():
+        offset = (rec["start"] - LAUNCHED) * 1000
+        print(f"  {rec['name']:<16}{offset:>9.1f}{rec['ms']:>9.1f}", file=file)
+        if first_request is None and rec["name"] in ("navigate", "fetch"):
+            first_request = offset
+    if first_request is None:
+        print("[INFO] no request made (answered from cache)", file=file)
+    else:
+        print(f"[INFO] time to first request: {first_request:.0f} ms", file=file)
+
+
+def build_scheduler(args):
+    """RateScheduler from --rate and --daily-quota, or None if neither is given."""
+    if not args.rate and not args.daily_quota:
+        return None
+    from .ratelimit import DEFAULT_LEDGER_PATH, Limit, QuotaLedger, RateScheduler, parse_limit
+
+    limits = {}
+    for spec in args.rate:
+        key, _, rate = spec.partition("=")
+        limits[key] = parse_limit(rate)
+    for spec in args.daily_quota:
+        key, _, n = spec.partition("=")
+        limits.setdefault(key, Limit()).daily = int(n)
+    ledger = QuotaLedger(args.quota_ledger or DEFAULT_LEDGER_PATH) if args.daily_quota else None
+    return RateScheduler(limits, ledger=ledger)
+
+
+def print_scheduler_summary(scheduler, file=None):
+    if scheduler is None:
+        return
+    for key, s in scheduler.stats().items():
+        left = f", {s['left_today']} left today" if "left_today" in s else ""
+        print(f"[INFO] rate {key}: {s['calls']} calls, waited {s['waited_s']}s "
+              f"(max {s['max_wait_s']}s){left}", file=file)
+    scheduler.close()
+
+
+def build_retry(args):
+    """RetryPolicy from --retries and --retry-budget, or None if retries are disabled."""
+    if args.retries <= 0:
+        return None
+    from .resilience import RetryBudget, RetryPolicy
+
+    return RetryPolicy(attempts=args.retries + 1, budget=RetryBudget(ratio=args.retry_budget))
+
+
+def print_resilience_summary(retry, router=None, file=None):
+    if retry is not None:
+        s = retry.stats()
+        print(f"[INFO] retries: {s['retries']} over {s['calls']} calls, {s['recovered']} recovered, "
+              f"{s['budget_denied']} refused by the budget, {s['backoff_s']}s backing off", file=file)
+    for stats in (router.stats.values() if router is not None else ()):
+        breaker = stats.backend.breaker
+        if breaker is not None and breaker.stats()["opened"]:
+            s = breaker.stats()
+            print(f"[INFO] circuit {breaker.name}: opened {s['opened']}x, {s['rejected']} calls failed fast, "
+                  f"now {s['state']}", file=file)
+
+
+def open_cache(args):
+    if args.no_cache:
+        return None
+    from .cache import SerpCache
+
+    return SerpCache(args.cache, ttl=args.cache_ttl * 3600)
+
+
+def print_cache_summary(cache, file=None):
+    if cache is None:
+        return
+    s = cache.stats()
+    print(f"[INFO] cache: {s['hits']} hits, {s['misses']} misses ({s['hit_rate']:.0%}), "
+          f"{s['entries']} entries, {s['evictions']} evicted", file=file)
+    cache.close()
+
+
+def run_single(args):
+    cache = open_cache(args)
+    router = build_router(args.backend, headless=not args.headed, usd_per_second=args.usd_per_second,
+                          page_load_strategy=args.page_load_strategy, block_resources=args.block_resources,
+                          cache=cache, processes=args.processes, contexts_per_process=args.contexts_per_process,
+                          tabs=args.tabs)
+    scheduler = build_scheduler(args)
+    if scheduler is not None:
+        router.attach_scheduler(scheduler)
+    retry = build_retry(args)
+    router.attach_resilience(retry, failures=args.breaker_failures, reset_timeout=args.breaker_reset)
+    try:
+        results = router.search(args.query, num=args.num, hl=args.hl, gl=args.gl)
+    except BackendError as e:
+        print(f"[ERROR] {e}", file=sys.stderr)
+        raise SystemExit(1)
+    finally:
+        router.close()
+        print_scheduler_summary(scheduler)
+        print_resilience_summary(retry, router)
+
+    for r in results:
+        print(f"{r['position']}. {r['title']}\n   {r['link']}\n   {r['snippet']}\n")
+    for s in router.report():
+        print(f"[INFO] {s['backend']}: {s['calls']} calls, {s['failures']} failures, "
+              f"{s['latency_s']}s latency, quota left {s['quota_left']}")
+    print_browser_summary(router)
+    print_cache_summary(cache)
+    if args.output:
+        save_results(results, args.output)
+    return results
+
+
+def run_batch_mode(args):
+    from .batch import BatchStats, load_search_function, read_queries, run_batch
+
+    queries = read_queries(args.batch)
+    cache = open_cache(args)
+    scheduler = build_scheduler(args)
+    retry = build_retry(args)
+    pool = router = governor = None
+    if args.scraper:
+        from .coalesce import coalesced
+
+        search_fn = load_search_function(args.scraper)
+        if scheduler is not None:
+            search_fn = scheduler.limited(search_fn, "scraper")
+        if args.breaker_failures > 0:
+            from .resilience import CircuitBreaker
+
+            search_fn = CircuitBreaker("scraper", failures=args.breaker_failures,
+                                       reset_timeout=args.breaker_reset).wrap(search_fn)
+        if retry is not None:
+            search_fn = retry.wrap(search_fn)
+        if cache is not None:
+            from .cache import cached_search
+
+            search_fn = cached_search(cache, search_fn, backend=args.scraper, num=args.num)
+        search_fn = coalesced(search_fn)
+        flight = search_fn.flight
+    else:
+        from .pool import DriverPool
+
+        if args.memory_soft_mb or args.memory_hard_mb:
+            from .governor import MemoryGovernor
+
+            hard = args.memory_hard_mb or args.memory_soft_mb * 2
+            governor = MemoryGovernor(soft_mb=args.memory_soft_mb or hard, hard_mb=hard, log_path=args.memory_log)
+        pool = DriverPool(size=args.workers, headless=not args.headed,
+                          page_load_strategy=args.page_load_strategy, governor=governor,
+                          block_resources=args.block_resources, performance_log=True)
+        router = build_router(args.backend, headless=not args.headed, pool=pool,
+                              usd_per_second=args.usd_per_second, cache=cache, block_resources=args.block_resources,
+                              processes=args.processes, contexts_per_process=args.contexts_per_process,
+                              tabs=args.tabs)
+        if scheduler is not None:
+            router.attach_scheduler(scheduler)
+        router.attach_resilience(retry, failures=args.breaker_failures, reset_timeout=args.breaker_reset)
+
+        flight = router.flight
+
+        def search_fn(query):
+            return router.search(query, num=args.num, hl=args.hl, gl=args.gl)
+
+    journal = None
+    if args.journal:
+        from .journal import JobJournal, journaled
+
+        journal = JobJournal(args.journal, job=args.job or os.path.basename(args.batch))
+        journal.add(queries)
+        done = journal.counts()["done"]
+        if done or journal.recovered:
+            print(f"[INFO] resuming job {journal.job!r}: {done} queries already done, "
+                  f"{journal.recovered} interrupted", file=sys.stderr)
+        search_fn = journaled(journal, search_fn)
+
+    from .writers import open_writer
+
+    if args.output:
+        out = open_writer(f"{args.output}.{args.format}", args.format, append=False)
+    else:
+        out = open_writer("-", "ndjson", flush_every=1)
+    store = None
+    if args.store:
+        from .store import ResultStore
+
+        # Small, frequent files so an interrupted run keeps its rows; compact merges them later.
+        store = ResultStore(args.store, flush_rows=1000, flush_interval=30)
+    index = None
+    if args.index:
+        from .search_index import SearchIndex
+
+        index = SearchIndex(args.index)
+    stats = BatchStats()
+    try:
+        for item in run_batch(queries, search_fn, workers=args.workers, stats=stats):
+            if item.error is not None:
+                print(f"[ERROR] {item.query!r}: {item.error}", file=sys.stderr)
+            with span("write", query=item.query, rows=len(item.results)):
+                for row in item.results:
+                    row.setdefault("query", item.query)
+                    out.write(row)
+                if store is not None:
+                    store.append(item.results, backend="scraper" if args.scraper else None)
+                if index is not None:
+                    index.add(item.results, backend="scraper" if args.scraper else None)
+    finally:
+        out.close()
+        if store is not None:
+            store.close()
+        if index is not None:
+            print(f"[INFO] search index: {index.stats()}", file=sys.stderr)
+            index.close()
+        if router is not None:
+            print_browser_summary(router, file=sys.stderr)
+            router.close()
+        if pool is not None:
+            print(f"[INFO] Driver pool: {pool.stats()}", file=sys.stderr)
+            pool.close()
+        if governor is not None:
+            print(f"[INFO] memory governor: {governor.stats()}", file=sys.stderr)
+            governor.close()
+        print_cache_summary(cache, file=sys.stderr)
+        print_scheduler_summary(scheduler, file=sys.stderr)
+        print_resilience_summary(retry, router, file=sys.stderr)
+        if journal is not None:
+            print(f"[INFO] journal: {journal.counts()}", file=sys.stderr)
+            journal.close()
+
+    s = stats.summary()
+    print(f"[INFO] {s['queries']} queries ({s['failed']} failed), {s['results']} results "
+          f"in {s['elapsed_s']}s: {s['queries_per_min']} queries/min", file=sys.stderr)
+    shared = flight.stats()["shared"]
+    print(f"[INFO] fetches saved: {s['deduplicated'] + shared} "
+          f"({s['deduplicated']} duplicate queries in batch, {shared} coalesced in flight)", file=sys.stderr)
+    return stats
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    tracer = None
+    if args.batch or args.trace or args.metrics or args.startup_profile:
+        tracer = install(Tracer(trace_path=args.trace))
+    try:
+        if args.batch:
+            return run_batch_mode(args)
+        return run_single(args)
+    finally:
+        if tracer is not None:
+            install(None)
+            tracer.close()
+            if args.batch:
+                print_trace_summary(tracer, file=sys.stderr)
+            if args.metrics:
+                tracer.write_prometheus(args.metrics)
+            if args.startup_profile:
+                print_startup_profile(tracer, file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Network request blocking and bandwidth accounting for Chrome sessions.
+
+We only read text from SERPs, yet every load pulls images, fonts, media and
+third-party scripts. ``enable_blocking`` tells Chrome to drop those through
+the DevTools protocol (``Network.setBlockedURLs``), and ``NetworkMeter``
+reads the performance log to count the bytes each query actually
+transferred and the requests that were blocked.
+
+Usage:
+    driver = build_driver(block_resources=True, performance_log=True)
+    meter = NetworkMeter()
+    driver.get(url)
+    meter.collect(driver)
+    print(meter.summary())
+"""
+
+import json
+import threading
+from typing import Dict, List, Optional
+
+BLOCKED_IMAGES = ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico", "*.avif"]
+BLOCKED_FONTS = ["*.woff", "*.woff2", "*.ttf", "*.otf"]
+BLOCKED_MEDIA = ["*.mp4", "*.webm", "*.mp3", "*.m4a", "*.ogg"]
+BLOCKED_THIRD_PARTY = [
+    "*googletagmanager.com*",
+    "*google-analytics.com*",
+    "*doubleclick.net*",
+    "*googlesyndication.com*",
+    "*adservice.google.*",
+]
+DEFAULT_BLOCKED_PATTERNS = BLOCKED_IMAGES + BLOCKED_FONTS + BLOCKED_MEDIA + BLOCKED_THIRD_PARTY
+
+
+def enable_blocking(driver, patterns: Optional[List[str]] = None) -> List[str]:
+    """
+    Block requests whose URL matches any of ``patterns`` (``*`` wildcards).
+
+    Args:
+        driver: Chrome WebDriver (needs ``execute_cdp_cmd``)
+        patterns (list): URL patterns, DEFAULT_BLOCKED_PATTERNS if omitted
+
+    Returns:
+        list: The patterns now in effect
+    """
+    patterns = list(DEFAULT_BLOCKED_PATTERNS if patterns is None else patterns)
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+    return patterns
+
+
+def disable_blocking(driver) -> None:
+    """Remove every blocked URL pattern."""
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": []})
+
+
+def parse_performance_log(entries: List[Dict]) -> Dict[str, int]:
+    """
+    Summarize ``driver.get_log("performance")`` entries.
+
+    Returns:
+        dict: ``bytes`` transferred on the wire, finished ``requests``,
+        ``blocked`` requests and other ``failed`` requests
+    """
+    totals = {"bytes": 0, "requests": 0, "blocked": 0, "failed": 0}
+    for entry in entries:
+        try:
+            message = json.loads(entry["message"])["message"]
+        except (KeyError, TypeError, ValueError):
+            continue
+        method = message.get("method")
+        params = message.get("params", {})
+        if method == "Network.loadingFinished":
+            totals["requests"] += 1
+            totals["bytes"] += int(params.get("encodedDataLength") or 0)
+        elif method == "Network.loadingFailed":
+            if params.get("blockedReason"):
+                totals["blocked"] += 1
+            else:
+                totals["failed"] += 1
+    return totals
+
+
+class NetworkMeter:
+    """Per-query and cumulative network usage read from the performance log."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.queries = 0
+        self.totals = {"bytes": 0, "requests": 0, "blocked": 0, "failed": 0}
+
+    @staticmethod
+    def drain(driver) -> None:
+        """Discard log entries from before the next query."""
+        try:
+            driver.get_log("performance")
+        except Exception:
+            pass
+
+    def collect(self, driver) -> Optional[Dict[str, int]]:
+        """
+        Read and account the log entries produced since the last call.
+
+        Returns:
+            dict: Usage for this query, or None if performance logging is off
+        """
+        try:
+            entries = driver.get_log("performance")
+        except Exception:
+            return None
+        usage = parse_performance_log(entries)
+        with self._lock:
+            self.queries += 1
+            for key, value in usage.items():
+                self.totals[key] += value
+        return usage
+
+    def summary(self) -> Dict:
+        with self._lock:
+            per_query = self.totals["bytes"] / self.queries if self.queries else 0
+            return {
+                "queries": self.queries,
+                "mb_transferred": round(self.totals["bytes"] / 1e6, 3),
+                "kb_per_query": round(per_query / 1e3, 1),
+                "requests": self.totals["requests"],
+                "blocked_requests": self.totals["blocked"],
+                "failed_requests": self.totals["failed"],
+            }
@@ -0,0 +1,144 @@
+"""
+Parallel SERP pagination with several tabs of one browser session.
+
+``Selenium_Scraper.perform_multi_page_search`` (Om_Lanjwal) loads
+``&start=0,10,20...`` one after another with a 2 s sleep in between. Here the
+page URLs are opened together with ``window.open`` so the browser loads them
+concurrently, and whichever tab is ready first is extracted and closed
+first, keeping at most ``max_tabs`` pages in flight. A 5-page query then
+costs roughly one page load plus a little extraction time per page.
+
+Usage:
+    driver = build_driver(page_load_strategy="eager")
+    rows = fetch_pages_in_tabs(driver, "python", pages=5, max_tabs=3)
+
+    python -m src.main --query "python" --num 50 --backend selenium --tabs 3
+"""
+
+import time
+from typing import Dict, List, Optional
+from urllib.parse import quote_plus
+
+from .extract import extract_results
+from .urls import UrlDeduper
+from .waits import WaitRecorder, wait_ready
+
+DEFAULT_SEARCH_URL = "https://www.google.com/search"
+TAB_SELECTOR = "#search h3, #botstuff"
+TAB_READY_SCRIPT = "return document.readyState !== 'loading' && !!document.querySelector(arguments[0]);"
+
+
+def page_url(query: str, start: int, hl: str = "en", gl: str = "us", search_url: str = DEFAULT_SEARCH_URL) -> str:
+    """SERP URL for the page starting at result ``start``."""
+    return f"{search_url}?q={quote_plus(query)}&hl={hl}&gl={gl}&start={start}&pws=0"
+
+
+def _open_tab(driver, url: str) -> str:
+    """Open ``url`` in a new background tab and return its window handle."""
+    before = set(driver.window_handles)
+    driver.execute_script("window.open(arguments[0], '_blank');", url)
+    new = [h for h in driver.window_handles if h not in before]
+    if not new:
+        raise RuntimeError("window.open did not create a tab (popup blocked?)")
+    return new[0]
+
+
+def _next_ready(driver, inflight: List, timeout: float, poll: float):
+    """
+    Remove and return the first in-flight ``(index, handle, opened)`` whose
+    page shows results, or whose ``timeout`` ran out, polling every ``poll`` seconds.
+    """
+    while True:
+        for tab in inflight:
+            index, handle, opened = tab
+            ready = time.monotonic() - opened >= timeout
+            if not ready:
+                driver.switch_to.window(handle)
+                try:
+                    ready = bool(driver.execute_script(TAB_READY_SCRIPT, TAB_SELECTOR))
+                except Exception:
+                    ready = True  # let wait_ready report what is wrong with the tab
+            if ready:
+                inflight.remove(tab)
+                return tab
+        time.sleep(poll)
+
+
+def fetch_pages_in_tabs(driver, query: str, pages: int = 5, per_page: int = 10, max_tabs: int = 3,
+                        hl: str = "en", gl: str = "us", timeout: float = 15, start: int = 0,
+                        search_url: str = DEFAULT_SEARCH_URL, poll: float = 0.05,
+                        recorder: Optional[WaitRecorder] = None) -> List[Dict]:
+    """
+    Fetch ``pages`` SERP pages for ``query`` concurrently in separate tabs.
+
+    Tabs are extracted and closed in the order they become ready, not the
+    order they were opened, and a new tab is opened as soon as one closes.
+    A page with no results ends pagination and cancels the pages not yet
+    opened.
+
+    Args:
+        driver: Selenium WebDriver; its current tab is left untouched
+        query (str): The search query
+        pages (int): Number of result pages to fetch
+        per_page (int): Results per page, used for the ``start`` offsets
+        max_tabs (int): Maximum number of tabs loading at once
+        hl (str): Interface language
+        gl (str): Country of search
+        timeout (float): Seconds to wait for each tab to become ready
+        start (int): 0-based offset of the first result of the first page
+        search_url (str): Search endpoint, e.g. a src.replay.ReplayServer for offline runs
+        poll (float): Seconds between readiness checks while no tab is ready
+        recorder (WaitRecorder): Receives the time spent waiting per tab
+
+    Returns:
+        list: Result rows across all pages, deduplicated, positions counting from 1
+    """
+    if max_tabs < 1:
+        raise ValueError("max_tabs must be at least 1")
+    home = driver.current_window_handle
+    queue = list(range(pages))
+    inflight = []
+    by_page = {}
+    try:
+        while queue or inflight:
+            while queue and len(inflight) < max_tabs:
+                index = queue.pop(0)
+                driver.switch_to.window(home)
+                url = page_url(query, start + index * per_page, hl, gl, search_url)
+                inflight.append((index, _open_tab(driver, url), time.monotonic()))
+
+            index, handle, opened = _next_ready(driver, inflight, timeout, poll)
+            try:
+                driver.switch_to.window(handle)
+                wait_ready(driver, selector=TAB_SELECTOR, quiet_ms=0,
+                           timeout=max(0.5, timeout - (time.monotonic() - opened)),
+                           recorder=recorder, phase="tab_ready")
+                rows = extract_results(driver, limit=per_page, timeout=0)
+            finally:
+                try:
+                    driver.switch_to.window(handle)
+                    driver.close()
+                except Exception:
+                    pass
+            by_page[index] = rows
+            if not rows:
+                queue.clear()
+    finally:
+        for _, handle, _ in inflight:
+            try:
+                driver.switch_to.window(handle)
+                driver.close()
+            except Exception:
+                pass
+        driver.switch_to.window(home)
+
+    results = []
+    seen = UrlDeduper()
+    for index in sorted(by_page):
+        for row in by_page[index]:
+            if not seen.add(row["link"]):
+                continue
+            row["position"] = len(results) + 1
+            row["page"] = index + 1
+            results.append(row)
+    return results
@@ -0,0 +1,247 @@
+"""
+Browser-free SERP parsing.
+
+Parses saved ``page_source`` HTML into the shared result schema without a
+WebDriver. The strategy follows ``HybridDataSurveyor.parse_with_beautifulsoup``
+(Komal Kumar): every <h3> inside ``#rso`` is a candidate title, its
+enclosing <a href> is the link and the snippet is looked up inside the
+nearest result container. Only the HTML engine differs:
+
+* ``selectolax`` - Lexbor based, the fastest option
+* ``lxml``       - libxml2 with XPath
+* ``stdlib``     - ``html.parser`` tree builder, no dependencies
+
+Usage:
+    parse = get_parser()          # fastest engine that is installed
+    rows = parse(html, limit=10)
+"""
+
+import importlib.util
+from html.parser import HTMLParser
+from typing import Callable, Dict, List, Optional
+
+from .helpers import make_result
+from .urls import canonicalize, dedup_key
+
+CONTAINER_CLASSES = ("g", "MjjYud", "tF2Cxc")
+SNIPPET_CSS = "div.VwiC3b, span.aCOpRe, div[data-sncf='1']"
+
+
+def resolve_href(href: Optional[str]) -> str:
+    """Turn a raw SERP href into a canonical result URL ("" if it is not one)."""
+    return canonicalize(href)
+
+
+def _collect(candidates, limit: int) -> List[Dict]:
+    """Turn (title, href, snippet) candidates into deduplicated rows."""
+    rows = []
+    seen = set()
+    for title, href, snippet in candidates:
+        if len(rows) >= limit:
+            break
+        link = resolve_href(href)
+        title = " ".join((title or "").split())
+        if not title or not link or dedup_key(link) in seen:
+            continue
+        seen.add(dedup_key(link))
+        rows.append(make_result(len(rows) + 1, title, link, " ".join((snippet or "").split())))
+    return rows
+
+
+# selectolax ------------------------------------------------------------------
+
+def parse_selectolax(html: str, limit: int = 100) -> List[Dict]:
+    """Parse with selectolax (``pip install selectolax``)."""
+    from selectolax.lexbor import LexborHTMLParser
+
+    tree = LexborHTMLParser(html)
+    root = tree.css_first("#rso") or tree.body
+    if root is None:
+        return []
+
+    def candidates():
+        for h3 in root.css("h3"):
+            link = container = None
+            node = h3.parent
+            while node is not None and (link is None or container is None):
+                if link is None and node.tag == "a" and node.attributes.get("href"):
+                    link = node
+                if container is None and node.tag == "div":
+                    classes = (node.attributes.get("class") or "").split()
+                    if any(c in classes for c in CONTAINER_CLASSES):
+                        container = node
+                node = node.parent
+            if link is None:
+                continue
+            snippet_node = container.css_first(SNIPPET_CSS) if container is not None else None
+            snippet = snippet_node.text(deep=True) if snippet_node is not None else ""
+            yield h3.text(deep=True), link.attributes.get("href"), snippet
+
+    return _collect(candidates(), limit)
+
+
+# lxml ------------------------------------------------------------------------
+
+def _has_class(name: str) -> str:
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+_CONTAINER_XPATH = "ancestor::div[{}][1]".format(" or ".join(_has_class(c) for c in CONTAINER_CLASSES))
+_SNIPPET_XPATH = (
+    f".//div[{_has_class('VwiC3b')}] | .//span[{_has_class('aCOpRe')}] | .//div[@data-sncf='1']"
+)
+
+
+def parse_lxml(html: str, limit: int = 100) -> List[Dict]:
+    """Parse with lxml (``pip install lxml``)."""
+    import lxml.html
+
+    doc = lxml.html.fromstring(html)
+    roots = doc.xpath("//*[@id='rso']") or doc.xpath("//body") or [doc]
+
+    def candidates():
+        for h3 in roots[0].iter("h3"):
+            links = h3.xpath("ancestor::a[@href][1]")
+            if not links:
+                continue
+            containers = h3.xpath(_CONTAINER_XPATH)
+            snippets = containers[0].xpath(_SNIPPET_XPATH) if containers else []
+            snippet = snippets[0].text_content() if snippets else ""
+            yield h3.text_content(), links[0].get("href"), snippet
+
+    return _collect(candidates(), limit)
+
+
+# stdlib ----------------------------------------------------------------------
+
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link",
+             "meta", "param", "source", "track", "wbr"}
+SKIP_TEXT_TAGS = {"script", "style"}
+
+
+class _Node:
+    __slots__ = ("tag", "attrs", "parent", "children")
+
+    def __init__(self, tag, attrs, parent):
+        self.tag = tag
+        self.attrs = attrs
+        self.parent = parent
+        self.children = []
+
+    def has_class(self, name):
+        return name in (self.attrs.get("class") or "").split()
+
+    def iter(self, tag=None):
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, _Node):
+                if tag is None or node.tag == tag:
+                    yield node
+                stack.extend(reversed(node.children))
+
+    def text(self):
+        parts = []
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, str):
+                parts.append(node)
+            elif node.tag not in SKIP_TEXT_TAGS:
+                stack.extend(reversed(node.children))
+        return "".join(parts)
+
+
+class _TreeBuilder(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = _Node("#document", {}, None)
+        self.current = self.root
+
+    def handle_starttag(self, tag, attrs):
+        node = _Node(tag, dict(attrs), self.current)
+        self.current.children.append(node)
+        if tag not in VOID_TAGS:
+            self.current = node
+
+    def handle_startendtag(self, tag, attrs):
+        self.current.children.append(_Node(tag, dict(attrs), self.current))
+
+    def handle_endtag(self, tag):
+        node = self.current
+        while node is not None and node.tag != tag:
+            node = node.parent
+        if node is not None and node.parent is not None:
+            self.current = node.parent
+
+    def handle_data(self, data):
+        self.current.children.append(data)
+
+
+def _is_snippet(node) -> bool:
+    return ((node.tag == "div" and (node.has_class("VwiC3b") or node.attrs.get("data-sncf") == "1"))
+            or (node.tag == "span" and node.has_class("aCOpRe")))
+
+
+def parse_stdlib(html: str, limit: int = 100) -> List[Dict]:
+    """Parse with the standard library ``html.parser``; slowest, no dependencies."""
+    builder = _TreeBuilder()
+    builder.feed(html)
+    builder.close()
+    doc = builder.root
+    root = next((n for n in doc.iter() if n.attrs.get("id") == "rso"), None)
+    if root is None:
+        root = next(doc.iter("body"), doc)
+
+    def candidates():
+        for h3 in root.iter("h3"):
+            link = container = None
+            node = h3.parent
+            while node is not None and (link is None or container is None):
+                if link is None and node.tag == "a" and node.attrs.get("href"):
+                    link = node
+                if container is None and node.tag == "div" and any(node.has_class(c) for c in CONTAINER_CLASSES):
+                    container = node
+                node = node.parent
+            if link is None:
+                continue
+            snippet_node = next((n for n in container.iter() if _is_snippet(n)), None) if container else None
+            yield h3.text(), link.attrs.get("href"), snippet_node.text() if snippet_node else ""
+
+    return _collect(candidates(), limit)
+
+
+# registry --------------------------------------------------------------------
+
+PARSERS = {
+    "selectolax": (parse_selectolax, "selectolax"),
+    "lxml": (parse_lxml, "lxml"),
+    "stdlib": (parse_stdlib, None),
+}
+
+
+def available_parsers() -> List[str]:
+    """Names of the engines whose dependency is installed, fastest first."""
+    return [name for name, (_, module) in PARSERS.items()
+            if module is None or importlib.util.find_spec(module) is not None]
+
+
+def get_parser(name: str = "auto") -> Callable[..., List[Dict]]:
+    """
+    Return a parse function ``fn(html, limit=100) -> rows``.
+
+    Args:
+        name (str): Engine name from PARSERS, or "auto" for the fastest installed one
+
+    Raises:
+        ValueError: If the engine is unknown
+        ImportError: If the engine's package is not installed
+    """
+    if name == "auto":
+        name = available_parsers()[0]
+    if name not in PARSERS:
+        raise ValueError(f"unknown parser {name!r}, choose from {sorted(PARSERS)}")
+    fn, module = PARSERS[name]
+    if module is not None and importlib.util.find_spec(module) is None:
+        raise ImportError(f"parser {name!r} needs the {module!r} package (pip install {module})")
+    return fn
@@ -0,0 +1,243 @@
+"""
+Playwright fetch engine: many isolated browser contexts per browser process.
+
+Every Selenium session is a whole Chrome process (plus chromedriver). A
+Playwright browser context is a separate profile - its own cookies, cache
+and storage - inside an already running browser, and opens in milliseconds.
+``PlaywrightEngine`` starts ``processes`` Chromium processes and runs up to
+``contexts_per_process`` queries in each of them at once, every query in a
+fresh context. Pages are waited for and extracted with the same in-page
+scripts as the Selenium path (``src.waits``, ``src.extract``), so rows come
+out in the shared schema and feed the same selector statistics.
+
+Playwright's sync API is bound to the thread that started it, so the engine
+drives the async API on one event loop thread and ``fetch`` may be called
+from any number of worker threads.
+
+Usage:
+    with PlaywrightEngine(contexts_per_process=8) as engine:
+        rows = engine.fetch("https://www.google.com/search?q=python", limit=10)
+
+    python -m src.main --batch queries.txt --backend playwright --workers 16 --contexts-per-process 8
+"""
+
+import asyncio
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List
+
+from .driver import DEFAULT_USER_AGENT
+from .extract import BLOCK_CHAIN, EXTRACT_SCRIPT, SNIPPET_CHAIN, rows_from_script
+from .tracing import add_span
+from .waits import READY_SCRIPT
+
+
+def promise_script(script: str) -> str:
+    """
+    Wrap an ``execute_async_script`` body, which reads ``arguments`` and
+    reports through the trailing callback, as a function for ``page.evaluate``.
+    """
+    return ("(args) => new Promise((resolve) => (function () {\n" + script
+            + "\n}).apply(null, args.concat([resolve])))")
+
+
+READY_FUNCTION = promise_script(READY_SCRIPT)
+EXTRACT_FUNCTION = promise_script(EXTRACT_SCRIPT)
+
+
+class _Timings(list):
+    """(phase, start, seconds, attrs) tuples collected on the event loop."""
+
+    @contextmanager
+    def phase(self, name: str, **attrs):
+        start, t0 = time.time(), time.perf_counter()
+        try:
+            yield attrs
+        finally:
+            self.append((name, start, time.perf_counter() - t0, attrs))
+
+
+class PlaywrightEngine:
+    """Load and extract SERPs in short-lived contexts of a few shared Chromium processes."""
+
+    def __init__(self, processes: int = 1, contexts_per_process: int = 8, headless: bool = True,
+                 block_resources=False, user_agent: str = DEFAULT_USER_AGENT, locale: str = "en-US"):
+        """
+        Args:
+            processes (int): Chromium processes to launch
+            contexts_per_process (int): Queries run concurrently in each process
+            headless (bool): Run Chromium without a window
+            block_resources (bool or list): Block images, fonts, media and
+                third-party scripts (True), or the given URL patterns
+            user_agent (str): User agent of every context
+            locale (str): Locale of every context
+        """
+        if processes < 1 or contexts_per_process < 1:
+            raise ValueError("processes and contexts_per_process must be at least 1")
+        self.processes = processes
+        self.contexts_per_process = contexts_per_process
+        self.headless = headless
+        self.block_resources = block_resources
+        self.user_agent = user_agent
+        self.locale = locale
+
+        self._lock = threading.Lock()
+        self._loop = None
+        self._thread = None
+        self._playwright = None
+        self._browsers = []
+        self._active = []
+        self._slots = None
+
+        self._contexts = 0
+        self._failures = 0
+        self._in_flight = 0
+        self._peak = 0
+
+    @property
+    def capacity(self) -> int:
+        """Queries the engine runs at once."""
+        return self.processes * self.contexts_per_process
+
+    def start(self) -> "PlaywrightEngine":
+        """Launch the browsers; called by the first ``fetch`` if not done before."""
+        with self._lock:
+            if self._loop is not None:
+                return self
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=loop.run_forever, name="playwright-engine", daemon=True)
+            thread.start()
+            try:
+                asyncio.run_coroutine_threadsafe(self._start(), loop).result()
+            except BaseException:
+                asyncio.run_coroutine_threadsafe(self._stop(), loop).result()
+                loop.call_soon_threadsafe(loop.stop)
+                thread.join()
+                loop.close()
+                raise
+            self._loop, self._thread = loop, thread
+        return self
+
+    async def _start(self):
+        from playwright.async_api import async_playwright
+
+        start, t0 = time.time(), time.perf_counter()
+        self._playwright = await async_playwright().start()
+        for _ in range(self.processes):
+            self._browsers.append(await self._playwright.chromium.launch(
+                headless=self.headless, args=["--disable-blink-features=AutomationControlled"]
+            ))
+        self._active = [0] * self.processes
+        self._slots = asyncio.Semaphore(self.capacity)
+        add_span("driver_start", start, time.perf_counter() - t0, engine="playwright", processes=self.processes)
+
+    def fetch(self, url: str, limit: int = 10, selector: str = "#search h3", quiet_ms: int = 200,
+              timeout: float = 10, recorder=None) -> List[Dict]:
+        """
+        Load ``url`` in a fresh context, wait for results and extract them.
+
+        Blocks until a context slot is free. Safe to call from many threads.
+
+        Args:
+            url (str): SERP URL
+            limit (int): Maximum number of results
+            selector (str): CSS selector that signals the results rendered
+            quiet_ms (int): DOM silence that counts as "results rendered"
+            timeout (float): Seconds allowed for navigation and for the wait
+            recorder (WaitRecorder): Receives the time spent per phase
+
+        Returns:
+            list: Result rows in the shared schema
+        """
+        self.start()
+        future = asyncio.run_coroutine_threadsafe(
+            self._fetch(url, limit, selector, quiet_ms, timeout), self._loop
+        )
+        raw, timings = future.result()
+        for name, start, seconds, attrs in timings:
+            add_span(name, start, seconds, **attrs)
+            if recorder is not None:
+                recorder.add(name, seconds, timed_out=attrs.get("timed_out", False))
+        return rows_from_script(raw)
+
+    async def _fetch(self, url, limit, selector, quiet_ms, timeout):
+        timings = _Timings()
+        async with self._slots:
+            # Least loaded process first; the semaphore guarantees one has a free slot.
+            index = min(range(self.processes), key=self._active.__getitem__)
+            self._active[index] += 1
+            self._in_flight += 1
+            self._peak = max(self._peak, self._in_flight)
+            context = None
+            try:
+                with timings.phase("context"):
+                    context = await self._browsers[index].new_context(user_agent=self.user_agent,
+                                                                      locale=self.locale)
+                    page = await context.new_page()
+                    if self.block_resources:
+                        await self._block(context, page)
+                    self._contexts += 1
+                with timings.phase("navigate"):
+                    await page.goto(url, wait_until="domcontentloaded", timeout=timeout * 1000)
+                with timings.phase("ready") as attrs:
+                    result = await page.evaluate(READY_FUNCTION, [selector, int(quiet_ms), int(timeout * 1000)])
+                    attrs["timed_out"] = not (result or {}).get("ok")
+                with timings.phase("extract"):
+                    raw = await page.evaluate(EXTRACT_FUNCTION, [
+                        limit, BLOCK_CHAIN.ordered(), SNIPPET_CHAIN.ordered(), int(timeout * 1000)
+                    ])
+            except BaseException:
+                self._failures += 1
+                raise
+            finally:
+                self._active[index] -= 1
+                self._in_flight -= 1
+                if context is not None:
+                    await context.close()
+        return raw, timings
+
+    async def _block(self, context, page):
+        from .network import DEFAULT_BLOCKED_PATTERNS
+
+        patterns = DEFAULT_BLOCKED_PATTERNS if self.block_resources is True else self.block_resources
+        cdp = await context.new_cdp_session(page)
+        await cdp.send("Network.enable")
+        await cdp.send("Network.setBlockedURLs", {"urls": list(patterns)})
+
+    def stats(self) -> Dict:
+        return {
+            "processes": self.processes,
+            "contexts_per_process": self.contexts_per_process,
+            "contexts_opened": self._contexts,
+            "failures": self._failures,
+            "peak_in_flight": self._peak,
+        }
+
+    async def _stop(self):
+        for browser in self._browsers:
+            try:
+                await browser.close()
+            except Exception:
+                pass
+        self._browsers = []
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+    def close(self) -> None:
+        """Close every browser and stop the event loop. Safe to call twice."""
+        with self._lock:
+            loop, self._loop = self._loop, None
+            if loop is None:
+                return
+            asyncio.run_coroutine_threadsafe(self._stop(), loop).result()
+            loop.call_soon_threadsafe(loop.stop)
+            self._thread.join()
+            loop.close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
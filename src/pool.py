@@ -0,0 +1,336 @@
+"""
+A pool of warm WebDriver sessions leased to queries.
+
+Starting Chrome costs several seconds, so instead of ``build_driver()`` /
+``driver.quit()`` around every query the pool keeps up to ``size`` sessions
+alive and hands them out with ``lease()``. Sessions are health checked on
+lease and recycled after ``max_pages`` leases or once the browser process
+tree grows past ``max_rss_mb`` (the generalized form of the
+``y % 100 == 0`` restart in apolloio.py), or handed to a
+``src.governor.MemoryGovernor`` that recycles them softly first.
+
+Usage:
+    pool = DriverPool(size=3, headless=True)
+    with pool.lease() as driver:
+        driver.get("https://www.google.com/search?q=python")
+    print(pool.stats())
+    pool.close()
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+
+
+def process_tree(pid: int) -> Optional[List[int]]:
+    """
+    ``pid`` and the pids of all of its descendants.
+
+    Reads /proc directly so it works without psutil; returns None where
+    /proc is not available.
+    """
+    if not os.path.isdir("/proc"):
+        return None
+    children = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # The command name can contain spaces, so split after its closing ")".
+        ppid = int(stat.rsplit(")", 1)[1].split()[1])
+        children.setdefault(ppid, []).append(int(entry))
+
+    tree = []
+    stack = [pid]
+    while stack:
+        current = stack.pop()
+        tree.append(current)
+        stack.extend(children.get(current, []))
+    return tree
+
+
+def process_tree_rss(pid: int) -> Optional[int]:
+    """Resident memory in bytes of ``pid`` and all of its descendants, None without /proc."""
+    tree = process_tree(pid)
+    if tree is None:
+        return None
+    page = os.sysconf("SC_PAGE_SIZE")
+    total = 0
+    for current in tree:
+        try:
+            with open(f"/proc/{current}/statm") as f:
+                total += int(f.read().split()[1]) * page
+        except OSError:
+            continue
+    return total
+
+
+def process_tree_cpu(pid: int) -> Optional[float]:
+    """
+    CPU seconds (user + system) used so far by ``pid`` and its descendants,
+    including exited ones their parents have reaped (e.g. closed renderer
+    processes). None where /proc is not available.
+    """
+    tree = process_tree(pid)
+    if tree is None:
+        return None
+    ticks = os.sysconf("SC_CLK_TCK")
+    total = 0
+    for current in tree:
+        try:
+            with open(f"/proc/{current}/stat") as f:
+                fields = f.read().rsplit(")", 1)[1].split()
+        except OSError:
+            continue
+        # utime, stime, cutime and cstime are fields 14-17 of proc(5); fields[0] here is field 3.
+        total += sum(int(n) for n in fields[11:15])
+    return total / ticks
+
+
+def driver_rss(driver) -> Optional[int]:
+    """Resident memory in bytes of chromedriver plus the browser it started."""
+    try:
+        pid = driver.service.process.pid
+    except AttributeError:
+        return None
+    return process_tree_rss(pid)
+
+
+class PooledDriver:
+    """A driver owned by the pool plus its usage counters."""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.created = time.monotonic()
+        self.pages = 0
+
+
+class DriverPool:
+    """Keep up to ``size`` WebDriver sessions warm and lease them out."""
+
+    def __init__(self, size: int = 2, factory: Optional[Callable] = None, max_pages: int = 100,
+                 max_rss_mb: Optional[float] = None, health_check: bool = True, governor=None,
+                 **driver_kwargs):
+        """
+        Args:
+            size (int): Maximum number of concurrent sessions
+            factory (callable): Returns a new driver; defaults to
+                ``src.driver.build_driver(**driver_kwargs)``
+            max_pages (int): Recycle a session after this many leases
+            max_rss_mb (float): Recycle a session once its process tree
+                uses more resident memory than this
+            health_check (bool): Ping each session before leasing it
+            governor (MemoryGovernor): Checks each returned session and soft
+                or hard recycles it (keeping cookies) when it uses too much memory
+            **driver_kwargs: Forwarded to the default factory
+        """
+        if size < 1:
+            raise ValueError("pool size must be at least 1")
+        if factory is None:
+            from .driver import build_driver
+
+            def factory():
+                return build_driver(**driver_kwargs)
+
+        self.size = size
+        self.factory = factory
+        self.max_pages = max_pages
+        self.max_rss_mb = max_rss_mb
+        self.health_check = health_check
+        self.governor = governor
+
+        self._cond = threading.Condition()
+        self._idle = []
+        self._count = 0
+        self._closed = False
+
+        self._started = time.monotonic()
+        self._busy = 0.0
+        self._in_use = 0
+        self._leases = 0
+        self._wait = 0.0
+        self._created = 0
+        self._recycled = {"pages": 0, "rss": 0, "unhealthy": 0}
+
+    def warm(self, n: Optional[int] = None) -> None:
+        """Start ``n`` sessions up front (all ``size`` by default)."""
+        n = self.size if n is None else min(n, self.size)
+        with self._cond:
+            missing = max(n - self._count, 0)
+            self._count += missing
+        for _ in range(missing):
+            try:
+                pooled = self._create()
+            except Exception:
+                with self._cond:
+                    self._count -= 1
+                    self._cond.notify()
+                raise
+            with self._cond:
+                self._idle.append(pooled)
+                self._cond.notify()
+
+    @contextmanager
+    def lease(self, timeout: Optional[float] = None):
+        """
+        Borrow a healthy driver for the duration of a ``with`` block.
+
+        Args:
+            timeout (float): Seconds to wait for a free session, None waits forever
+
+        Raises:
+            TimeoutError: If no session became free in time
+        """
+        t0 = time.monotonic()
+        pooled = self._acquire(timeout)
+        leased_at = time.monotonic()
+        with self._cond:
+            self._wait += leased_at - t0
+            self._leases += 1
+            self._in_use += 1
+        broken = False
+        try:
+            yield pooled.driver
+        except Exception:
+            broken = not self._is_healthy(pooled)
+            raise
+        finally:
+            pooled.pages += 1
+            with self._cond:
+                self._busy += time.monotonic() - leased_at
+                self._in_use -= 1
+            self._release(pooled, broken)
+
+    def _acquire(self, timeout):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._cond:
+                while not self._idle and self._count >= self.size:
+                    if self._closed:
+                        raise RuntimeError("pool is closed")
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        raise TimeoutError(f"no driver free after {timeout}s")
+                    self._cond.wait(remaining)
+                if self._closed:
+                    raise RuntimeError("pool is closed")
+                if self._idle:
+                    pooled = self._idle.pop()
+                else:
+                    pooled = None
+                    self._count += 1
+
+            if pooled is None:
+                try:
+                    return self._create()
+                except Exception:
+                    with self._cond:
+                        self._count -= 1
+                        self._cond.notify()
+                    raise
+            if not self.health_check or self._is_healthy(pooled):
+                return pooled
+            self._discard(pooled, "unhealthy")
+
+    def _release(self, pooled, broken):
+        reason = None
+        if broken:
+            reason = "unhealthy"
+        elif self.max_pages and pooled.pages >= self.max_pages:
+            reason = "pages"
+        elif self.max_rss_mb is not None:
+            rss = driver_rss(pooled.driver)
+            if rss is not None and rss > self.max_rss_mb * 1024 * 1024:
+                reason = "rss"
+        if reason is None and self.governor is not None:
+            try:
+                driver = self.governor.check(pooled.driver, self.factory)
+            except Exception:
+                reason = "unhealthy"
+            else:
+                if driver is not pooled.driver:
+                    pooled.driver, pooled.pages, pooled.created = driver, 0, time.monotonic()
+                    with self._cond:
+                        self._created += 1
+
+        if reason:
+            self._discard(pooled, reason)
+            return
+        with self._cond:
+            if self._closed:
+                self._count -= 1
+                self._quit(pooled)
+            else:
+                self._idle.append(pooled)
+            self._cond.notify()
+
+    def _create(self):
+        pooled = PooledDriver(self.factory())
+        with self._cond:
+            self._created += 1
+        return pooled
+
+    def _discard(self, pooled, reason):
+        self._quit(pooled)
+        with self._cond:
+            self._count -= 1
+            self._recycled[reason] += 1
+            self._cond.notify()
+
+    @staticmethod
+    def _quit(pooled):
+        try:
+            pooled.driver.quit()
+        except Exception:
+            pass
+
+    @staticmethod
+    def _is_healthy(pooled) -> bool:
+        try:
+            return pooled.driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    def stats(self) -> Dict:
+        """
+        Pool utilization so far.
+
+        Returns:
+            dict: ``utilization`` is busy session-seconds divided by
+            ``size`` times wall time since the pool was created
+        """
+        with self._cond:
+            elapsed = max(time.monotonic() - self._started, 1e-9)
+            return {
+                "size": self.size,
+                "alive": self._count,
+                "idle": len(self._idle),
+                "in_use": self._in_use,
+                "leases": self._leases,
+                "created": self._created,
+                "recycled": dict(self._recycled),
+                "avg_wait_s": round(self._wait / self._leases, 3) if self._leases else 0.0,
+                "utilization": round(self._busy / (self.size * elapsed), 3),
+            }
+
+    def close(self) -> None:
+        """Quit idle sessions now and in-use sessions as they are returned."""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._count -= len(idle)
+            self._cond.notify_all()
+        for pooled in idle:
+            self._quit(pooled)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
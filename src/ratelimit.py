@@ -0,0 +1,299 @@
+"""
+Per-host and per-API pacing with token buckets and a daily quota ledger.
+
+Pacing used to be a fixed ``--sleep`` between SerpAPI pages in
+``fetch_multiple``, ``time.sleep(2)`` between Monday.com mutations in
+crm.py and ad-hoc sleeps in PropertyScraper. Each of those serializes the
+work at a conservative rate. ``RateScheduler`` keeps one token bucket per
+key (a backend name such as ``serpapi`` or a host such as
+``api.monday.com``): up to ``burst`` calls go out at once, after that
+calls are spaced exactly ``1 / rate`` seconds apart however many worker
+threads share the key. Every caller reserves its slot under a lock and
+sleeps outside it, so workers neither collide nor idle. Keys with a
+``daily`` limit are also counted in a ``QuotaLedger`` (SQLite, per UTC
+day), which survives restarts and raises ``QuotaExhausted`` once the day's
+allowance is used up.
+
+Usage:
+    scheduler = RateScheduler({"serpapi": Limit(rate=1, burst=5, daily=250),
+                               "api.monday.com": parse_limit("60/min")},
+                              ledger=QuotaLedger(".cache/quota.sqlite"))
+    scheduler.acquire("serpapi")                         # by key
+    scheduler.acquire("https://api.monday.com/v2")       # by URL, matched on host
+
+    python -m src.main --batch queries.txt --rate serpapi=1:5 --daily-quota serpapi=250
+"""
+
+import datetime as dt
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, Optional
+from urllib.parse import urlsplit
+
+from .backends import QuotaExhausted
+
+DEFAULT_LEDGER_PATH = os.path.join(".cache", "quota.sqlite")
+UNITS = {"": 1, "s": 1, "sec": 1, "min": 60, "m": 60, "h": 3600, "hour": 3600, "d": 86400, "day": 86400}
+
+
+class TokenBucket:
+    """``rate`` tokens per second, at most ``burst`` saved up."""
+
+    def __init__(self, rate: float, burst: int = 1):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._stamp = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: int = 1) -> float:
+        """
+        Take ``tokens`` now, going into debt if there are not enough.
+
+        Returns:
+            float: Seconds the caller must wait before using them
+        """
+        if tokens > self.burst:
+            raise ValueError(f"cannot take {tokens} tokens from a bucket of {self.burst}")
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._stamp) * self.rate)
+            self._stamp = now
+            self._tokens -= tokens
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def refund(self, tokens: int = 1) -> None:
+        with self._lock:
+            self._tokens = min(self.burst, self._tokens + tokens)
+
+    def acquire(self, tokens: int = 1, max_wait: Optional[float] = None) -> float:
+        """
+        Block until ``tokens`` may be used.
+
+        Raises:
+            TimeoutError: If that would take longer than ``max_wait`` (nothing is taken)
+
+        Returns:
+            float: Seconds waited
+        """
+        wait = self.reserve(tokens)
+        if max_wait is not None and wait > max_wait:
+            self.refund(tokens)
+            raise TimeoutError(f"rate limit: next slot in {wait:.1f}s")
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+class Limit:
+    """Pacing for one key: ``rate`` calls per second, ``burst`` at once, ``daily`` per UTC day."""
+
+    def __init__(self, rate: Optional[float] = None, burst: int = 1, daily: Optional[int] = None):
+        self.rate = rate
+        self.burst = burst
+        self.daily = daily
+
+    def __repr__(self):
+        return f"Limit(rate={self.rate}, burst={self.burst}, daily={self.daily})"
+
+
+def parse_limit(spec: str) -> Limit:
+    """
+    Parse ``RATE[/UNIT][:BURST]``, e.g. ``2`` (per second), ``30/min``, ``1000/day:20``.
+
+    Raises:
+        ValueError: On malformed specs
+    """
+    match = re.fullmatch(r"\s*([\d.]+)\s*(?:/\s*([a-z]*))?\s*(?::\s*(\d+))?\s*", spec.lower())
+    if not match or match.group(2) not in (None, *UNITS):
+        raise ValueError(f"bad rate {spec!r}, expected e.g. 2, 30/min or 1/s:5")
+    per = UNITS[match.group(2) or ""]
+    return Limit(rate=float(match.group(1)) / per, burst=int(match.group(3) or 1))
+
+
+def _today() -> str:
+    return dt.datetime.now(dt.timezone.utc).date().isoformat()
+
+
+class QuotaLedger:
+    """SQLite ledger of calls per key and UTC day."""
+
+    def __init__(self, path: str = DEFAULT_LEDGER_PATH, today: Callable[[], str] = _today):
+        """
+        Args:
+            path (str): SQLite file, or ":memory:"
+            today (callable): Returns the current day as a string; injectable for tests
+        """
+        folder = os.path.dirname(path)
+        if path != ":memory:" and folder:
+            os.makedirs(folder, exist_ok=True)
+        self.path = path
+        self.today = today
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            """CREATE TABLE IF NOT EXISTS usage (
+                   key TEXT NOT NULL,
+                   day TEXT NOT NULL,
+                   used INTEGER NOT NULL,
+                   PRIMARY KEY (key, day)
+               )"""
+        )
+        self._db.commit()
+
+    def used(self, key: str, day: Optional[str] = None) -> int:
+        with self._lock:
+            row = self._db.execute("SELECT used FROM usage WHERE key = ? AND day = ?",
+                                   (key, day or self.today())).fetchone()
+        return row[0] if row else 0
+
+    def consume(self, key: str, limit: Optional[int] = None, n: int = 1) -> int:
+        """
+        Count ``n`` calls for ``key`` today.
+
+        Raises:
+            QuotaExhausted: If that would exceed ``limit`` (nothing is counted)
+
+        Returns:
+            int: Calls left today, -1 without a limit
+        """
+        day = self.today()
+        with self._lock:
+            row = self._db.execute("SELECT used FROM usage WHERE key = ? AND day = ?", (key, day)).fetchone()
+            used = row[0] if row else 0
+            if limit is not None and used + n > limit:
+                raise QuotaExhausted(f"{key}: daily quota of {limit} used up")
+            self._db.execute(
+                "INSERT INTO usage (key, day, used) VALUES (?, ?, ?) "
+                "ON CONFLICT (key, day) DO UPDATE SET used = used + excluded.used",
+                (key, day, n),
+            )
+            self._db.commit()
+        return -1 if limit is None else limit - used - n
+
+    def usage(self, day: Optional[str] = None) -> Dict[str, int]:
+        """Calls per key on ``day`` (today by default)."""
+        with self._lock:
+            rows = self._db.execute("SELECT key, used FROM usage WHERE day = ? ORDER BY key",
+                                    (day or self.today(),)).fetchall()
+        return dict(rows)
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+class RateScheduler:
+    """Token buckets and daily quotas per backend or host, shared by all worker threads."""
+
+    def __init__(self, limits: Optional[Dict[str, Limit]] = None, default: Optional[Limit] = None,
+                 ledger: Optional[QuotaLedger] = None):
+        """
+        Args:
+            limits (dict): Limit per key; keys are backend names or hosts
+                (a host key also covers its subdomains)
+            default (Limit): Limit for keys not in ``limits``, None for unlimited
+            ledger (QuotaLedger): Where daily counts are kept; in memory if omitted
+        """
+        self.limits = {key.lower(): limit for key, limit in (limits or {}).items()}
+        self.default = default
+        self.ledger = ledger
+        self._buckets = {}
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def resolve(self, target: str) -> str:
+        """The key ``target`` (a key, host or URL) is paced under."""
+        target = target.lower()
+        host = urlsplit(target).hostname if "://" in target else target
+        candidate = host or target
+        while candidate:
+            if candidate in self.limits:
+                return candidate
+            candidate = candidate.partition(".")[2]
+        return host or target
+
+    def limit(self, key: str) -> Optional[Limit]:
+        return self.limits.get(key, self.default)
+
+    def _bucket(self, key: str, limit: Limit) -> TokenBucket:
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = TokenBucket(limit.rate, limit.burst)
+            return bucket
+
+    def acquire(self, target: str, max_wait: Optional[float] = None) -> float:
+        """
+        Wait for a slot for ``target`` and count it against the daily quota.
+
+        The quota is checked before waiting, so queued workers never overrun it.
+
+        Raises:
+            QuotaExhausted: If the key's daily quota is used up
+            TimeoutError: If the slot is more than ``max_wait`` seconds away
+
+        Returns:
+            float: Seconds waited
+        """
+        key = self.resolve(target)
+        limit = self.limit(key)
+        if limit is None:
+            return 0.0
+        if limit.daily is not None:
+            if self.ledger is None:
+                with self._lock:
+                    if self.ledger is None:
+                        self.ledger = QuotaLedger(":memory:")
+            self.ledger.consume(key, limit.daily)
+        waited = 0.0
+        if limit.rate:
+            try:
+                waited = self._bucket(key, limit).acquire(max_wait=max_wait)
+            except TimeoutError:
+                if limit.daily is not None:
+                    self.ledger.consume(key, n=-1)  # the call is not made, give it back
+                raise
+        with self._lock:
+            s = self._stats.setdefault(key, {"calls": 0, "waited_s": 0.0, "max_wait_s": 0.0})
+            s["calls"] += 1
+            s["waited_s"] += waited
+            s["max_wait_s"] = max(s["max_wait_s"], waited)
+        return waited
+
+    def remaining(self, target: str) -> Optional[int]:
+        """Calls left today for ``target``, None without a daily limit."""
+        key = self.resolve(target)
+        limit = self.limit(key)
+        if limit is None or limit.daily is None:
+            return None
+        used = self.ledger.used(key) if self.ledger is not None else 0
+        return max(0, limit.daily - used)
+
+    def limited(self, fn: Callable, target: str) -> Callable:
+        """Wrap ``fn`` so every call first acquires a slot for ``target``."""
+        def call(*args, **kwargs):
+            self.acquire(target)
+            return fn(*args, **kwargs)
+        return call
+
+    def stats(self) -> Dict[str, Dict]:
+        """Per key: calls, seconds waited in total and at most, and calls left today where limited."""
+        with self._lock:
+            out = {key: dict(s, waited_s=round(s["waited_s"], 3), max_wait_s=round(s["max_wait_s"], 3))
+                   for key, s in self._stats.items()}
+        for key, s in out.items():
+            left = self.remaining(key)
+            if left is not None:
+                s["left_today"] = left
+        return out
+
+    def close(self) -> None:
+        if self.ledger is not None:
+            self.ledger.close()
@@ -0,0 +1,323 @@
+"""
+Recorded-SERP corpus: record live pages once, replay them offline.
+
+Tests such as ``Tarun_Sharma/tests/test_scraper.py`` query live Google, so
+they are slow, flaky and measure nothing repeatable. ``record`` saves each
+page's raw HTML next to a JSON metadata file (query, URL, locale, time,
+extracted results); ``replay`` feeds the recorded pages to any extractor
+and scores its throughput and its results against the recorded ones; and
+``ReplayServer`` serves the corpus over local HTTP at ``/search?q=...`` so
+a real browser (``SeleniumBackend(search_url=server.search_url)``) can be
+pointed at it.
+
+Corpus layout:
+    tests/fixtures/serp/python_programming.html
+    tests/fixtures/serp/python_programming.json   {"query": ..., "results": [...]}
+
+Usage:
+    python -m src.replay record --query "python programming" --corpus tests/fixtures/serp
+    python -m src.replay replay --corpus tests/fixtures/serp --engine stdlib
+    python -m src.replay serve --corpus tests/fixtures/serp --port 8765
+"""
+
+import argparse
+import datetime as dt
+import glob
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional
+from urllib.parse import parse_qs, quote_plus, urlsplit
+
+from .helpers import normalize_query
+from .urls import dedup_key
+
+
+class RecordedPage:
+    """One recorded SERP: raw HTML plus its metadata."""
+
+    def __init__(self, name: str, html: str, meta: Dict):
+        self.name = name
+        self.html = html
+        self.meta = meta
+
+    @property
+    def query(self) -> str:
+        return self.meta.get("query", self.name.replace("_", " "))
+
+    @property
+    def start(self) -> int:
+        return int(self.meta.get("start", 0))
+
+    @property
+    def expected(self) -> Optional[List[Dict]]:
+        return self.meta.get("results")
+
+
+def slugify(query: str, start: int = 0) -> str:
+    """File name stem for a recorded query, e.g. "python programming" -> "python_programming"."""
+    slug = re.sub(r"[^\w]+", "_", normalize_query(query)).strip("_") or "page"
+    return f"{slug}_start{start}" if start else slug
+
+
+def save_page(corpus: str, query: str, html: str, url: str = "", start: int = 0,
+              results: Optional[List[Dict]] = None, **meta) -> str:
+    """
+    Write ``<slug>.html`` and ``<slug>.json`` into ``corpus``.
+
+    Args:
+        corpus (str): Corpus directory
+        query (str): The query the page answers
+        html (str): Raw page source
+        url (str): URL the page was loaded from
+        start (int): Result offset of the page
+        results (list): Rows extracted at record time, used as the expected output on replay
+        **meta: Extra metadata (hl, gl, user_agent, backend ...)
+
+    Returns:
+        str: Path of the HTML file
+    """
+    os.makedirs(corpus, exist_ok=True)
+    stem = os.path.join(corpus, slugify(query, start))
+    with open(stem + ".html", "w", encoding="utf-8") as f:
+        f.write(html)
+    meta.update({
+        "query": query,
+        "url": url,
+        "start": start,
+        "recorded_at": dt.datetime.now(dt.timezone.utc).isoformat(timespec="seconds"),
+        "sha256": hashlib.sha256(html.encode("utf-8")).hexdigest(),
+        "results": results,
+    })
+    with open(stem + ".json", "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2, ensure_ascii=False)
+    return stem + ".html"
+
+
+def load_corpus(corpus: str) -> List[RecordedPage]:
+    """Every recorded page below ``corpus``; pages without a .json get metadata from the file name."""
+    pages = []
+    for path in sorted(glob.glob(os.path.join(corpus, "**", "*.html"), recursive=True)):
+        stem = os.path.splitext(path)[0]
+        with open(path, encoding="utf-8", errors="replace") as f:
+            html = f.read()
+        meta = {}
+        if os.path.exists(stem + ".json"):
+            with open(stem + ".json", encoding="utf-8") as f:
+                meta = json.load(f)
+        pages.append(RecordedPage(os.path.basename(stem), html, meta))
+    return pages
+
+
+def record(driver, query: str, corpus: str, hl: str = "en", gl: str = "us", start: int = 0,
+           timeout: float = 10) -> str:
+    """
+    Load a live SERP in ``driver`` and save it to ``corpus`` with its extracted results.
+
+    Returns:
+        str: Path of the HTML file
+    """
+    from .extract import extract_results
+    from .waits import wait_ready
+
+    url = f"https://www.google.com/search?q={quote_plus(query)}&hl={hl}&gl={gl}&start={start}&pws=0"
+    driver.get(url)
+    wait_ready(driver, selector="#search h3", timeout=timeout)
+    results = extract_results(driver, limit=100, timeout=0)
+    user_agent = driver.execute_script("return navigator.userAgent")
+    return save_page(corpus, query, driver.page_source, url=url, start=start, results=results,
+                     hl=hl, gl=gl, user_agent=user_agent, backend="selenium")
+
+
+def score(rows: List[Dict], expected: List[Dict]) -> Dict[str, float]:
+    """Precision and recall of ``rows`` against ``expected``, matching by link."""
+    got = {dedup_key(r.get("link")) for r in rows} - {""}
+    want = {dedup_key(r.get("link")) for r in expected} - {""}
+    hits = len(got & want)
+    return {
+        "precision": round(hits / len(got), 3) if got else float(not want),
+        "recall": round(hits / len(want), 3) if want else 1.0,
+    }
+
+
+def replay(extract: Callable[[str], List[Dict]], pages: List[RecordedPage], repeat: int = 1) -> Dict:
+    """
+    Run ``extract(html)`` over recorded pages and measure speed and correctness.
+
+    Args:
+        extract (callable): fn(html) -> result rows, e.g. a parser from src.parsers
+        pages (list): Recorded pages, see load_corpus
+        repeat (int): Passes over the corpus for the timing
+
+    Returns:
+        dict: pages_per_sec, results, and mean precision/recall over pages with expected results,
+        plus per-page details under ``pages``
+    """
+    if not pages:
+        raise ValueError("empty corpus")
+    details = []
+    for page in pages:
+        rows = extract(page.html)
+        entry = {"page": page.name, "results": len(rows)}
+        if page.expected is not None:
+            entry.update(score(rows, page.expected))
+        details.append(entry)
+
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        for page in pages:
+            extract(page.html)
+    elapsed = time.perf_counter() - t0
+
+    scored = [d for d in details if "recall" in d]
+    report = {
+        "pages": details,
+        "pages_per_sec": round(len(pages) * repeat / elapsed, 1) if elapsed else 0.0,
+        "results": sum(d["results"] for d in details),
+    }
+    if scored:
+        report["precision"] = round(sum(d["precision"] for d in scored) / len(scored), 3)
+        report["recall"] = round(sum(d["recall"] for d in scored) / len(scored), 3)
+    return report
+
+
+class ReplayServer:
+    """
+    Local HTTP stand-in for the search engine, serving a recorded corpus.
+
+    ``GET /search?q=<query>&start=<n>`` returns the page recorded for that
+    (normalized) query and offset, ``GET /pages/<name>.html`` a page by
+    name; anything else is a 404.
+    """
+
+    def __init__(self, corpus: str, host: str = "127.0.0.1", port: int = 0):
+        """
+        Args:
+            corpus (str): Corpus directory
+            host (str): Interface to bind
+            port (int): Port, 0 for any free port
+        """
+        self.pages = load_corpus(corpus)
+        self.by_query = {(normalize_query(p.query), p.start): p for p in self.pages}
+        self.by_name = {p.name: p for p in self.pages}
+        self.requests = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.requests += 1
+                page = server.lookup(self.path)
+                if page is None:
+                    self.send_error(404, "not recorded")
+                    return
+                body = page.html.encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.thread = None
+
+    def lookup(self, path: str) -> Optional[RecordedPage]:
+        parts = urlsplit(path)
+        if parts.path == "/search":
+            params = parse_qs(parts.query)
+            query = normalize_query(params.get("q", [""])[0])
+            start = int(params.get("start", ["0"])[0] or 0)
+            return self.by_query.get((query, start))
+        if parts.path.startswith("/pages/"):
+            return self.by_name.get(os.path.splitext(parts.path[len("/pages/"):])[0])
+        return None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def search_url(self) -> str:
+        return self.base_url + "/search"
+
+    def start(self) -> "ReplayServer":
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def close(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def parse_args(argv=None):
+    p = argparse.ArgumentParser(description="Record and replay SERP pages")
+    sub = p.add_subparsers(dest="command", required=True)
+
+    rec = sub.add_parser("record", help="Save live SERPs with their extracted results")
+    rec.add_argument("--query", "-q", action="append", required=True, help="Query to record (repeatable)")
+    rec.add_argument("--corpus", required=True, help="Corpus directory")
+    rec.add_argument("--pages", type=int, default=1, help="Result pages per query")
+    rec.add_argument("--hl", default="en", help="Interface language (hl param)")
+    rec.add_argument("--gl", default="us", help="Country of search (gl param)")
+    rec.add_argument("--headed", action="store_true", help="Show the browser window")
+
+    rep = sub.add_parser("replay", help="Run a parser over the corpus and score it")
+    rep.add_argument("--corpus", required=True, help="Corpus directory")
+    rep.add_argument("--engine", default="auto", help="Parser engine from src.parsers")
+    rep.add_argument("--repeat", type=int, default=10, help="Passes over the corpus for the timing")
+
+    srv = sub.add_parser("serve", help="Serve the corpus over local HTTP")
+    srv.add_argument("--corpus", required=True, help="Corpus directory")
+    srv.add_argument("--port", type=int, default=8765, help="Port to listen on")
+    return p.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.command == "record":
+        from .driver import build_driver
+
+        driver = build_driver(headless=not args.headed)
+        try:
+            for query in args.query:
+                for page in range(args.pages):
+                    print(f"[INFO] recorded {record(driver, query, args.corpus, args.hl, args.gl, page * 10)}")
+        finally:
+            driver.quit()
+    elif args.command == "replay":
+        from .parsers import get_parser
+
+        report = replay(get_parser(args.engine), load_corpus(args.corpus), repeat=args.repeat)
+        for page in report["pages"]:
+            print(f"{page['page']:<40}{page['results']:>4} results  "
+                  f"precision {page.get('precision', '-')}  recall {page.get('recall', '-')}")
+        print(f"[INFO] {report['pages_per_sec']} pages/sec, precision {report.get('precision', '-')}, "
+              f"recall {report.get('recall', '-')}")
+        return report
+    else:
+        server = ReplayServer(args.corpus, port=args.port)
+        print(f"[INFO] serving {len(server.pages)} pages at {server.search_url}?q=...")
+        try:
+            server.httpd.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
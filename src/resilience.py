@@ -0,0 +1,279 @@
+"""
+Retries with jittered exponential backoff, a retry budget and per-backend
+circuit breakers.
+
+Failure handling used to be different in every script: ``serpapi_request``
+retries with a linear ``time.sleep(1.0 * attempt)``, ``CompanyWebsite`` in
+apolloio.py refreshes forever in ``while True``, and the SERP scrapers
+return ``[]`` on any exception. None of them notices that a backend is down,
+so every worker keeps paying its full timeout on every query.
+
+* ``RetryPolicy`` retries a call up to ``attempts`` times, sleeping a random
+  time between 0 and ``base * 2 ** n`` (at most ``cap``) before retry ``n``
+  ("full jitter", so workers that failed together do not retry together).
+  Errors in ``give_up_on`` - exhausted quota, an open circuit, a request the
+  backend rejected - are never retried.
+* ``RetryBudget`` caps retries at a fraction of all calls, so a wide outage
+  does not multiply the load on the backend by ``attempts``.
+* ``CircuitBreaker`` opens after ``failures`` consecutive failures
+  (transport errors, 5xx and 429; requests the backend rejected with a
+  4xx say nothing about its health and are not counted). While
+  open, calls fail at once with ``CircuitOpen`` and the backend reports
+  itself unavailable, so the router sends its queries to the next backend.
+  After ``reset_timeout`` seconds a single probe call is let through: its
+  success closes the circuit, its failure opens it again.
+
+Usage:
+    policy = RetryPolicy(attempts=3, base=0.5, budget=RetryBudget(ratio=0.2))
+    breaker = CircuitBreaker("serpapi", failures=5, reset_timeout=30)
+    rows = policy.call(breaker.wrap(fetch_page), query)
+
+    router.attach_resilience(policy, failures=5, reset_timeout=30)
+
+    python -m src.main --batch queries.txt --retries 2 --breaker-failures 5 --breaker-reset 30
+"""
+
+import random
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple, Type
+
+from .backends import CircuitOpen, QuotaExhausted, RequestRejected
+from .tracing import span
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+
+class RetryBudget:
+    """
+    Retries allowed as a share of calls.
+
+    Every call deposits ``ratio`` of a retry, every retry withdraws one; the
+    balance starts at and never exceeds ``reserve``, which covers bursts.
+    """
+
+    def __init__(self, ratio: float = 0.2, reserve: float = 10):
+        """
+        Args:
+            ratio (float): Retries allowed per call in the long run
+            reserve (float): Retries allowed before any call has been made
+        """
+        self.ratio = ratio
+        self.reserve = reserve
+        self._balance = float(reserve)
+        self._lock = threading.Lock()
+
+    def deposit(self) -> None:
+        with self._lock:
+            self._balance = min(self.reserve, self._balance + self.ratio)
+
+    def withdraw(self) -> bool:
+        """Take one retry; False if the budget is spent."""
+        with self._lock:
+            if self._balance < 1:
+                return False
+            self._balance -= 1
+            return True
+
+    @property
+    def balance(self) -> float:
+        return self._balance
+
+
+class RetryPolicy:
+    """Retry failed calls with full-jitter exponential backoff."""
+
+    def __init__(self, attempts: int = 3, base: float = 0.5, cap: float = 30.0,
+                 budget: Optional[RetryBudget] = None,
+                 retry_on: Tuple[Type[BaseException], ...] = (Exception,),
+                 give_up_on: Tuple[Type[BaseException], ...] = (QuotaExhausted, CircuitOpen, RequestRejected),
+                 sleep: Callable[[float], None] = time.sleep, rng: Optional[random.Random] = None):
+        """
+        Args:
+            attempts (int): Calls made at most, the first one included
+            base (float): Backoff ceiling in seconds before the first retry, doubled after each
+            cap (float): Longest backoff in seconds
+            budget (RetryBudget): Shared limit on retries, None for no limit
+            retry_on (tuple): Exception types worth retrying
+            give_up_on (tuple): Exception types that are never retried, checked first
+            sleep (callable): fn(seconds); injectable for tests
+            rng (random.Random): Source of jitter; injectable for tests
+        """
+        if attempts < 1:
+            raise ValueError("attempts must be at least 1")
+        self.attempts = attempts
+        self.base = base
+        self.cap = cap
+        self.budget = budget
+        self.retry_on = retry_on
+        self.give_up_on = give_up_on
+        self.sleep = sleep
+        self.rng = rng or random.Random()
+        self._lock = threading.Lock()
+        self._counts = {"calls": 0, "retries": 0, "recovered": 0, "failed": 0, "budget_denied": 0, "backoff_s": 0.0}
+
+    def backoff(self, retry: int) -> float:
+        """Seconds to wait before retry number ``retry`` (1-based)."""
+        return self.rng.uniform(0, min(self.cap, self.base * 2 ** (retry - 1)))
+
+    def retryable(self, error: BaseException) -> bool:
+        return isinstance(error, self.retry_on) and not isinstance(error, self.give_up_on)
+
+    def call(self, fn: Callable, *args, **kwargs):
+        """
+        Call ``fn(*args, **kwargs)``, retrying retryable errors.
+
+        Raises:
+            The last error, once attempts or the budget run out or it is not retryable
+        """
+        if self.budget is not None:
+            self.budget.deposit()
+        self._count("calls")
+        for attempt in range(1, self.attempts + 1):
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                if attempt == self.attempts or not self.retryable(e):
+                    self._count("failed")
+                    raise
+                if self.budget is not None and not self.budget.withdraw():
+                    self._count("budget_denied")
+                    self._count("failed")
+                    raise
+                delay = self.backoff(attempt)
+                self._count("retries")
+                self._count("backoff_s", delay)
+                with span("retry_wait", attempt=attempt, cause=type(e).__name__):
+                    self.sleep(delay)
+                continue
+            if attempt > 1:
+                self._count("recovered")
+            return result
+
+    def wrap(self, fn: Callable) -> Callable:
+        """``fn`` with every call going through ``call``."""
+        def call(*args, **kwargs):
+            return self.call(fn, *args, **kwargs)
+        return call
+
+    def _count(self, key: str, n: float = 1) -> None:
+        with self._lock:
+            self._counts[key] += n
+
+    def stats(self) -> Dict:
+        """Calls, retries, calls recovered by a retry, calls that failed, retries the budget refused."""
+        with self._lock:
+            return dict(self._counts, backoff_s=round(self._counts["backoff_s"], 3))
+
+
+class CircuitBreaker:
+    """Fail fast on a backend after repeated failures, probing it again later."""
+
+    def __init__(self, name: str, failures: int = 5, reset_timeout: float = 30.0,
+                 ignore: Tuple[Type[BaseException], ...] = (RequestRejected,),
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            name (str): What the breaker protects, used in errors
+            failures (int): Consecutive failures that open the circuit
+            reset_timeout (float): Seconds the circuit stays open before a probe is allowed
+            ignore (tuple): Exception types that do not count as failures, e.g. the backend
+                rejecting one bad request
+            clock (callable): Monotonic time source; injectable for tests
+        """
+        if failures < 1:
+            raise ValueError("failures must be at least 1")
+        self.name = name
+        self.failures = failures
+        self.reset_timeout = reset_timeout
+        self.ignore = ignore
+        self.clock = clock
+        self._state = CLOSED
+        self._streak = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+        self._counts = {"opened": 0, "rejected": 0}
+
+    @property
+    def state(self) -> str:
+        """``closed``, ``open``, or ``half_open`` once an open circuit may be probed."""
+        with self._lock:
+            return self._current()
+
+    def _current(self) -> str:
+        if self._state == OPEN and self.clock() - self._opened_at >= self.reset_timeout:
+            self._state = HALF_OPEN
+            self._probing = False
+        return self._state
+
+    def allows(self) -> bool:
+        """Whether a call would currently be let through, without reserving it."""
+        with self._lock:
+            state = self._current()
+            return state == CLOSED or (state == HALF_OPEN and not self._probing)
+
+    def before(self) -> None:
+        """
+        Admit one call.
+
+        Raises:
+            CircuitOpen: If the circuit is open, or half open with its probe already in flight
+        """
+        with self._lock:
+            state = self._current()
+            if state == CLOSED:
+                return
+            if state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return
+            self._counts["rejected"] += 1
+            wait = max(0.0, self.reset_timeout - (self.clock() - self._opened_at))
+        raise CircuitOpen(f"{self.name}: circuit open, next probe in {wait:.0f}s")
+
+    def cancel(self) -> None:
+        """Give back a call admitted by ``before`` that was not made after all."""
+        with self._lock:
+            self._probing = False
+
+    def success(self) -> None:
+        with self._lock:
+            self._state = CLOSED
+            self._streak = 0
+            self._probing = False
+
+    def failure(self, error: Optional[BaseException] = None) -> None:
+        """Count a failed call; an ``error`` of an ``ignore`` type only gives the call back."""
+        if isinstance(error, self.ignore):
+            self.cancel()
+            return
+        with self._lock:
+            self._streak += 1
+            if self._state == HALF_OPEN or self._streak >= self.failures:
+                if self._state != OPEN:
+                    self._counts["opened"] += 1
+                self._state = OPEN
+                self._opened_at = self.clock()
+                self._probing = False
+
+    def call(self, fn: Callable, *args, **kwargs):
+        """Call ``fn`` through the breaker; its exceptions count as failures and are re-raised."""
+        self.before()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            self.failure(e)
+            raise
+        self.success()
+        return result
+
+    def wrap(self, fn: Callable) -> Callable:
+        """``fn`` with every call going through ``call``."""
+        def call(*args, **kwargs):
+            return self.call(fn, *args, **kwargs)
+        return call
+
+    def stats(self) -> Dict:
+        """Current state, times opened and calls rejected while open."""
+        with self._lock:
+            return dict(self._counts, state=self._current())
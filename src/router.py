@@ -0,0 +1,244 @@
+"""
+Per-query backend selection based on measured latency, quota and cost.
+"""
+
+import threading
+import time
+from typing import Dict, List, Optional
+
+from .backends import BackendError, SearchBackend
+from .coalesce import SingleFlight
+from .helpers import normalize_query
+
+
+class BackendStats:
+    """Running measurements for one backend."""
+
+    def __init__(self, backend: SearchBackend, alpha: float = 0.3):
+        """
+        Args:
+            backend (SearchBackend): Backend being measured
+            alpha (float): Weight of the newest sample in the latency EWMA
+        """
+        self.backend = backend
+        self.alpha = alpha
+        self.latency = None
+        self.calls = 0
+        self.failures = 0
+        self.results = 0
+        self.spent = 0.0
+
+    def record(self, elapsed: float, n_results: int) -> None:
+        """Record a successful request."""
+        self.calls += 1
+        self.results += n_results
+        self.spent += self.backend.cost_per_request
+        self._update_latency(elapsed)
+
+    def record_failure(self, elapsed: float) -> None:
+        """Record a failed request; the time spent still counts as latency."""
+        self.failures += 1
+        self._update_latency(elapsed)
+
+    def _update_latency(self, elapsed: float) -> None:
+        if self.latency is None:
+            self.latency = elapsed
+        else:
+            self.latency = self.alpha * elapsed + (1 - self.alpha) * self.latency
+
+    @property
+    def expected_latency(self) -> float:
+        """Measured latency, or the backend's prior until it has been used."""
+        return self.latency if self.latency is not None else self.backend.expected_latency
+
+    def cost_per_result(self, num: int) -> float:
+        """Observed price of one result, assuming ``num`` results before any data."""
+        if self.calls and self.results:
+            per_request = self.results / self.calls
+        else:
+            per_request = min(num, self.backend.max_per_request)
+        return self.backend.cost_per_request / max(per_request, 1)
+
+    def summary(self) -> Dict:
+        return {
+            "backend": self.backend.name,
+            "calls": self.calls,
+            "failures": self.failures,
+            "results": self.results,
+            "latency_s": round(self.expected_latency, 3),
+            "quota_left": self.backend.quota,
+            "spent_usd": round(self.spent, 4),
+            "circuit": self.backend.breaker.state if self.backend.breaker is not None else None,
+        }
+
+
+class BackendRouter:
+    """
+    Pick the cheapest backend for each query.
+
+    A backend's score is its expected latency plus its expected cost for the
+    query converted to seconds with ``usd_per_second`` (how much we are
+    willing to pay to save one second). Backends without quota or with an
+    open circuit are skipped and a failing backend falls through to the
+    next best one.
+    """
+
+    def __init__(self, backends: List[SearchBackend], usd_per_second: float = 0.01,
+                 quota_reserve: int = 0):
+        """
+        Args:
+            backends (list): Candidate backends
+            usd_per_second (float): Price of one second of latency in USD
+            quota_reserve (int): Keep this many requests of each quota
+                unused unless no other backend is available
+        """
+        if not backends:
+            raise ValueError("BackendRouter needs at least one backend")
+        self.usd_per_second = usd_per_second
+        self.quota_reserve = quota_reserve
+        self.stats = {b.name: BackendStats(b) for b in backends}
+        self.cache = None
+        self.scheduler = None
+        self.retry = None
+        self.flight = SingleFlight()
+        self._lock = threading.Lock()
+
+    def attach_cache(self, cache) -> None:
+        """Share one SerpCache between the router and all of its backends."""
+        self.cache = cache
+        for stats in self.stats.values():
+            stats.backend.cache = cache
+
+    def attach_scheduler(self, scheduler) -> None:
+        """Pace every backend through one RateScheduler, keyed by backend name."""
+        self.scheduler = scheduler
+        for stats in self.stats.values():
+            stats.backend.scheduler = scheduler
+
+    def attach_resilience(self, retry=None, failures: Optional[int] = 5, reset_timeout: float = 30.0) -> None:
+        """
+        Share one RetryPolicy between all backends and give each its own CircuitBreaker.
+
+        Args:
+            retry (RetryPolicy): Retries within a backend before falling through, None for none
+            failures (int): Consecutive failures that open a backend's circuit, None for no breakers
+            reset_timeout (float): Seconds an open circuit waits before probing the backend again
+        """
+        from .resilience import CircuitBreaker
+
+        self.retry = retry
+        for stats in self.stats.values():
+            stats.backend.retry = retry
+            stats.backend.breaker = (CircuitBreaker(stats.backend.name, failures=failures, reset_timeout=reset_timeout)
+                                     if failures else None)
+
+    def score(self, stats: BackendStats, num: int) -> float:
+        """Lower is better: seconds of latency plus cost expressed in seconds."""
+        cost = stats.cost_per_result(num) * num
+        return stats.expected_latency + cost / self.usd_per_second
+
+    def rank(self, num: int = 10) -> List[SearchBackend]:
+        """Return the available backends ordered from best to worst."""
+        candidates = [s for s in self.stats.values() if s.backend.available()]
+        reserved = [
+            s for s in candidates
+            if s.backend.quota is not None and s.backend.quota <= self.quota_reserve
+        ]
+        preferred = [s for s in candidates if s not in reserved]
+        ordered = sorted(preferred, key=lambda s: self.score(s, num))
+        ordered += sorted(reserved, key=lambda s: self.score(s, num))
+        return [s.backend for s in ordered]
+
+    def search(self, query: str, num: int = 10, hl: str = "en", gl: str = "us", start: int = 0) -> List[Dict]:
+        """
+        Run ``query`` on the best backend, falling back on failure.
+
+        A fresh cached answer from any backend is returned without touching
+        the network; cache hits do not count towards latency or cost.
+        Concurrent calls for the same normalized request share one fetch.
+
+        Returns:
+            list: Result rows tagged with the backend that answered
+
+        Raises:
+            BackendError: If every backend failed or none is available
+        """
+        key = (normalize_query(query), num, hl.lower(), gl.lower(), start)
+        rows = self.flight.do(key, lambda: self._search(query, num, hl, gl, start))
+        for row in rows:
+            row["query"] = query
+        return rows
+
+    def _search(self, query, num, hl, gl, start):
+        if self.cache is not None:
+            hit = self.cache.lookup(query, list(self.stats), num=num, hl=hl, gl=gl, start=start)
+            if hit is not None:
+                return hit[1]
+
+        errors = []
+        for backend in self.rank(num):
+            stats = self.stats[backend.name]
+            t0 = time.perf_counter()
+            try:
+                rows = backend.fetch(query, num=num, hl=hl, gl=gl, start=start)
+            except Exception as e:
+                with self._lock:
+                    stats.record_failure(time.perf_counter() - t0)
+                errors.append(f"{backend.name}: {e}")
+                continue
+            with self._lock:
+                stats.record(time.perf_counter() - t0, len(rows))
+            return rows
+        raise BackendError("no backend could answer: " + ("; ".join(errors) or "none available"))
+
+    def report(self) -> List[Dict]:
+        """Per-backend usage summary."""
+        return [s.summary() for s in self.stats.values()]
+
+    def close(self) -> None:
+        for stats in self.stats.values():
+            stats.backend.close()
+
+
+def build_router(names: Optional[List[str]] = None, headless: bool = True, pool=None,
+                 page_load_strategy: str = "eager", block_resources=False, cache=None,
+                 processes: int = 1, contexts_per_process: int = 8, tabs: int = 0,
+                 **router_kwargs) -> BackendRouter:
+    """
+    Build a router over the named backends (all known backends by default).
+
+    Backends whose credentials are missing are still added; they report
+    themselves unavailable and are skipped.
+
+    Args:
+        names (list): Backend names from ``src.backends.BACKENDS``
+        headless (bool): Run the Selenium backend without a window
+        pool (DriverPool): Pool the Selenium backend leases sessions from
+        page_load_strategy (str): Page load strategy of the Selenium backend's own session
+        block_resources (bool or list): Resource blocking for the Selenium backend's own session
+        cache (SerpCache): Response cache consulted before any backend
+        processes (int): Chromium processes of the Playwright backend
+        contexts_per_process (int): Concurrent browser contexts per Playwright process
+        tabs (int): Parallel tabs the Selenium backend loads result pages in, 0 to scroll
+        **router_kwargs: Forwarded to BackendRouter
+    """
+    from .backends import BACKENDS, PlaywrightBackend, SeleniumBackend
+
+    names = names or list(BACKENDS)
+    backends = []
+    for name in names:
+        if name not in BACKENDS:
+            raise ValueError(f"unknown backend {name!r}, choose from {sorted(BACKENDS)}")
+        cls = BACKENDS[name]
+        if cls is SeleniumBackend:
+            backends.append(cls(headless=headless, pool=pool, page_load_strategy=page_load_strategy,
+                                block_resources=block_resources, tabs=tabs))
+        elif cls is PlaywrightBackend:
+            backends.append(cls(headless=headless, processes=processes, contexts_per_process=contexts_per_process,
+                                block_resources=block_resources))
+        else:
+            backends.append(cls())
+    router = BackendRouter(backends, **router_kwargs)
+    if cache is not None:
+        router.attach_cache(cache)
+    return router
@@ -0,0 +1,115 @@
+"""
+Incremental extraction for infinite-scroll SERPs.
+
+``scroll_to_bottom`` (Prakhar_Shukla), ``auto_scroll`` and ``load_and_scroll``
+(Komal Kumar) scroll a fixed number of times with fixed sleeps and only then
+extract the page. ``iter_scroll_results`` instead extracts whatever is new
+after every scroll step and yields it straight away, stopping as soon as
+``limit`` results were produced or the page stops growing.
+
+Usage:
+    driver.get("https://www.google.com/search?q=python")
+    for row in iter_scroll_results(driver, limit=50):
+        writer.write(row)
+"""
+
+import json
+from typing import Dict, Iterator, Optional
+
+from .extract import BLOCK_CHAIN, COLLECT_FUNCTION, SNIPPET_CHAIN, record_yield
+from .helpers import make_result
+
+# Selectors for the "More results" button Google shows instead of
+# auto-loading once the continuous scroll stops.
+MORE_RESULTS_SELECTORS = ["a.T7sFge", "a[aria-label='More results']", "div.RVQdVd"]
+
+# arguments: scroll?, limit, block selectors, snippet selectors, more selectors,
+#            quiet ms, timeout ms, callback
+# Optionally scrolls (or clicks "More results"), waits until the document
+# grows and the DOM settles, then returns the blocks not returned before.
+STEP_SCRIPT = COLLECT_FUNCTION + """
+const [scroll, limit, blockSelectors, snippetSelectors, moreSelectors, quietMs, timeoutMs, done] = arguments;
+const startHeight = document.documentElement.scrollHeight;
+const started = performance.now();
+let lastMutation = started;
+const observer = new MutationObserver(() => { lastMutation = performance.now(); });
+observer.observe(document.documentElement, {childList: true, subtree: true});
+
+function finish() {
+    observer.disconnect();
+    const height = document.documentElement.scrollHeight;
+    const stats = {blocks: {}, snippets: {}};
+    done(JSON.stringify({
+        rows: collectResults(blockSelectors, snippetSelectors, limit, true, stats),
+        grew: height > startHeight,
+        height: height,
+        yield: stats,
+    }));
+}
+
+if (!scroll) {
+    finish();
+} else {
+    window.scrollTo(0, document.documentElement.scrollHeight);
+    for (const sel of moreSelectors) {
+        const more = document.querySelector(sel);
+        if (more && more.offsetParent !== null) { more.click(); break; }
+    }
+    (function check() {
+        const now = performance.now();
+        const grew = document.documentElement.scrollHeight > startHeight;
+        if ((grew && now - lastMutation >= quietMs) || now - started >= timeoutMs) return finish();
+        setTimeout(check, 50);
+    })();
+}
+"""
+
+
+def iter_scroll_results(driver, limit: int = 100, max_scrolls: int = 20, quiet_ms: int = 300,
+                        step_timeout: float = 5, stats: Optional[Dict] = None) -> Iterator[Dict]:
+    """
+    Yield results from the loaded SERP while scrolling for more.
+
+    Each step is one WebDriver round-trip: scroll, wait for the page to grow
+    and settle, then return only the result blocks not seen before.
+
+    Args:
+        driver: Selenium WebDriver with a SERP loaded
+        limit (int): Stop after this many results
+        max_scrolls (int): Upper bound on scroll steps
+        quiet_ms (int): DOM silence after growth that ends a step
+        step_timeout (float): Seconds to wait for the page to grow per step
+        stats (dict): If given, filled with ``scrolls`` and ``stopped`` reason
+
+    Yields:
+        dict: Result rows in the shared schema, positions counting from 1
+    """
+    stats = stats if stats is not None else {}
+    stats.update(scrolls=0, stopped="limit")
+    driver.set_script_timeout(step_timeout + 5)
+    seen = set()
+    produced = 0
+    scroll = False
+    while True:
+        raw = driver.execute_async_script(
+            STEP_SCRIPT, scroll, limit - produced, BLOCK_CHAIN.ordered(), SNIPPET_CHAIN.ordered(),
+            MORE_RESULTS_SELECTORS, int(quiet_ms), int(step_timeout * 1000),
+        )
+        step = json.loads(raw)
+        record_yield(step.get("yield"), rows=len(step["rows"]))
+        for item in step["rows"]:
+            if item["link"] in seen or not item.get("title"):
+                continue
+            seen.add(item["link"])
+            produced += 1
+            yield make_result(produced, item["title"], item["link"], item["snippet"])
+            if produced >= limit:
+                return
+        if scroll and not step["grew"] and not step["rows"]:
+            stats["stopped"] = "exhausted"
+            return
+        if stats["scrolls"] >= max_scrolls:
+            stats["stopped"] = "max_scrolls"
+            return
+        stats["scrolls"] += 1
+        scroll = True
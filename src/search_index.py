@@ -0,0 +1,296 @@
+"""
+Full-text index over every scraped result.
+
+"Which queries ever returned domain X?" used to mean grepping hundreds of
+CSVs. ``SearchIndex`` keeps one SQLite file with every result row and an
+FTS5 index over titles, snippets, links and domains. Batch runs add their
+rows as they go, and existing result files are ingested incrementally:
+a file is only re-read when its size or modification time changed, and
+its rows then replace the ones indexed from it before.
+
+Usage:
+    index = SearchIndex(".cache/results.sqlite")
+    index.ingest(["Sagnik_Dey/results", "results/batch.ndjson"])
+    for hit in index.search("placement statistics"):
+        print(hit["query"], hit["fetched"], hit["link"])
+
+    python -m src.search_index ingest .cache/results.sqlite Sagnik_Dey/results
+    python -m src.search_index domain .cache/results.sqlite python.org
+"""
+
+import argparse
+import datetime as dt
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+from .store import domain_of, load_result_file
+
+DEFAULT_INDEX_PATH = os.path.join(".cache", "results.sqlite")
+RESULT_FILE_EXTENSIONS = (".json", ".csv", ".ndjson", ".jsonl")
+
+
+def fts_query(text: str) -> str:
+    """Turn free text into an FTS5 query matching all its words (as prefixes)."""
+    words = re.findall(r"\w+", text.lower())
+    return " ".join(f'"{word}"*' for word in words)
+
+
+class SearchIndex:
+    """SQLite table of result rows with an FTS5 index over their text."""
+
+    def __init__(self, path: str = DEFAULT_INDEX_PATH):
+        """
+        Args:
+            path (str): SQLite file, or ":memory:"
+        """
+        folder = os.path.dirname(path)
+        if path != ":memory:" and folder:
+            os.makedirs(folder, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        columns = [row[1] for row in self._db.execute("PRAGMA table_info(results)")]
+        if columns and "source" not in columns:
+            # Index files written before rows remembered the file they came from.
+            self._db.execute("ALTER TABLE results ADD COLUMN source TEXT")
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS results (
+                id INTEGER PRIMARY KEY,
+                query TEXT NOT NULL,
+                position INTEGER,
+                title TEXT,
+                link TEXT,
+                domain TEXT,
+                snippet TEXT,
+                backend TEXT,
+                fetched REAL NOT NULL,
+                source TEXT,
+                UNIQUE (query, link, backend, fetched)
+            );
+            CREATE INDEX IF NOT EXISTS results_domain ON results (domain);
+            CREATE INDEX IF NOT EXISTS results_source ON results (source);
+            CREATE VIRTUAL TABLE IF NOT EXISTS results_fts USING fts5 (
+                title, snippet, link, domain,
+                content='results', content_rowid='id', tokenize='unicode61'
+            );
+            CREATE TRIGGER IF NOT EXISTS results_ai AFTER INSERT ON results BEGIN
+                INSERT INTO results_fts (rowid, title, snippet, link, domain)
+                VALUES (new.id, new.title, new.snippet, new.link, new.domain);
+            END;
+            CREATE TRIGGER IF NOT EXISTS results_ad AFTER DELETE ON results BEGIN
+                INSERT INTO results_fts (results_fts, rowid, title, snippet, link, domain)
+                VALUES ('delete', old.id, old.title, old.snippet, old.link, old.domain);
+            END;
+            CREATE TABLE IF NOT EXISTS sources (
+                path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime REAL NOT NULL,
+                rows INTEGER NOT NULL
+            );
+            """
+        )
+        self._db.commit()
+
+    def add(self, rows: Iterable[Dict], backend: Optional[str] = None, fetched: Optional[float] = None,
+            source: Optional[str] = None) -> int:
+        """
+        Index result rows; a row already indexed for the same fetch is ignored.
+
+        Args:
+            rows (iterable): Result rows with at least ``query`` and ``link``
+            backend (str): Backend for rows without a ``backend`` key
+            fetched (float): Unix time the rows were fetched, now if omitted
+            source (str): File the rows were read from; rows indexed from it
+                before are replaced in the same transaction
+
+        Returns:
+            int: Rows added
+        """
+        fetched = time.time() if fetched is None else fetched
+        values = [
+            (row.get("query", ""), int(row.get("position") or 0), row.get("title", ""), row.get("link", ""),
+             domain_of(row.get("link", "")), row.get("snippet", ""), row.get("backend") or backend or "", fetched,
+             source)
+            for row in rows
+        ]
+        with self._lock:
+            if source is not None:
+                self._db.execute("DELETE FROM results WHERE source = ?", (source,))
+            cur = self._db.executemany(
+                "INSERT OR IGNORE INTO results (query, position, title, link, domain, snippet, backend, fetched, "
+                "source) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                values,
+            )
+            self._db.commit()
+        return cur.rowcount
+
+    def ingest_file(self, path: str, backend: str = "file") -> int:
+        """
+        Index one result file unless it is unchanged since it was last ingested.
+
+        Rows are timestamped with the file's modification time and replace
+        the rows indexed from an earlier version of the file.
+
+        Returns:
+            int: Rows indexed from the file
+        """
+        info = os.stat(path)
+        key = os.path.abspath(path)
+        with self._lock:
+            seen = self._db.execute("SELECT size, mtime FROM sources WHERE path = ?", (key,)).fetchone()
+        if seen == (info.st_size, info.st_mtime):
+            return 0
+        added = self.add(load_result_file(path), backend=backend, fetched=info.st_mtime, source=key)
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO sources (path, size, mtime, rows) VALUES (?, ?, ?, ?)",
+                (key, info.st_size, info.st_mtime, added),
+            )
+            self._db.commit()
+        return added
+
+    def ingest(self, paths: Iterable[str], backend: str = "file") -> Dict[str, int]:
+        """
+        Index result files, walking directories for .json/.csv/.ndjson files.
+
+        Returns:
+            dict: ``files`` read, ``skipped`` as unchanged or unreadable, ``rows`` added
+        """
+        report = {"files": 0, "skipped": 0, "rows": 0}
+        for path in paths:
+            if os.path.isdir(path):
+                files = [os.path.join(folder, name) for folder, _, names in os.walk(path) for name in names]
+            else:
+                files = [path]
+            for file in sorted(files):
+                if not file.endswith(RESULT_FILE_EXTENSIONS):
+                    continue
+                try:
+                    added = self.ingest_file(file, backend=backend)
+                except (OSError, ValueError) as e:
+                    print(f"[ERROR] cannot index {file}: {e}")
+                    report["skipped"] += 1
+                    continue
+                report["files" if added else "skipped"] += 1
+                report["rows"] += added
+        return report
+
+    def search(self, text: str, limit: int = 20, domain: Optional[str] = None) -> List[Dict]:
+        """
+        Best matching results for ``text``, most relevant first.
+
+        Args:
+            text (str): Free text; every word must match (as a prefix)
+            limit (int): Maximum number of hits
+            domain (str): Only hits from this domain or its subdomains
+
+        Returns:
+            list: Dicts with query, title, link, domain, snippet, backend, fetched (ISO time)
+        """
+        match = fts_query(text)
+        if not match:
+            return []
+        sql = ("SELECT r.query, r.title, r.link, r.domain, r.snippet, r.backend, r.fetched "
+               "FROM results_fts JOIN results r ON r.id = results_fts.rowid WHERE results_fts MATCH ?")
+        params = [match]
+        if domain:
+            sql += " AND (r.domain = ? OR r.domain LIKE ?)"
+            params += [domain.lower(), "%." + domain.lower()]
+        sql += " ORDER BY bm25(results_fts) LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            rows = self._db.execute(sql, params).fetchall()
+        keys = ["query", "title", "link", "domain", "snippet", "backend", "fetched"]
+        hits = [dict(zip(keys, row)) for row in rows]
+        for hit in hits:
+            hit["fetched"] = _iso(hit["fetched"])
+        return hits
+
+    def queries_for_domain(self, domain: str) -> List[Dict]:
+        """
+        Every query that returned ``domain`` (or a subdomain of it).
+
+        Returns:
+            list: Dicts with query, hits, best_position, first_seen and last_seen, most hits first
+        """
+        domain = domain_of("//" + domain) if "/" not in domain else domain_of(domain)
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT query, COUNT(*), MIN(NULLIF(position, 0)), MIN(fetched), MAX(fetched) FROM results "
+                "WHERE domain = ? OR domain LIKE ? GROUP BY query ORDER BY COUNT(*) DESC, query",
+                (domain, "%." + domain),
+            ).fetchall()
+        return [
+            {"query": q, "hits": n, "best_position": best, "first_seen": _iso(first), "last_seen": _iso(last)}
+            for q, n, best, first, last in rows
+        ]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            rows, queries, domains = self._db.execute(
+                "SELECT COUNT(*), COUNT(DISTINCT query), COUNT(DISTINCT domain) FROM results"
+            ).fetchone()
+            sources = self._db.execute("SELECT COUNT(*) FROM sources").fetchone()[0]
+        return {"rows": rows, "queries": queries, "domains": domains, "files": sources}
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+def _iso(timestamp: float) -> str:
+    return dt.datetime.fromtimestamp(timestamp, dt.timezone.utc).isoformat(timespec="seconds")
+
+
+def parse_args(argv=None):
+    p = argparse.ArgumentParser(description="Full-text index over scraped results")
+    sub = p.add_subparsers(dest="command", required=True)
+
+    ing = sub.add_parser("ingest", help="Index result files and directories (incremental)")
+    ing.add_argument("index", help="SQLite index file")
+    ing.add_argument("paths", nargs="+", help="Result files or directories")
+
+    se = sub.add_parser("search", help="Full-text search over titles, snippets and links")
+    se.add_argument("index", help="SQLite index file")
+    se.add_argument("text", help="Words to match")
+    se.add_argument("--limit", type=int, default=20, help="Maximum number of hits")
+    se.add_argument("--domain", help="Only hits from this domain")
+
+    do = sub.add_parser("domain", help="Queries that ever returned a domain")
+    do.add_argument("index", help="SQLite index file")
+    do.add_argument("domain", help="Domain, e.g. python.org")
+    return p.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    index = SearchIndex(args.index)
+    t0 = time.perf_counter()
+    if args.command == "ingest":
+        report = index.ingest(args.paths)
+        print(f"[INFO] indexed {report['rows']} rows from {report['files']} files "
+              f"({report['skipped']} unchanged or skipped)")
+        found = None
+    elif args.command == "search":
+        found = index.search(args.text, limit=args.limit, domain=args.domain)
+        for hit in found:
+            print(f"{hit['fetched']}  {hit['query']!r:<30} {hit['title'][:60]:<60} {hit['link']}")
+    else:
+        found = index.queries_for_domain(args.domain)
+        for row in found:
+            print(f"{row['last_seen']}  {row['hits']:>4} hits  best #{row['best_position']}  {row['query']}")
+    elapsed_ms = (time.perf_counter() - t0) * 1000
+    if found is not None:
+        print(f"[INFO] {len(found)} matches in {elapsed_ms:.1f} ms")
+    index.close()
+    return found
+
+
+if __name__ == "__main__":
+    main()
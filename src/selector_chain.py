@@ -0,0 +1,111 @@
+"""
+Selector fallback chains ordered by observed hit rate.
+
+Scrapers try selector lists one at a time: ``title_selectors`` /
+``snippet_selectors`` in Chandini7203, the ``["div.tF2Cxc", "div.MjjYud",
+"div.g"]`` loop in Sagnik_Dey (which collects the same result once per
+overlapping selector and dedupes afterwards), nested try chains in
+Neil_Landge. Every miss is a timeout or a WebDriver round-trip.
+
+A ``SelectorChain`` holds the alternatives for one field. Container
+chains are evaluated as a single combined query (``chain.combined``);
+per-field chains are tried in ``chain.ordered()`` order, the alternatives
+that matched most often first, so the usual case is one lookup. Callers
+report back which alternative matched through ``record`` and the chain
+reorders itself; ``yields`` exposes the per-selector counts.
+
+Usage:
+    chain = SelectorChain("snippet", ["div.VwiC3b", "span.aCOpRe"])
+    for sel in chain.ordered():
+        ...
+    chain.record({"span.aCOpRe": 1}, evaluations=1)
+    print(chain.yields())
+"""
+
+import threading
+from typing import Dict, Iterable, List, Optional
+
+
+class SelectorChain:
+    """Alternative CSS selectors for one thing on the page, best first."""
+
+    def __init__(self, name: str, selectors: Iterable[str]):
+        """
+        Args:
+            name (str): What the chain finds, used in reports
+            selectors (iterable): Alternatives in their initial priority order
+        """
+        self.name = name
+        self.selectors = list(dict.fromkeys(selectors))
+        if not self.selectors:
+            raise ValueError(f"selector chain {name!r} needs at least one selector")
+        self.hits = dict.fromkeys(self.selectors, 0)
+        self.evaluations = 0
+        self._lock = threading.Lock()
+
+    def ordered(self) -> List[str]:
+        """Alternatives by hit count, ties in their initial order."""
+        with self._lock:
+            rank = {sel: i for i, sel in enumerate(self.selectors)}
+            return sorted(self.selectors, key=lambda sel: (-self.hits[sel], rank[sel]))
+
+    @property
+    def combined(self) -> str:
+        """All alternatives as one selector list, matched in a single query."""
+        return ", ".join(self.ordered())
+
+    def record(self, hits: Optional[Dict[str, int]], evaluations: int = 1) -> None:
+        """
+        Account one or more evaluations of the chain.
+
+        Args:
+            hits (dict): Matches per selector; unknown selectors are ignored
+            evaluations (int): Number of places the chain was evaluated on
+                (pages for a container chain, containers for a field chain)
+        """
+        with self._lock:
+            self.evaluations += evaluations
+            for sel, n in (hits or {}).items():
+                if sel in self.hits:
+                    self.hits[sel] += int(n)
+
+    def yields(self) -> Dict[str, Dict]:
+        """
+        Per selector: ``hits``, ``hit_rate`` (hits per evaluation), ``share``
+        of all hits and current ``rank`` (1 is tried first).
+        """
+        order = self.ordered()
+        with self._lock:
+            total = sum(self.hits.values())
+            return {
+                sel: {
+                    "hits": self.hits[sel],
+                    "hit_rate": round(self.hits[sel] / self.evaluations, 3) if self.evaluations else 0.0,
+                    "share": round(self.hits[sel] / total, 3) if total else 0.0,
+                    "rank": order.index(sel) + 1,
+                }
+                for sel in self.selectors
+            }
+
+    def misses(self) -> int:
+        """Evaluations where no alternative matched (meaningful for per-field chains)."""
+        with self._lock:
+            return max(0, self.evaluations - sum(self.hits.values()))
+
+    def find_first(self, element):
+        """
+        First match below a Selenium ``element`` (or driver), trying
+        alternatives best first; records the outcome.
+
+        Returns:
+            WebElement or None
+        """
+        from selenium.webdriver.common.by import By
+
+        for sel in self.ordered():
+            found = element.find_elements(By.CSS_SELECTOR, sel)
+            if found:
+                self.record({sel: 1})
+                return found[0]
+        self.record(None)
+        return None
@@ -0,0 +1,311 @@
+"""
+Partitioned Parquet result store.
+
+Results so far end up as thousands of small per-query CSV/JSON pairs (see
+``Sagnik_Dey/results/``) that must all be opened and parsed to answer any
+question about them. ``ResultStore`` appends rows to a Parquet dataset laid
+out as ``<root>/date=YYYY-MM-DD/backend=<name>/part-*.parquet`` with the
+repetitive query, link and domain columns dictionary-encoded. Analytics
+read only the columns and partitions they ask for, and ``compact`` merges
+the many small files a long run produces into one per partition.
+
+Needs the optional ``pyarrow`` package.
+
+Usage:
+    with ResultStore("data/serp") as store:
+        store.append(rows, backend="selenium")
+    table = ResultStore("data/serp").read(columns=["domain"], dates=("2024-05-01", "2024-05-31"))
+
+    python -m src.store import data/serp Sagnik_Dey/results/*.json
+    python -m src.store compact data/serp
+"""
+
+import argparse
+import csv
+import datetime as dt
+import glob
+import json
+import os
+import threading
+import time
+import uuid
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
+
+# Columns written to every file; ``date`` and ``backend`` live in the path.
+COLUMNS = ["query", "position", "title", "link", "domain", "snippet", "fetched_at"]
+DICTIONARY_COLUMNS = ["query", "link", "domain"]
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.dataset
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError("the result store needs the 'pyarrow' package (pip install pyarrow)") from None
+    return pyarrow
+
+
+def domain_of(link: str) -> str:
+    """Host of ``link`` without a leading ``www.``."""
+    host = (urlparse(link or "").hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+def schema():
+    pa = _pyarrow()
+    text = pa.dictionary(pa.int32(), pa.string())
+    return pa.schema([
+        ("query", text),
+        ("position", pa.int32()),
+        ("title", pa.string()),
+        ("link", text),
+        ("domain", text),
+        ("snippet", pa.string()),
+        ("fetched_at", pa.timestamp("s", tz="UTC")),
+    ])
+
+
+class ResultStore:
+    """Append-only Parquet dataset partitioned by date and backend."""
+
+    def __init__(self, root: str, flush_rows: int = 10000, flush_interval: Optional[float] = None):
+        """
+        Args:
+            root (str): Dataset directory
+            flush_rows (int): Buffered rows per partition before a file is written
+            flush_interval (float): Also write every partition once the oldest buffered
+                row is this many seconds old, None to wait for ``flush_rows``
+        """
+        self.root = root
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+        self._buffers = {}
+        self._buffered_since = None
+        self._lock = threading.Lock()
+        self.files_written = 0
+
+    def append(self, rows: Iterable[Dict], backend: Optional[str] = None, date: Optional[str] = None) -> None:
+        """
+        Buffer result rows for writing.
+
+        Args:
+            rows (iterable): Result rows; a row's own ``backend`` key wins over the argument
+            backend (str): Partition for rows without a ``backend`` key
+            date (str): YYYY-MM-DD partition, today (UTC) if omitted
+        """
+        now = int(time.time())
+        date = date or dt.datetime.fromtimestamp(now, dt.timezone.utc).strftime("%Y-%m-%d")
+        full = []
+        with self._lock:
+            if self._buffered_since is None:
+                self._buffered_since = time.monotonic()
+            for row in rows:
+                partition = (date, row.get("backend") or backend or "unknown")
+                buffer = self._buffers.setdefault(partition, [])
+                buffer.append({
+                    "query": row.get("query", ""),
+                    "position": int(row.get("position") or 0),
+                    "title": row.get("title", ""),
+                    "link": row.get("link", ""),
+                    "domain": domain_of(row.get("link", "")),
+                    "snippet": row.get("snippet", ""),
+                    "fetched_at": now,
+                })
+                if len(buffer) >= self.flush_rows:
+                    full.append(partition)
+            if self.flush_interval is not None and time.monotonic() - self._buffered_since >= self.flush_interval:
+                self._flush()
+                return
+            for partition in set(full):
+                self._write(partition, self._buffers.pop(partition))
+            if not self._buffers:
+                self._buffered_since = None
+
+    def flush(self) -> None:
+        """Write every buffered partition to a new file."""
+        with self._lock:
+            self._flush()
+
+    def _flush(self) -> None:
+        buffers, self._buffers = self._buffers, {}
+        self._buffered_since = None
+        for partition, rows in buffers.items():
+            self._write(partition, rows)
+
+    def _partition_dir(self, date: str, backend: str) -> str:
+        return os.path.join(self.root, f"date={date}", f"backend={backend}")
+
+    def _write(self, partition: Tuple[str, str], rows: List[Dict]) -> None:
+        pa = _pyarrow()
+        table = pa.Table.from_pylist(rows, schema=schema())
+        folder = self._partition_dir(*partition)
+        os.makedirs(folder, exist_ok=True)
+        path = os.path.join(folder, f"part-{int(time.time())}-{uuid.uuid4().hex[:8]}.parquet")
+        pa.parquet.write_table(table, path + ".tmp", use_dictionary=DICTIONARY_COLUMNS, compression="zstd")
+        os.replace(path + ".tmp", path)
+        self.files_written += 1
+
+    def close(self) -> None:
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def dataset(self):
+        pa = _pyarrow()
+        return pa.dataset.dataset(self.root, format="parquet", partitioning="hive")
+
+    def read(self, columns: Optional[List[str]] = None, dates: Optional[Tuple[str, str]] = None,
+             backends: Optional[List[str]] = None):
+        """
+        Load a pyarrow Table, reading only the requested columns and partitions.
+
+        Args:
+            columns (list): Column names, all if omitted (``date``/``backend`` included)
+            dates (tuple): Inclusive (first, last) YYYY-MM-DD range
+            backends (list): Backends to include
+        """
+        pa = _pyarrow()
+        field = pa.dataset.field
+        condition = None
+        if dates:
+            condition = (field("date") >= dates[0]) & (field("date") <= dates[1])
+        if backends:
+            chosen = field("backend").isin(list(backends))
+            condition = chosen if condition is None else condition & chosen
+        return self.dataset().to_table(columns=columns, filter=condition)
+
+    def partitions(self) -> Dict[str, List[str]]:
+        """Parquet files per partition directory."""
+        found = {}
+        for path in sorted(glob.glob(os.path.join(self.root, "date=*", "backend=*", "*.parquet"))):
+            found.setdefault(os.path.dirname(path), []).append(path)
+        return found
+
+    def compact(self, min_files: int = 2) -> Dict[str, int]:
+        """
+        Merge the files of every partition with at least ``min_files`` into one.
+
+        The merged file is written under a temporary name and renamed before
+        the inputs are deleted, so readers never see missing rows.
+
+        Returns:
+            dict: ``partitions`` compacted, ``files_before`` and ``files_after``
+        """
+        pa = _pyarrow()
+        self.flush()
+        report = {"partitions": 0, "files_before": 0, "files_after": 0}
+        for folder, files in self.partitions().items():
+            report["files_before"] += len(files)
+            if len(files) < min_files:
+                report["files_after"] += len(files)
+                continue
+            table = pa.concat_tables([pa.parquet.read_table(f, schema=schema()) for f in files])
+            path = os.path.join(folder, f"part-{int(time.time())}-{uuid.uuid4().hex[:8]}.parquet")
+            pa.parquet.write_table(table, path + ".tmp", use_dictionary=DICTIONARY_COLUMNS, compression="zstd")
+            os.replace(path + ".tmp", path)
+            for f in files:
+                os.remove(f)
+            report["partitions"] += 1
+            report["files_after"] += 1
+        return report
+
+    def stats(self) -> Dict:
+        files = [f for group in self.partitions().values() for f in group]
+        rows = 0
+        if files:
+            pa = _pyarrow()
+            rows = sum(pa.parquet.ParquetFile(f).metadata.num_rows for f in files)
+        return {
+            "partitions": len(self.partitions()),
+            "files": len(files),
+            "rows": rows,
+            "bytes": sum(os.path.getsize(f) for f in files),
+        }
+
+
+def load_result_file(path: str) -> List[Dict]:
+    """
+    Read one legacy ``*_results.json`` or ``.csv`` file (or a batch ``.ndjson``).
+
+    The query is taken from the file name (``google_swe_results.csv`` ->
+    "google swe") when rows do not carry one, and positions follow file
+    order when missing.
+    """
+    if path.endswith(".json"):
+        with open(path, encoding="utf-8") as f:
+            rows = json.load(f)
+    elif path.endswith((".ndjson", ".jsonl")):
+        with open(path, encoding="utf-8") as f:
+            rows = [json.loads(line) for line in f if line.strip()]
+    else:
+        with open(path, encoding="utf-8", newline="") as f:
+            rows = list(csv.DictReader(f))
+    name = os.path.splitext(os.path.basename(path))[0]
+    query = name[:-len("_results")] if name.endswith("_results") else name
+    for i, row in enumerate(rows, 1):
+        row.setdefault("query", query.replace("_", " "))
+        if not row.get("position"):
+            row["position"] = i
+    return rows
+
+
+def import_files(store: ResultStore, paths: Iterable[str], backend: str = "legacy") -> int:
+    """
+    Load legacy result files into ``store``, dated by file modification time.
+
+    A CSV next to a JSON of the same name is skipped as a duplicate.
+
+    Returns:
+        int: Rows imported
+    """
+    paths = sorted(set(paths))
+    imported = 0
+    for path in paths:
+        if path.endswith(".csv") and os.path.splitext(path)[0] + ".json" in paths:
+            continue
+        date = dt.datetime.fromtimestamp(os.path.getmtime(path), dt.timezone.utc).strftime("%Y-%m-%d")
+        rows = load_result_file(path)
+        store.append(rows, backend=backend, date=date)
+        imported += len(rows)
+    store.flush()
+    return imported
+
+
+def parse_args(argv=None):
+    p = argparse.ArgumentParser(description="Partitioned Parquet result store")
+    sub = p.add_subparsers(dest="command", required=True)
+
+    im = sub.add_parser("import", help="Load legacy *_results.json/.csv files")
+    im.add_argument("root", help="Dataset directory")
+    im.add_argument("files", nargs="+", help="Result files")
+    im.add_argument("--backend", default="legacy", help="Backend partition for the imported rows")
+
+    co = sub.add_parser("compact", help="Merge small files into one per partition")
+    co.add_argument("root", help="Dataset directory")
+    co.add_argument("--min-files", type=int, default=2, help="Only compact partitions with at least this many files")
+
+    st = sub.add_parser("stats", help="Partitions, files and rows in the dataset")
+    st.add_argument("root", help="Dataset directory")
+    return p.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    store = ResultStore(args.root)
+    if args.command == "import":
+        print(f"[INFO] imported {import_files(store, args.files, backend=args.backend)} rows")
+    elif args.command == "compact":
+        report = store.compact(min_files=args.min_files)
+        print(f"[INFO] compacted {report['partitions']} partitions: "
+              f"{report['files_before']} -> {report['files_after']} files")
+    print(f"[INFO] {store.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+"""
+Per-phase timing spans for every scrape, exported as a JSON-lines trace and
+a Prometheus textfile.
+
+Until now the only instrumentation was ``print(f"Time take in seconds: ...")``
+in a handful of scripts. ``span("navigate", query=q)`` times a block and
+records it with the tracer installed by ``install``; with no tracer
+installed a span costs one global lookup. Spans nest per thread, so each
+record carries the id of its parent (``query`` -> ``fetch`` -> ``navigate``)
+and can be stitched back into a per-query timeline.
+
+Phases recorded across the package: ``query`` (one per batch query),
+``driver_start``, ``rate_wait``, ``fetch`` (one per backend request),
+``retry_wait``, ``navigate``, ``ready``, ``extract``, ``parse`` and
+``write``.
+
+Usage:
+    tracer = install(Tracer(trace_path="traces/batch.jsonl"))
+    with span("navigate", query="python"):
+        driver.get(url)
+    print(tracer.summary()["navigate"]["p95_s"])
+    tracer.write_prometheus("metrics/scraper.prom")
+    tracer.close()
+"""
+
+import itertools
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile of ``values`` (``q`` in 0..1), 0.0 if empty."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+
+class Span:
+    """One timed block; ``set`` adds attributes before it ends."""
+
+    __slots__ = ("id", "parent", "name", "attrs", "start", "duration", "error")
+
+    def __init__(self, id: int, parent: Optional[int], name: str, attrs: Dict):
+        self.id = id
+        self.parent = parent
+        self.name = name
+        self.attrs = attrs
+        self.start = time.time()
+        self.duration = 0.0
+        self.error = None
+
+    def set(self, **attrs) -> None:
+        self.attrs.update(attrs)
+
+    def record(self) -> Dict:
+        rec = dict(self.attrs)
+        rec.update({
+            "span": self.id,
+            "parent": self.parent,
+            "name": self.name,
+            "start": round(self.start, 6),
+            "ms": round(self.duration * 1000, 3),
+            "status": "error" if self.error else "ok",
+            "thread": threading.current_thread().name,
+        })
+        if self.error:
+            rec["error"] = self.error
+        return rec
+
+
+class _NullSpan:
+    def set(self, **attrs) -> None:
+        pass
+
+
+NULL_SPAN = _NullSpan()
+
+
+class Tracer:
+    """Collect span durations per phase and stream span records to a trace file."""
+
+    def __init__(self, trace_path: Optional[str] = None, flush_every: int = 200):
+        """
+        Args:
+            trace_path (str): JSON-lines file to append span records to, None to only aggregate
+            flush_every (int): Span records buffered before the trace file is flushed
+        """
+        self.trace_path = trace_path
+        self._writer = None
+        if trace_path:
+            from .writers import NdjsonWriter
+
+            self._writer = NdjsonWriter(trace_path, flush_every=flush_every, fsync=False)
+        self._ids = itertools.count(1)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._durations = {}
+        self._errors = {}
+        self._first = {}
+
+    @contextmanager
+    def span(self, name: str, **attrs):
+        """Time the body of a ``with`` block as phase ``name``; exceptions are recorded and re-raised."""
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        current = Span(next(self._ids), stack[-1].id if stack else None, name, attrs)
+        stack.append(current)
+        t0 = time.perf_counter()
+        try:
+            yield current
+        except BaseException as e:
+            current.error = type(e).__name__
+            raise
+        finally:
+            current.duration = time.perf_counter() - t0
+            stack.pop()
+            self._finish(current)
+
+    def add(self, name: str, start: float, seconds: float, **attrs) -> None:
+        """
+        Record a span timed elsewhere, e.g. on an event loop where the
+        per-thread nesting of ``span`` does not hold; its parent is the
+        calling thread's open span.
+
+        Args:
+            name (str): Phase name
+            start (float): Unix time the phase started
+            seconds (float): Its duration
+        """
+        stack = getattr(self._local, "stack", None)
+        done = Span(next(self._ids), stack[-1].id if stack else None, name, attrs)
+        done.start = start
+        done.duration = seconds
+        self._finish(done)
+
+    def _finish(self, span: Span) -> None:
+        with self._lock:
+            self._durations.setdefault(span.name, []).append(span.duration)
+            self._errors[span.name] = self._errors.get(span.name, 0) + (span.error is not None)
+            if span.name not in self._first:
+                self._first[span.name] = span.record()
+        if self._writer is not None:
+            self._writer.write(span.record())
+
+    def first_spans(self) -> List[Dict]:
+        """The first span record of every phase, in start order (a cold-start timeline)."""
+        with self._lock:
+            return sorted(self._first.values(), key=lambda rec: rec["start"])
+
+    def summary(self) -> Dict[str, Dict]:
+        """Per phase: count, errors, total and mean seconds, and p50/p95/p99 seconds."""
+        with self._lock:
+            durations = {name: list(values) for name, values in self._durations.items()}
+            errors = dict(self._errors)
+        summary = {}
+        for name, values in durations.items():
+            s = {
+                "count": len(values),
+                "errors": errors[name],
+                "total_s": round(sum(values), 3),
+                "mean_s": round(sum(values) / len(values), 4),
+            }
+            for q in QUANTILES:
+                s[f"p{round(q * 100)}_s"] = round(percentile(values, q), 4)
+            summary[name] = s
+        return summary
+
+    def prometheus(self, prefix: str = "scraper") -> str:
+        """The summary in the Prometheus text exposition format."""
+        summary = self.summary()
+        lines = [
+            f"# HELP {prefix}_phase_seconds Time spent per scrape phase.",
+            f"# TYPE {prefix}_phase_seconds summary",
+        ]
+        for name, s in sorted(summary.items()):
+            for q in QUANTILES:
+                lines.append(f'{prefix}_phase_seconds{{phase="{name}",quantile="{q}"}} '
+                             f'{s[f"p{round(q * 100)}_s"]}')
+            lines.append(f'{prefix}_phase_seconds_sum{{phase="{name}"}} {s["total_s"]}')
+            lines.append(f'{prefix}_phase_seconds_count{{phase="{name}"}} {s["count"]}')
+        lines += [
+            f"# HELP {prefix}_phase_errors_total Spans that ended with an exception.",
+            f"# TYPE {prefix}_phase_errors_total counter",
+        ]
+        lines += [f'{prefix}_phase_errors_total{{phase="{name}"}} {s["errors"]}'
+                  for name, s in sorted(summary.items())]
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str, prefix: str = "scraper") -> None:
+        """
+        Write the summary for node_exporter's textfile collector.
+
+        The file is replaced atomically so the collector never reads half of it.
+        """
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(self.prometheus(prefix))
+        os.replace(tmp, path)
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+
+
+_tracer = None
+
+
+def install(tracer: Optional[Tracer]) -> Optional[Tracer]:
+    """Make ``tracer`` receive every ``span`` in the process (None to stop tracing); returns it."""
+    global _tracer
+    _tracer = tracer
+    return tracer
+
+
+def current() -> Optional[Tracer]:
+    return _tracer
+
+
+def add_span(name: str, start: float, seconds: float, **attrs) -> None:
+    """Record an externally timed span with the installed tracer, if any."""
+    tracer = _tracer
+    if tracer is not None:
+        tracer.add(name, start, seconds, **attrs)
+
+
+@contextmanager
+def span(name: str, **attrs):
+    """Time a block with the installed tracer; a no-op if none is installed."""
+    tracer = _tracer
+    if tracer is None:
+        yield NULL_SPAN
+        return
+    with tracer.span(name, **attrs) as s:
+        yield s
@@ -0,0 +1,222 @@
+"""
+URL canonicalization and duplicate detection.
+
+The same result shows up as ``/url?q=...`` redirects, with ``utm_*`` or
+``srsltid`` tracking parameters, with and without ``www.`` or a default
+port. ``canonicalize`` reduces those to one URL, and ``dedup_key`` to one
+key for duplicate checks. ``UrlDeduper`` remembers keys across pages and
+runs in constant time per URL (``Ojasv_Singh``'s ``fetch_multiple``
+rebuilds its ``existing_links`` set on every page), either exactly or, for
+tens of millions of URLs, in a fixed-size Bloom filter.
+
+Usage:
+    seen = UrlDeduper()                       # exact
+    seen = UrlDeduper(capacity=50_000_000)    # Bloom filter, ~90 MB at 0.1% false positives
+    fresh = [row for row in rows if seen.add(row["link"])]
+"""
+
+import hashlib
+import math
+import threading
+from typing import Dict, Iterable, Iterator, Optional
+from urllib.parse import parse_qsl, unquote, urljoin, urlsplit, urlunsplit
+
+TRACKING_PARAMS = {
+    "gclid", "gbraid", "wbraid", "dclid", "fbclid", "msclkid", "yclid", "igshid",
+    "mc_cid", "mc_eid", "_ga", "_gl", "srsltid", "ref_src", "spm",
+}
+TRACKING_PREFIXES = ("utm_",)
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+# (host suffix, path, query parameter holding the target)
+REDIRECTS = [
+    ("google.", "/url", ("q", "url")),
+    ("facebook.com", "/l.php", ("u",)),
+    ("duckduckgo.com", "/l/", ("uddg",)),
+    ("youtube.com", "/redirect", ("q",)),
+    ("linkedin.com", "/redir/redirect", ("url",)),
+]
+
+
+def _redirect_target(parts) -> Optional[str]:
+    host = (parts.hostname or "").lower()
+    for suffix, path, params in REDIRECTS:
+        if suffix.endswith("."):
+            host_ok = f".{suffix}" in f".{host}"
+        else:
+            host_ok = f".{host}".endswith(f".{suffix}")
+        if host_ok and parts.path == path:
+            query = dict(parse_qsl(parts.query))
+            for name in params:
+                if query.get(name, "").startswith(("http://", "https://")):
+                    return query[name]
+    return None
+
+
+def unwrap_redirect(url: str, max_hops: int = 3) -> str:
+    """Follow known redirect wrappers (Google ``/url?q=``, Facebook ``l.php`` ...) offline."""
+    for _ in range(max_hops):
+        target = _redirect_target(urlsplit(url))
+        if target is None:
+            break
+        url = target
+    return url
+
+
+def _is_tracking(name: str) -> bool:
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIXES)
+
+
+def canonicalize(url: Optional[str], base: str = "https://www.google.com/") -> str:
+    """
+    Canonical form of a result URL, or "" if it is not an http(s) URL.
+
+    Unwraps redirects (relative ones such as ``/url?q=`` are resolved against
+    ``base``; other relative links are not results), lower-cases
+    scheme and host, IDNA-encodes the host, drops default ports, fragments and
+    tracking parameters. Everything else, including ``www.``, is kept.
+    """
+    url = (url or "").strip()
+    if not url:
+        return ""
+    if url.startswith("/"):
+        # A relative link is only a result if it redirects off-site.
+        joined = urljoin(base, url)
+        url = unwrap_redirect(joined)
+        if url == joined:
+            return ""
+    else:
+        url = unwrap_redirect(url)
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError:
+        return ""
+    scheme = parts.scheme.lower()
+    if scheme not in DEFAULT_PORTS or not parts.hostname:
+        return ""
+    host = parts.hostname.rstrip(".")
+    try:
+        host = host.encode("idna").decode("ascii")
+    except UnicodeError:
+        host = host.lower()
+    if port and port != DEFAULT_PORTS[scheme]:
+        host = f"{host}:{port}"
+    query = "&".join(p for p in parts.query.split("&") if p and not _is_tracking(unquote(p.split("=", 1)[0])))
+    return urlunsplit((scheme, host, parts.path or "/", query, ""))
+
+
+def dedup_key(url: Optional[str]) -> str:
+    """
+    Key under which URLs count as the same page.
+
+    Coarser than ``canonicalize``: also ignores the scheme, a leading
+    ``www.``, a trailing slash, query parameter order and percent-encoding.
+    """
+    canonical = canonicalize(url)
+    if not canonical:
+        return ""
+    parts = urlsplit(canonical)
+    host = parts.netloc[4:] if parts.netloc.startswith("www.") else parts.netloc
+    path = unquote(parts.path).rstrip("/")
+    query = "&".join(sorted(unquote(parts.query).split("&"))) if parts.query else ""
+    return f"{host}{path}?{query}" if query else f"{host}{path}"
+
+
+class BloomFilter:
+    """Fixed-size probabilistic set: no false negatives, ``error_rate`` false positives at ``capacity``."""
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        if capacity < 1 or not 0 < error_rate < 1:
+            raise ValueError("capacity must be positive and error_rate in (0, 1)")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: str) -> Iterator[int]:
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hashes):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, key: str) -> bool:
+        """Insert ``key``; returns False if it was (probably) present already."""
+        new = False
+        for pos in self._positions(key):
+            byte, bit = divmod(pos, 8)
+            if not self.bits[byte] & (1 << bit):
+                self.bits[byte] |= 1 << bit
+                new = True
+        self.count += new
+        return new
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[pos // 8] & (1 << (pos % 8)) for pos in self._positions(key))
+
+    def __len__(self) -> int:
+        return self.count
+
+
+class UrlDeduper:
+    """Remembers which result URLs were already seen."""
+
+    def __init__(self, capacity: Optional[int] = None, error_rate: float = 0.001):
+        """
+        Args:
+            capacity (int): Expected number of URLs; if given, use a Bloom filter of that size
+                instead of an exact set (constant memory, rare false "already seen")
+            error_rate (float): Bloom filter false positive rate at ``capacity``
+        """
+        self.bloom = BloomFilter(capacity, error_rate) if capacity else None
+        self._exact = set()
+        self._lock = threading.Lock()
+        self.added = 0
+        self.duplicates = 0
+
+    @staticmethod
+    def _digest(key: str) -> int:
+        # 8 bytes per URL instead of the whole string keeps the exact set small.
+        return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "little")
+
+    def add(self, url: str) -> bool:
+        """Record ``url``; returns True if it was not seen before. Non-http URLs are never new."""
+        key = dedup_key(url)
+        if not key:
+            return False
+        with self._lock:
+            if self.bloom is not None:
+                new = self.bloom.add(key)
+            else:
+                digest = self._digest(key)
+                new = digest not in self._exact
+                self._exact.add(digest)
+            if new:
+                self.added += 1
+            else:
+                self.duplicates += 1
+        return new
+
+    def __contains__(self, url: str) -> bool:
+        key = dedup_key(url)
+        with self._lock:
+            if self.bloom is not None:
+                return key in self.bloom
+            return self._digest(key) in self._exact
+
+    def filter(self, rows: Iterable[Dict], field: str = "link") -> Iterator[Dict]:
+        """Yield only rows whose ``field`` URL is new."""
+        for row in rows:
+            if self.add(row.get(field, "")):
+                yield row
+
+    def stats(self) -> Dict:
+        s = {"mode": "bloom" if self.bloom is not None else "exact", "unique": self.added,
+             "duplicates": self.duplicates}
+        if self.bloom is not None:
+            s["bloom_bytes"] = len(self.bloom.bits)
+        return s
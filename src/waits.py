@@ -0,0 +1,158 @@
+"""
+Adaptive readiness waits to replace fixed ``time.sleep`` calls.
+
+Instead of sleeping a guessed number of seconds after ``driver.get`` or a
+scroll, wait exactly until the page signals it is ready:
+
+* ``wait_for_selector`` - a CSS selector matches (MutationObserver, no polling
+  from Python)
+* ``wait_for_quiescence`` - the DOM has stopped changing for ``quiet_ms``
+* ``wait_ready`` - both, in one WebDriver round-trip
+
+Each wait runs as a single ``execute_async_script`` call and can report how
+long it actually waited to a ``WaitRecorder``. Combine with
+``build_driver(page_load_strategy="eager")`` so ``driver.get`` returns at
+DOMContentLoaded instead of after every image and ad has loaded.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional
+
+from .tracing import span
+
+# arguments: selector (or null), quiet ms, timeout ms, callback
+# Resolves with {ok, matched, waited_ms}; never throws so a timeout is
+# reported rather than raised inside the browser.
+READY_SCRIPT = """
+const [selector, quietMs, timeoutMs, done] = arguments;
+const started = performance.now();
+let lastMutation = started;
+let finished = false;
+
+const observer = new MutationObserver(() => { lastMutation = performance.now(); });
+observer.observe(document.documentElement, {childList: true, subtree: true, attributes: true, characterData: true});
+
+function finish(ok) {
+    if (finished) return;
+    finished = true;
+    observer.disconnect();
+    done({ok: ok, matched: !selector || !!document.querySelector(selector),
+          waited_ms: Math.round(performance.now() - started)});
+}
+
+(function check() {
+    const now = performance.now();
+    const matched = !selector || !!document.querySelector(selector);
+    const quiet = quietMs <= 0 || (now - lastMutation) >= quietMs;
+    if (matched && quiet && document.readyState !== "loading") return finish(true);
+    if (now - started >= timeoutMs) return finish(false);
+    setTimeout(check, Math.min(50, Math.max(quietMs / 4, 10)));
+})();
+"""
+
+
+class WaitRecorder:
+    """Accumulate the time actually spent in each wait phase."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._totals = {}
+        self._counts = {}
+        self._timeouts = {}
+
+    def add(self, phase: str, seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            self._totals[phase] = self._totals.get(phase, 0.0) + seconds
+            self._counts[phase] = self._counts.get(phase, 0) + 1
+            self._timeouts[phase] = self._timeouts.get(phase, 0) + int(timed_out)
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time the body of a ``with`` block as phase ``name`` (also traced as a span)."""
+        t0 = time.perf_counter()
+        try:
+            with span(name):
+                yield
+        finally:
+            self.add(name, time.perf_counter() - t0)
+
+    def summary(self) -> Dict[str, Dict]:
+        """Per phase: count, total and mean seconds, and timeouts."""
+        with self._lock:
+            return {
+                phase: {
+                    "count": self._counts[phase],
+                    "total_s": round(total, 3),
+                    "mean_s": round(total / self._counts[phase], 3),
+                    "timeouts": self._timeouts[phase],
+                }
+                for phase, total in self._totals.items()
+            }
+
+
+def wait_ready(driver, selector: Optional[str] = None, quiet_ms: int = 300, timeout: float = 10,
+               recorder: Optional[WaitRecorder] = None, phase: str = "ready") -> bool:
+    """
+    Wait until ``selector`` matches and the DOM has been quiet for ``quiet_ms``.
+
+    Args:
+        driver: Selenium WebDriver
+        selector (str): CSS selector that must match, None to skip
+        quiet_ms (int): Required DOM silence in milliseconds, 0 to skip
+        timeout (float): Give up after this many seconds
+        recorder (WaitRecorder): Receives the time waited under ``phase``
+        phase (str): Phase name for the recorder
+
+    Returns:
+        bool: True if the page became ready, False on timeout
+    """
+    driver.set_script_timeout(timeout + 5)
+    t0 = time.perf_counter()
+    with span(phase, selector=selector) as s:
+        result = driver.execute_async_script(READY_SCRIPT, selector, int(quiet_ms), int(timeout * 1000)) or {}
+        ok = bool(result.get("ok"))
+        s.set(timed_out=not ok)
+    if recorder is not None:
+        recorder.add(phase, time.perf_counter() - t0, timed_out=not ok)
+    return ok
+
+
+def wait_for_selector(driver, selector: str, timeout: float = 10, recorder: Optional[WaitRecorder] = None,
+                      phase: str = "selector") -> bool:
+    """Wait until ``selector`` matches an element; True if it did before ``timeout``."""
+    return wait_ready(driver, selector=selector, quiet_ms=0, timeout=timeout, recorder=recorder, phase=phase)
+
+
+def wait_for_quiescence(driver, quiet_ms: int = 300, timeout: float = 10,
+                        recorder: Optional[WaitRecorder] = None, phase: str = "quiescence") -> bool:
+    """Wait until the DOM has not changed for ``quiet_ms``; True if it settled before ``timeout``."""
+    return wait_ready(driver, selector=None, quiet_ms=quiet_ms, timeout=timeout, recorder=recorder, phase=phase)
+
+
+def wait_until(condition: Callable[[], object], timeout: float = 10, poll: float = 0.05,
+               recorder: Optional[WaitRecorder] = None, phase: str = "condition"):
+    """
+    Poll a Python-side ``condition`` until it returns a truthy value.
+
+    For conditions that cannot be expressed in the page, e.g. a file
+    appearing or a window handle opening.
+
+    Returns:
+        The truthy value returned by ``condition``
+
+    Raises:
+        TimeoutError: If ``condition`` stayed falsy for ``timeout`` seconds
+    """
+    t0 = time.perf_counter()
+    deadline = t0 + timeout
+    while True:
+        value = condition()
+        if value or time.perf_counter() >= deadline:
+            if recorder is not None:
+                recorder.add(phase, time.perf_counter() - t0, timed_out=not value)
+            if value:
+                return value
+            raise TimeoutError(f"condition not met after {timeout}s")
+        time.sleep(poll)
@@ -0,0 +1,208 @@
+"""
+Append-only streaming result writers.
+
+``apolloio.py`` calls ``df.to_csv(...)`` after every company and lead,
+rewriting the whole file each time, and most SERP scrapers keep every row
+in ``self.results`` until the end. These writers append each row as it is
+produced and flush in batches, every ``flush_every`` rows or
+``flush_interval`` seconds, whichever comes first, with an ``fsync`` so a
+crash loses at most one batch. They are context managers and also close on
+interpreter exit, so Ctrl+C leaves a complete, well-formed file.
+
+Usage:
+    with open_writer("results/leads.csv") as writer:
+        for row in scrape():
+            writer.write(row)
+"""
+
+import atexit
+import csv
+import io
+import json
+import os
+import sys
+import threading
+import time
+import weakref
+from typing import Dict, Iterable, List, Optional
+
+from .helpers import RESULT_FIELDS
+
+
+class StreamWriter:
+    """Base class: buffering, periodic flush/fsync and clean shutdown."""
+
+    def __init__(self, path: str, flush_every: int = 100, flush_interval: float = 5.0, fsync: bool = True,
+                 append: bool = True):
+        """
+        Args:
+            path (str): Output file, or "-" for stdout
+            flush_every (int): Flush after this many buffered rows
+            flush_interval (float): Flush when the oldest buffered row is this many seconds old
+            fsync (bool): fsync the file on every flush
+            append (bool): Add to an existing file instead of truncating it
+        """
+        self.path = path
+        self.append = append
+        self.flush_every = max(1, flush_every)
+        self.flush_interval = flush_interval
+        self.fsync = fsync and path != "-"
+        self.rows = 0
+        self.flushes = 0
+        self.closed = False
+        self._buffer = []
+        self._buffered_since = None
+        self._lock = threading.Lock()
+        if path == "-":
+            self._file = sys.stdout
+        else:
+            folder = os.path.dirname(path)
+            if folder:
+                os.makedirs(folder, exist_ok=True)
+            self._file = self._open()
+        ref = weakref.ref(self)
+        self._atexit = lambda: ref() is not None and ref().close()
+        atexit.register(self._atexit)
+
+    def _open(self):
+        return open(self.path, "a" if self.append else "w", encoding="utf-8", newline="")
+
+    def _encode(self, row: Dict) -> str:
+        raise NotImplementedError
+
+    def _footer(self) -> str:
+        return ""
+
+    def write(self, row: Dict) -> None:
+        """Buffer one row, flushing if the batch is full or old enough."""
+        with self._lock:
+            if self.closed:
+                raise ValueError(f"write to closed writer {self.path!r}")
+            self._buffer.append(self._encode(row))
+            self.rows += 1
+            if self._buffered_since is None:
+                self._buffered_since = time.monotonic()
+            if (len(self._buffer) >= self.flush_every
+                    or time.monotonic() - self._buffered_since >= self.flush_interval):
+                self._flush()
+
+    def write_many(self, rows: Iterable[Dict]) -> None:
+        for row in rows:
+            self.write(row)
+
+    def flush(self) -> None:
+        with self._lock:
+            if not self.closed:
+                self._flush()
+
+    def _flush(self) -> None:
+        if self._buffer:
+            self._file.write("".join(self._buffer))
+            self._buffer = []
+            self.flushes += 1
+        self._buffered_since = None
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        """Flush what is buffered, finish the file and close it. Safe to call twice."""
+        with self._lock:
+            if self.closed:
+                return
+            self._buffer.append(self._footer())
+            self._flush()
+            self.closed = True
+            if self._file is not sys.stdout:
+                self._file.close()
+        atexit.unregister(self._atexit)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class NdjsonWriter(StreamWriter):
+    """One JSON object per line."""
+
+    def _encode(self, row: Dict) -> str:
+        return json.dumps(row, ensure_ascii=False) + "\n"
+
+
+class CsvWriter(StreamWriter):
+    """
+    CSV with a fixed header.
+
+    Columns are ``fieldnames`` if given, else the header of the existing
+    file being appended to, else RESULT_FIELDS followed by the other keys
+    of the first row. Keys outside the header are dropped.
+    """
+
+    def __init__(self, path: str, fieldnames: Optional[List[str]] = None, **kwargs):
+        self.fieldnames = list(fieldnames) if fieldnames else None
+        self._needs_header = True
+        super().__init__(path, **kwargs)
+
+    def _open(self):
+        if self.append and os.path.exists(self.path) and os.path.getsize(self.path) > 0:
+            with open(self.path, encoding="utf-8", newline="") as f:
+                header = next(csv.reader(f), None)
+            self.fieldnames = self.fieldnames or header
+            self._needs_header = False
+        return super()._open()
+
+    def _encode(self, row: Dict) -> str:
+        out = io.StringIO()
+        if self.fieldnames is None:
+            self.fieldnames = [f for f in RESULT_FIELDS if f in row] + [k for k in row if k not in RESULT_FIELDS]
+        writer = csv.DictWriter(out, fieldnames=self.fieldnames, extrasaction="ignore")
+        if self._needs_header:
+            writer.writeheader()
+            self._needs_header = False
+        writer.writerow(row)
+        return out.getvalue()
+
+
+class JsonArrayWriter(StreamWriter):
+    """
+    A single JSON array, written incrementally.
+
+    The closing bracket is written by ``close``; the file is always
+    rewritten, since an array cannot be extended in place.
+    """
+
+    def __init__(self, path: str, **kwargs):
+        self._first = True
+        kwargs["append"] = False
+        super().__init__(path, **kwargs)
+
+    def _encode(self, row: Dict) -> str:
+        prefix = "[\n  " if self._first else ",\n  "
+        self._first = False
+        return prefix + json.dumps(row, ensure_ascii=False)
+
+    def _footer(self) -> str:
+        return "[]\n" if self._first else "\n]\n"
+
+
+WRITERS = {"ndjson": NdjsonWriter, "csv": CsvWriter, "json": JsonArrayWriter}
+
+
+def open_writer(path: str, fmt: Optional[str] = None, **kwargs) -> StreamWriter:
+    """
+    Open a streaming writer, picking the format from ``fmt`` or the file extension.
+
+    Args:
+        path (str): Output file, or "-" for stdout
+        fmt (str): "ndjson", "csv" or "json"; defaults to the extension, else ndjson
+        **kwargs: Passed to the writer (flush_every, flush_interval, fsync, append, fieldnames)
+    """
+    if fmt is None:
+        ext = os.path.splitext(path)[1].lstrip(".").lower()
+        ext = "ndjson" if ext == "jsonl" else ext
+        fmt = ext if ext in WRITERS else "ndjson"
+    if fmt not in WRITERS:
+        raise ValueError(f"unknown format {fmt!r}, expected one of {sorted(WRITERS)}")
+    return WRITERS[fmt](path, **kwargs)
@@ -0,0 +1,94 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+from src.batch import BatchStats, load_search_function, read_queries, run_batch
+
+
+class TestRunBatch(unittest.TestCase):
+
+    def test_yields_in_input_order(self):
+        delays = {"a": 0.05, "b": 0.0, "c": 0.02, "d": 0.0}
+
+        def search(query):
+            time.sleep(delays[query])
+            return [{"title": query}]
+
+        items = list(run_batch(["a", "b", "c", "d"], search, workers=4))
+        self.assertEqual([i.query for i in items], ["a", "b", "c", "d"])
+        self.assertEqual([i.index for i in items], [0, 1, 2, 3])
+
+    def test_bounded_concurrency(self):
+        lock = threading.Lock()
+        active = [0]
+        peak = [0]
+
+        def search(query):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.01)
+            with lock:
+                active[0] -= 1
+            return []
+
+        list(run_batch([str(i) for i in range(12)], search, workers=3))
+        self.assertLessEqual(peak[0], 3)
+
+    def test_errors_do_not_stop_batch(self):
+        def search(query):
+            if query == "bad":
+                raise RuntimeError("blocked")
+            return [{"title": query}]
+
+        stats = BatchStats()
+        items = list(run_batch(["ok", "bad", "ok2"], search, workers=2, stats=stats))
+        self.assertIsInstance(items[1].error, RuntimeError)
+        self.assertEqual(stats.summary()["queries"], 3)
+        self.assertEqual(stats.summary()["failed"], 1)
+        self.assertEqual(stats.summary()["results"], 2)
+
+
+class TestLoading(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def write(self, name, text):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        return path
+
+    def test_read_queries_skips_blanks_and_comments(self):
+        path = self.write("q.txt", "python\n\n# comment\n  selenium  \n")
+        self.assertEqual(read_queries(path), ["python", "selenium"])
+
+    def test_load_function(self):
+        path = self.write("scrape.py", "def scrape_google(query, limit=10):\n    return [query] * limit\n")
+        fn = load_search_function(f"{path}:scrape_google", limit=2)
+        self.assertEqual(fn("x"), ["x", "x"])
+
+    def test_load_method_gets_instance_per_thread(self):
+        path = self.write(
+            "scraper.py",
+            "class GoogleScraper:\n"
+            "    def search_google(self, query):\n"
+            "        return [id(self)]\n",
+        )
+        fn = load_search_function(f"{path}:GoogleScraper.search_google")
+        ids = []
+        threads = [threading.Thread(target=lambda: ids.append(fn("q")[0])) for _ in range(2)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(fn("q"), fn("q"))
+        self.assertEqual(len(set(ids)), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+import os
+import tempfile
+import time
+import unittest
+
+from src.backends import SearchBackend
+from src.cache import SerpCache, cache_key
+from src.helpers import make_result
+from src.router import BackendRouter
+
+
+class CountingBackend(SearchBackend):
+    name = "api"
+
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def _fetch(self, query, num, hl, gl, start):
+        self.calls += 1
+        return [make_result(i, f"{query} {i}", f"https://example.com/{i}") for i in range(1, num + 1)]
+
+
+class TestSerpCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "cache", "serp.sqlite")
+
+    def test_key_normalizes_query(self):
+        self.assertEqual(cache_key("Python  Tutorial"), cache_key(" python tutorial"))
+        self.assertNotEqual(cache_key("python", backend="a"), cache_key("python", backend="b"))
+        self.assertNotEqual(cache_key("python", start=0), cache_key("python", start=10))
+
+    def test_persists_between_instances(self):
+        cache = SerpCache(self.path)
+        cache.put("python", [{"title": "x"}], backend="serpapi")
+        cache.close()
+
+        cache = SerpCache(self.path)
+        self.assertEqual(cache.get("PYTHON", backend="serpapi"), [{"title": "x"}])
+        self.assertIsNone(cache.get("python", backend="selenium"))
+        self.assertEqual(cache.stats()["hits"], 1)
+        self.assertEqual(cache.stats()["misses"], 1)
+        cache.close()
+
+    def test_smaller_entry_does_not_satisfy_bigger_request(self):
+        cache = SerpCache(self.path)
+        cache.put("python", [{"title": "x"}] * 10, num=10)
+        self.assertIsNone(cache.get("python", num=20))
+        self.assertEqual(len(cache.get("python", num=5)), 5)
+        cache.close()
+
+    def test_ttl(self):
+        cache = SerpCache(self.path, ttl=0.01)
+        cache.put("python", [{"title": "x"}])
+        time.sleep(0.02)
+        self.assertIsNone(cache.get("python"))
+        self.assertEqual(cache.stats()["expired"], 1)
+        cache.close()
+
+    def test_lru_eviction(self):
+        cache = SerpCache(self.path, max_bytes=250)
+        for q in ("a", "b", "c"):
+            cache.put(q, [{"title": q * 80}])
+            time.sleep(0.01)
+        self.assertIsNone(cache.get("a"))
+        self.assertIsNotNone(cache.get("c"))
+        self.assertGreaterEqual(cache.stats()["evictions"], 1)
+        cache.close()
+
+    def test_put_keeps_a_running_size_instead_of_scanning(self):
+        cache = SerpCache(self.path, max_bytes=10_000)
+        statements = []
+        cache._db.set_trace_callback(statements.append)
+        cache.put("a", [{"title": "x" * 100}])
+        cache.put("a", [{"title": "y" * 50}])
+        cache.put("b", [{"title": "z" * 200}])
+        self.assertFalse([sql for sql in statements if "SUM(" in sql])
+        cache._db.set_trace_callback(None)
+        self.assertEqual(cache._bytes, cache.stats()["bytes"])
+        cache.close()
+
+        cache = SerpCache(self.path, max_bytes=200)
+        self.assertGreater(cache._bytes, 200)
+        cache.put("c", [{"title": "c"}])
+        self.assertLessEqual(cache._bytes, 200)
+        self.assertEqual(cache._bytes, cache.stats()["bytes"])
+        cache.close()
+
+    def test_router_serves_repeat_from_cache(self):
+        cache = SerpCache(self.path)
+        backend = CountingBackend()
+        router = BackendRouter([backend])
+        router.attach_cache(cache)
+
+        first = router.search("Python", num=3)
+        second = router.search("python ", num=3)
+
+        self.assertEqual(backend.calls, 1)
+        self.assertEqual([r["link"] for r in first], [r["link"] for r in second])
+        self.assertEqual(second[0]["query"], "python ")
+        self.assertEqual(router.report()[0]["calls"], 1)
+        cache.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+import threading
+import time
+import unittest
+
+from src.backends import SearchBackend
+from src.batch import BatchStats, run_batch
+from src.coalesce import SingleFlight, coalesced
+from src.helpers import make_result, normalize_query
+from src.router import BackendRouter
+
+
+class SlowBackend(SearchBackend):
+    name = "slow"
+
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def _fetch(self, query, num, hl, gl, start):
+        self.calls += 1
+        time.sleep(0.05)
+        return [make_result(1, query, "https://example.com/")]
+
+
+def run_together(fn, args):
+    out = [None] * len(args)
+    barrier = threading.Barrier(len(args))
+
+    def worker(i):
+        barrier.wait()
+        try:
+            out[i] = fn(args[i])
+        except Exception as e:
+            out[i] = e
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(len(args))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return out
+
+
+class TestNormalizeQuery(unittest.TestCase):
+
+    def test_variants_collapse(self):
+        for variant in ["Python  Programming", "python+programming", "python%20programming", " PYTHON programming "]:
+            self.assertEqual(normalize_query(variant), "python programming")
+
+    def test_plus_kept_in_language_names(self):
+        self.assertEqual(normalize_query("C++ tutorial"), "c++ tutorial")
+        self.assertEqual(normalize_query("c++"), "c++")
+
+
+class TestSingleFlight(unittest.TestCase):
+
+    def test_concurrent_calls_share_one_fetch(self):
+        calls = []
+
+        def search(query):
+            calls.append(query)
+            time.sleep(0.05)
+            return [{"title": query}]
+
+        search = coalesced(search)
+        out = run_together(search, ["Python", "python", "python%20", "PYTHON "])
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(all(rows == [{"title": calls[0]}] for rows in out))
+        self.assertEqual(search.flight.stats(), {"executed": 1, "shared": 3})
+
+    def test_waiters_get_independent_copies(self):
+        def search(query):
+            time.sleep(0.05)
+            return [{"title": "x"}]
+
+        out = run_together(coalesced(search), ["q", "q"])
+        out[0][0]["title"] = "changed"
+        self.assertEqual(out[1][0]["title"], "x")
+
+    def test_leader_does_not_get_the_shared_result(self):
+        shared = [{"title": "x"}]
+        rows = SingleFlight().do("q", lambda: shared)
+        self.assertEqual(rows, shared)
+        self.assertIsNot(rows, shared)
+        self.assertIsNot(rows[0], shared[0])
+
+    def test_error_reaches_every_waiter(self):
+        def search(query):
+            time.sleep(0.05)
+            raise RuntimeError("blocked")
+
+        out = run_together(coalesced(search), ["q", "q", "q"])
+        self.assertTrue(all(isinstance(e, RuntimeError) for e in out))
+
+    def test_sequential_calls_are_not_shared(self):
+        flight = SingleFlight()
+        flight.do("k", lambda: 1)
+        flight.do("k", lambda: 2)
+        self.assertEqual(flight.stats(), {"executed": 2, "shared": 0})
+
+    def test_router_coalesces_identical_requests(self):
+        backend = SlowBackend()
+        router = BackendRouter([backend])
+        out = run_together(lambda q: router.search(q, num=1), ["Python", "python"])
+        self.assertEqual(backend.calls, 1)
+        self.assertEqual([rows[0]["query"] for rows in out], ["Python", "python"])
+
+
+class TestBatchDedup(unittest.TestCase):
+
+    def test_duplicates_fetched_once(self):
+        calls = []
+
+        def search(query):
+            calls.append(query)
+            return [{"title": query}]
+
+        stats = BatchStats()
+        queries = ["python", "java", "Python", "python%20", "go", "JAVA"]
+        items = list(run_batch(queries, search, workers=2, stats=stats))
+        self.assertEqual(sorted(calls), ["go", "java", "python"])
+        self.assertEqual([i.query for i in items], queries)
+        self.assertEqual(items[2].results, [{"title": "python"}])
+        self.assertEqual(stats.deduplicated, 3)
+        self.assertEqual(stats.results, 6)
+
+    def test_dedupe_can_be_disabled(self):
+        calls = []
+        list(run_batch(["a", "A"], lambda q: calls.append(q) or [], workers=1, dedupe=False))
+        self.assertEqual(len(calls), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import json
+import os
+import stat
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+from src import driver
+from src.driver import resolve_driver_path
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def fake_binary(folder, name="chromedriver"):
+    path = os.path.join(folder, name)
+    with open(path, "w") as f:
+        f.write("#!/bin/sh\n")
+    os.chmod(path, os.stat(path).st_mode | stat.S_IXUSR)
+    return path
+
+
+class TestResolveDriverPath(unittest.TestCase):
+
+    def setUp(self):
+        driver._resolved.clear()
+        self.addCleanup(driver._resolved.clear)
+        patcher = mock.patch.dict(os.environ, {"CHROMEDRIVER": ""})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_resolves_from_path_once_and_caches_to_disk(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            binary = fake_binary(tmp)
+            cache = os.path.join(tmp, "cache", "chromedriver.json")
+            with mock.patch("shutil.which", return_value=binary) as which:
+                self.assertEqual(resolve_driver_path(cache), binary)
+                self.assertEqual(resolve_driver_path(cache), binary)
+            self.assertEqual(which.call_count, 1)
+            with open(cache, encoding="utf-8") as f:
+                self.assertEqual(json.load(f)["path"], binary)
+
+            driver._resolved.clear()
+            with mock.patch("shutil.which", return_value=None) as which:
+                self.assertEqual(resolve_driver_path(cache), binary)
+            which.assert_not_called()
+
+    def test_stale_cache_entry_is_resolved_again(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = os.path.join(tmp, "chromedriver.json")
+            with open(cache, "w", encoding="utf-8") as f:
+                json.dump({"path": os.path.join(tmp, "gone")}, f)
+            binary = fake_binary(tmp, "chromedriver-new")
+            with mock.patch("shutil.which", return_value=binary):
+                self.assertEqual(resolve_driver_path(cache), binary)
+
+    def test_environment_override(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            binary = fake_binary(tmp)
+            with mock.patch.dict(os.environ, {"CHROMEDRIVER": binary}):
+                self.assertEqual(resolve_driver_path(None), binary)
+
+
+class TestColdStart(unittest.TestCase):
+
+    def test_cli_import_loads_no_heavy_modules(self):
+        code = ("import sys, src.main; "
+                "print(sorted(m for m in ('selenium', 'webdriver_manager', 'pandas', 'fake_useragent', "
+                "'requests', 'pyarrow') if m in sys.modules))")
+        out = subprocess.run([sys.executable, "-c", code], cwd=REPO_ROOT, capture_output=True, text=True, check=True)
+        self.assertEqual(out.stdout.strip(), "[]")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import json
+import unittest
+
+from src.extract import extract_results
+
+
+class ScriptOnlyDriver:
+    """Answers the injected extraction script and counts round-trips."""
+
+    def __init__(self, items):
+        self.items = items
+        self.calls = 0
+
+    def set_script_timeout(self, seconds):
+        pass
+
+    def execute_async_script(self, script, limit, *args):
+        self.calls += 1
+        return json.dumps({"rows": self.items[:limit]})
+
+
+class TestScriptExtraction(unittest.TestCase):
+
+    def test_one_round_trip_for_whole_page(self):
+        items = [
+            {"title": f" Result {i} ", "link": f"https://example.com/{i}", "snippet": "text"}
+            for i in range(10)
+        ]
+        driver = ScriptOnlyDriver(items)
+
+        rows = extract_results(driver, limit=5)
+
+        self.assertEqual(driver.calls, 1)
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(rows[0], {"position": 1, "title": "Result 0",
+                                   "link": "https://example.com/0", "snippet": "text"})
+
+    def test_positions_have_no_gaps_for_untitled_rows(self):
+        items = [{"title": title, "link": f"https://example.com/{i}", "snippet": ""}
+                 for i, title in enumerate(["A", "", "B", "C"])]
+
+        rows = extract_results(ScriptOnlyDriver(items), limit=10)
+
+        self.assertEqual([(r["position"], r["title"]) for r in rows], [(1, "A"), (2, "B"), (3, "C")])
+
+    def test_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            extract_results(ScriptOnlyDriver([]), mode="xpath")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import contextlib
+import io
+import os
+import unittest
+
+from src.bench import main as bench_main, measure
+from src.extractors import ADAPTERS, field_completeness, normalize_rows
+
+CORPUS = os.path.join(os.path.dirname(__file__), "fixtures", "serp")
+
+
+class TestExtractors(unittest.TestCase):
+
+    def test_normalize_rows_maps_intern_keys(self):
+        rows = normalize_rows([
+            {"Title": " A ", "URL": "https://a.com", "Description": "N/A"},
+            {"heading": "B", "href": "https://b.com", "desc": "text"},
+        ])
+        self.assertEqual(rows, [
+            {"position": 1, "title": "A", "link": "https://a.com", "snippet": ""},
+            {"position": 2, "title": "B", "link": "https://b.com", "snippet": "text"},
+        ])
+
+    def test_field_completeness(self):
+        rows = [{"title": "a", "link": "x", "snippet": ""}, {"title": "b", "link": "", "snippet": "s"}]
+        self.assertEqual(field_completeness(rows), {"title": 1.0, "link": 0.5, "snippet": 0.5})
+        self.assertEqual(field_completeness([])["title"], 0.0)
+
+    def test_measure(self):
+        rows, seconds, peak = measure(lambda page: [page] * 1000, "x", repeat=3)
+        self.assertEqual(len(rows), 1000)
+        self.assertGreater(peak, 0)
+        self.assertGreaterEqual(seconds, 0)
+
+    def test_compare_without_browser(self):
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            report = bench_main(["compare", "--pages", CORPUS, "--no-browser", "--repeat", "2"])
+        self.assertNotIn("src-script", report)
+        self.assertEqual(report["stdlib"]["results"], 5)
+        self.assertEqual(report["stdlib"]["recall"], 1.0)
+        self.assertEqual(report["stdlib"]["complete"], {"title": 1.0, "link": 1.0, "snippet": 1.0})
+        self.assertIn("pages/sec", out.getvalue())
+        self.assertTrue(all(a.kind in ("html", "driver") for a in ADAPTERS.values()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+import unittest
+
+from src.governor import MemoryGovernor, export_cookies
+from src.pool import DriverPool
+
+
+class FakeSwitch:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def window(self, handle):
+        self.driver.current = handle
+
+
+class FakeDriver:
+    """Just enough WebDriver for the governor: tabs, CDP calls and a settable memory figure."""
+
+    def __init__(self, mb=100.0, cookies=None):
+        self.mb = mb
+        self.window_handles = ["main", "popup"]
+        self.switch_to = FakeSwitch(self)
+        self.current = "main"
+        self.cdp = []
+        self.cookies = cookies or []
+        self.quit_called = False
+        self.freed_by_soft = 0.0
+
+    def close(self):
+        self.window_handles.remove(self.current)
+
+    def get(self, url):
+        self.url = url
+
+    def execute_cdp_cmd(self, command, params):
+        self.cdp.append(command)
+        if command == "Network.getAllCookies":
+            return {"cookies": self.cookies}
+        if command == "Network.setCookies":
+            self.cookies = params["cookies"]
+        if command == "Memory.simulatePressureNotification":
+            self.mb -= self.freed_by_soft
+        return {}
+
+    def execute_script(self, script):
+        return 1
+
+    def quit(self):
+        self.quit_called = True
+
+
+def sampler(driver):
+    return {"total_mb": driver.mb}
+
+
+def governor(**kwargs):
+    kwargs.setdefault("every", 1)
+    return MemoryGovernor(soft_mb=500, hard_mb=1000, settle=0, sampler=sampler, **kwargs)
+
+
+class TestMemoryGovernor(unittest.TestCase):
+
+    def test_below_soft_threshold_does_nothing(self):
+        gov = governor()
+        driver = FakeDriver(mb=200)
+        self.assertIs(gov.check(driver), driver)
+        self.assertEqual(driver.cdp, [])
+        self.assertEqual(gov.stats()["samples"], 1)
+
+    def test_samples_every_n_checks(self):
+        gov = governor(every=3)
+        driver = FakeDriver(mb=200)
+        for _ in range(7):
+            gov.check(driver)
+        self.assertEqual(gov.stats()["samples"], 2)
+
+    def test_soft_recycle_closes_tabs_and_clears_caches(self):
+        gov = governor()
+        driver = FakeDriver(mb=700)
+        driver.freed_by_soft = 400
+        self.assertIs(gov.check(driver, factory=FakeDriver), driver)
+        self.assertEqual(driver.window_handles, ["main"])
+        self.assertEqual(driver.url, "about:blank")
+        self.assertIn("Network.clearBrowserCache", driver.cdp)
+        self.assertEqual(gov.events[-1]["event"], "soft_recycle")
+        self.assertEqual((gov.events[-1]["before_mb"], gov.events[-1]["after_mb"]), (700, 300))
+
+    def test_hard_recycle_keeps_cookies(self):
+        gov = governor()
+        cookies = [{"name": "sid", "value": "1", "domain": ".example.com", "path": "/", "size": 4,
+                    "session": True, "expires": -1}]
+        old = FakeDriver(mb=1500, cookies=cookies)
+        new = gov.check(old, factory=FakeDriver)
+        self.assertIsNot(new, old)
+        self.assertTrue(old.quit_called)
+        self.assertEqual(new.cookies, [{"name": "sid", "value": "1", "domain": ".example.com", "path": "/"}])
+        self.assertEqual(gov.stats()["hard"], 1)
+
+    def test_soft_recycle_that_does_not_help_escalates(self):
+        gov = governor()
+        old = FakeDriver(mb=800)
+        self.assertIsNot(gov.check(old, factory=FakeDriver), old)
+        self.assertEqual([e["event"] for e in gov.events], ["sample", "soft_recycle", "hard_recycle"])
+
+    def test_export_cookies_drops_read_only_fields(self):
+        driver = FakeDriver(cookies=[{"name": "a", "value": "b", "expires": 1900000000, "size": 2}])
+        self.assertEqual(export_cookies(driver), [{"name": "a", "value": "b", "expires": 1900000000}])
+
+    def test_pool_swaps_in_hard_recycled_session(self):
+        made = []
+
+        def factory():
+            made.append(FakeDriver(mb=100))
+            return made[-1]
+
+        pool = DriverPool(size=1, factory=factory, governor=governor())
+        with pool.lease() as driver:
+            driver.mb = 5000
+        with pool.lease() as replacement:
+            self.assertIs(replacement, made[1])
+        self.assertTrue(made[0].quit_called)
+        self.assertEqual(pool.stats()["created"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import os
+import tempfile
+import unittest
+
+from src.batch import run_batch
+from src.journal import JobJournal, journaled
+
+
+class TestJobJournal(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "jobs.sqlite")
+
+    def open(self, job="serp"):
+        journal = JobJournal(self.path, job=job)
+        self.addCleanup(journal.close)
+        return journal
+
+    def test_add_keeps_order_and_ignores_known_keys(self):
+        journal = self.open()
+        self.assertEqual(journal.add(["a", "b", "c"]), 3)
+        self.assertEqual(journal.add(["b", "d"]), 1)
+        self.assertEqual(journal.pending(), ["a", "b", "c", "d"])
+
+    def test_states_and_results(self):
+        journal = self.open()
+        journal.add(["a", "b"])
+        self.assertEqual(journal.run("a", lambda key: [{"title": key}]), [{"title": "a"}])
+        with self.assertRaises(RuntimeError):
+            journal.run("b", lambda key: (_ for _ in ()).throw(RuntimeError("captcha")))
+        self.assertEqual(journal.counts(), {"pending": 0, "running": 0, "done": 1, "failed": 1})
+        self.assertEqual(journal.failures(), [{"key": "b", "attempts": 1, "error": "RuntimeError: captcha"}])
+        self.assertEqual(journal.pending(), ["b"])
+        self.assertEqual(journal.pending(retry_failed=False), [])
+
+    def test_resume_after_crash_skips_done_work(self):
+        journal = self.open()
+        journal.add(["a", "b", "c"])
+        journal.run("a", lambda key: [{"title": key}])
+        journal.start("b")  # process dies here
+        journal.close()
+
+        journal = self.open()
+        self.assertEqual(journal.recovered, 1)
+        self.assertEqual(journal.pending(), ["b", "c"])
+        calls = []
+        search = journaled(journal, lambda q: calls.append(q) or [{"title": q}])
+        items = list(run_batch(["a", "b", "c"], search, workers=2))
+        self.assertEqual(sorted(calls), ["b", "c"])
+        self.assertEqual([i.results for i in items], [[{"title": q}] for q in "abc"])
+
+    def test_jobs_are_separate(self):
+        self.open("apollo").add(["acme"])
+        self.assertEqual(self.open("properties").pending(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
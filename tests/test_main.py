@@ -0,0 +1,108 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from src import extract
+from src.backends import PlaywrightBackend, SeleniumBackend
+from src.main import main, print_browser_summary
+from src.router import BackendRouter
+from src.selector_chain import SelectorChain
+
+
+class TestBatchCli(unittest.TestCase):
+
+    def test_batch_with_existing_scraper_writes_ndjson_in_order(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            scraper = os.path.join(tmp, "scrape.py")
+            with open(scraper, "w", encoding="utf-8") as f:
+                f.write(
+                    "def scrape_google(query):\n"
+                    "    return [{'position': 1, 'title': query.upper(),\n"
+                    "             'link': 'https://x/' + query, 'snippet': ''}]\n"
+                )
+            queries = os.path.join(tmp, "queries.txt")
+            with open(queries, "w", encoding="utf-8") as f:
+                f.write("alpha\nbeta\ngamma\n")
+            prefix = os.path.join(tmp, "out")
+
+            with contextlib.redirect_stderr(io.StringIO()) as err:
+                stats = main(["--batch", queries, "--scraper", f"{scraper}:scrape_google", "--no-cache",
+                              "--workers", "2", "--output", prefix])
+
+            with open(prefix + ".ndjson", encoding="utf-8") as f:
+                rows = [json.loads(line) for line in f]
+            self.assertEqual([r["query"] for r in rows], ["alpha", "beta", "gamma"])
+            self.assertEqual(stats.queries, 3)
+            self.assertIn("queries/min", err.getvalue())
+
+    def test_batch_trace_and_metrics(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            scraper = os.path.join(tmp, "scrape.py")
+            with open(scraper, "w", encoding="utf-8") as f:
+                f.write("def scrape_google(query):\n    return []\n")
+            queries = os.path.join(tmp, "queries.txt")
+            with open(queries, "w", encoding="utf-8") as f:
+                f.write("alpha\nbeta\n")
+            trace, metrics = os.path.join(tmp, "trace.jsonl"), os.path.join(tmp, "scraper.prom")
+
+            with contextlib.redirect_stderr(io.StringIO()) as err:
+                main(["--batch", queries, "--scraper", f"{scraper}:scrape_google", "--no-cache",
+                      "--output", os.path.join(tmp, "out"), "--trace", trace, "--metrics", metrics])
+
+            with open(trace, encoding="utf-8") as f:
+                spans = [json.loads(line) for line in f]
+            self.assertEqual(sorted(s["query"] for s in spans if s["name"] == "query"), ["alpha", "beta"])
+            self.assertEqual(sum(s["name"] == "write" for s in spans), 2)
+            with open(metrics, encoding="utf-8") as f:
+                self.assertIn('scraper_phase_seconds_count{phase="query"} 2', f.read())
+            self.assertIn("query: 2x, p50", err.getvalue())
+
+
+class TestSingleCli(unittest.TestCase):
+
+    def test_no_backend_available_is_reported_not_raised(self):
+        with mock.patch.dict(os.environ, {"SERPAPI_API_KEY": ""}), \
+                contextlib.redirect_stderr(io.StringIO()) as err, \
+                contextlib.redirect_stdout(io.StringIO()):
+            with self.assertRaises(SystemExit) as exit:
+                main(["--query", "python", "--backend", "serpapi", "--no-cache"])
+        self.assertEqual(exit.exception.code, 1)
+        self.assertIn("[ERROR] no backend could answer", err.getvalue())
+
+
+class FakeEngine:
+    def stats(self):
+        return {"contexts_opened": 1}
+
+
+class TestBrowserSummary(unittest.TestCase):
+
+    def setUp(self):
+        saved = extract.BLOCK_CHAIN
+        self.addCleanup(setattr, extract, "BLOCK_CHAIN", saved)
+        extract.BLOCK_CHAIN = SelectorChain("block", extract.RESULT_BLOCK_SELECTORS)
+
+    def test_summary_with_browser_calls_and_selector_yields(self):
+        selenium = SeleniumBackend()
+        playwright = PlaywrightBackend(engine=FakeEngine())
+        router = BackendRouter([selenium, playwright])
+        for backend in (selenium, playwright):
+            router.stats[backend.name].calls = 1
+            backend.waits.add("navigate", 0.5)
+        chain = extract.BLOCK_CHAIN
+        chain.record({chain.selectors[-1]: 1})
+
+        out = io.StringIO()
+        print_browser_summary(router, file=out)
+
+        self.assertIn("selenium navigate: 1x", out.getvalue())
+        self.assertIn("playwright engine: {'contexts_opened': 1}", out.getvalue())
+        self.assertIn(f"block selectors by hits: {chain.selectors[-1]} 1", out.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
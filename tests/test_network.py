@@ -0,0 +1,57 @@
+import json
+import unittest
+
+from src.network import DEFAULT_BLOCKED_PATTERNS, NetworkMeter, enable_blocking, parse_performance_log
+
+
+def log_entry(method, **params):
+    return {"message": json.dumps({"message": {"method": method, "params": params}})}
+
+
+class FakeDriver:
+    def __init__(self, entries=None):
+        self.cdp = []
+        self.entries = entries or []
+
+    def execute_cdp_cmd(self, cmd, params):
+        self.cdp.append((cmd, params))
+
+    def get_log(self, kind):
+        entries, self.entries = self.entries, []
+        return entries
+
+
+class TestNetwork(unittest.TestCase):
+
+    def test_enable_blocking_sends_cdp_commands(self):
+        driver = FakeDriver()
+        patterns = enable_blocking(driver)
+        self.assertEqual(driver.cdp[0], ("Network.enable", {}))
+        self.assertEqual(driver.cdp[1], ("Network.setBlockedURLs", {"urls": DEFAULT_BLOCKED_PATTERNS}))
+        self.assertIn("*.woff2", patterns)
+
+    def test_parse_performance_log(self):
+        entries = [
+            log_entry("Network.loadingFinished", requestId="1", encodedDataLength=1200),
+            log_entry("Network.loadingFinished", requestId="2", encodedDataLength=800),
+            log_entry("Network.loadingFailed", requestId="3", blockedReason="inspector"),
+            log_entry("Network.loadingFailed", requestId="4", errorText="net::ERR_ABORTED"),
+            log_entry("Network.requestWillBeSent", requestId="5"),
+            {"message": "not json"},
+        ]
+        self.assertEqual(parse_performance_log(entries),
+                         {"bytes": 2000, "requests": 2, "blocked": 1, "failed": 1})
+
+    def test_meter_accumulates_per_query(self):
+        meter = NetworkMeter()
+        driver = FakeDriver([log_entry("Network.loadingFinished", encodedDataLength=5000)])
+        self.assertEqual(meter.collect(driver)["bytes"], 5000)
+        driver.entries = [log_entry("Network.loadingFinished", encodedDataLength=3000)]
+        meter.collect(driver)
+        summary = meter.summary()
+        self.assertEqual(summary["queries"], 2)
+        self.assertEqual(summary["kb_per_query"], 4.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
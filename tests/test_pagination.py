@@ -0,0 +1,126 @@
+import json
+import unittest
+from urllib.parse import parse_qs, urlsplit
+
+from src.backends import SeleniumBackend
+from src.pagination import fetch_pages_in_tabs
+from src.waits import READY_SCRIPT
+
+
+class TabbedDriver:
+    """Fake session where each tab holds one SERP page."""
+
+    def __init__(self, total_results=50, slow=(), broken=()):
+        self.total = total_results
+        self.slow = dict.fromkeys(slow, 3)  # start offset -> readiness checks before ready
+        self.broken = set(broken)
+        self.extracted = []
+        self.urls = []
+        self.tabs = {"home": None}
+        self.current = "home"
+        self.opened = 0
+        self.max_open = 1
+        self.switch_to = self
+
+    @property
+    def window_handles(self):
+        return list(self.tabs)
+
+    @property
+    def current_window_handle(self):
+        return self.current
+
+    def window(self, handle):
+        self.current = handle
+
+    def start(self):
+        return int(parse_qs(urlsplit(self.tabs[self.current]).query)["start"][0])
+
+    def execute_script(self, script, *args):
+        if "window.open" in script:
+            self.opened += 1
+            self.tabs[f"tab{self.opened}"] = args[0]
+            self.urls.append(args[0])
+            self.max_open = max(self.max_open, len(self.tabs))
+            return None
+        start = self.start()
+        if self.slow.get(start):
+            self.slow[start] -= 1
+            return False
+        return True
+
+    def close(self):
+        del self.tabs[self.current]
+
+    def set_script_timeout(self, seconds):
+        pass
+
+    def execute_async_script(self, script, *args):
+        if script == READY_SCRIPT:
+            return {"ok": True}
+        start = self.start()
+        if start in self.broken:
+            raise RuntimeError("renderer crashed")
+        self.extracted.append(start)
+        rows = [{"title": f"R{i}", "link": f"https://example.com/{i}", "snippet": ""}
+                for i in range(start, min(start + 10, self.total))]
+        return json.dumps({"rows": rows})
+
+
+class TestFetchPagesInTabs(unittest.TestCase):
+
+    def test_fetches_all_pages_with_bounded_tabs(self):
+        driver = TabbedDriver()
+
+        rows = fetch_pages_in_tabs(driver, "python", pages=5, max_tabs=2)
+
+        self.assertEqual(len(rows), 50)
+        self.assertEqual(rows[0]["title"], "R0")
+        self.assertEqual(rows[-1]["position"], 50)
+        self.assertEqual(rows[-1]["page"], 5)
+        self.assertLessEqual(driver.max_open, 3)  # home + 2 tabs
+        self.assertEqual(driver.window_handles, ["home"])
+        self.assertEqual(driver.current, "home")
+
+    def test_empty_page_stops_pagination(self):
+        driver = TabbedDriver(total_results=15)
+
+        rows = fetch_pages_in_tabs(driver, "python", pages=10, max_tabs=1)
+
+        self.assertEqual(len(rows), 15)
+        self.assertEqual(driver.opened, 3)
+
+    def test_tabs_are_drained_as_they_become_ready(self):
+        driver = TabbedDriver(slow=[0])
+
+        rows = fetch_pages_in_tabs(driver, "python", pages=3, max_tabs=3, poll=0)
+
+        self.assertEqual(driver.extracted, [10, 20, 0])
+        self.assertEqual([r["title"] for r in rows[:2]], ["R0", "R1"])
+        self.assertEqual(rows[-1]["page"], 3)
+
+    def test_failing_tab_is_closed(self):
+        driver = TabbedDriver(broken=[10])
+
+        with self.assertRaises(RuntimeError):
+            fetch_pages_in_tabs(driver, "python", pages=3, max_tabs=2, poll=0)
+
+        self.assertEqual(driver.window_handles, ["home"])
+        self.assertEqual(driver.current, "home")
+
+    def test_selenium_backend_pages_in_tabs(self):
+        driver = TabbedDriver()
+        backend = SeleniumBackend(tabs=2, search_url="http://127.0.0.1:8000/search")
+        backend.driver = driver
+
+        rows = backend.fetch("python", num=25, start=10)
+
+        self.assertEqual(len(rows), 25)
+        self.assertEqual(rows[0]["title"], "R10")
+        self.assertEqual(rows[0]["position"], 11)
+        self.assertEqual(len(driver.urls), 3)
+        self.assertTrue(all(url.startswith("http://127.0.0.1:8000/search?") for url in driver.urls))
+
+
+if __name__ == "__main__":
+    unittest.main()
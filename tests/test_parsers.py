@@ -0,0 +1,51 @@
+import os
+import unittest
+
+from src.parsers import PARSERS, available_parsers, get_parser, resolve_href
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "serp", "python_programming.html")
+
+
+def load_fixture():
+    with open(FIXTURE, encoding="utf-8") as f:
+        return f.read()
+
+
+class TestParsers(unittest.TestCase):
+
+    def test_stdlib_parser(self):
+        rows = get_parser("stdlib")(load_fixture())
+
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(rows[0]["title"], "Welcome to Python.org")
+        self.assertEqual(rows[0]["link"], "https://www.python.org/")
+        self.assertEqual(rows[0]["snippet"], "The official home of the Python Programming Language.")
+        self.assertEqual(rows[3]["link"], "https://docs.python.org/3/tutorial/")
+        self.assertTrue(rows[4]["snippet"].startswith("Offered by"))
+        self.assertEqual([r["position"] for r in rows], [1, 2, 3, 4, 5])
+
+    def test_limit(self):
+        self.assertEqual(len(get_parser("stdlib")(load_fixture(), limit=2)), 2)
+
+    def test_installed_engines_agree(self):
+        html = load_fixture()
+        expected = get_parser("stdlib")(html)
+        for name in available_parsers():
+            with self.subTest(engine=name):
+                self.assertEqual(get_parser(name)(html), expected)
+
+    def test_unknown_or_missing_engine(self):
+        with self.assertRaises(ValueError):
+            get_parser("html5lib")
+        for name, (_, module) in PARSERS.items():
+            if name not in available_parsers():
+                with self.assertRaises(ImportError):
+                    get_parser(name)
+
+    def test_resolve_href(self):
+        self.assertEqual(resolve_href("/url?q=https://a.com/x&sa=U"), "https://a.com/x")
+        self.assertEqual(resolve_href("/search?q=more"), "")
+
+
+if __name__ == "__main__":
+    unittest.main()
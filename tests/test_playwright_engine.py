@@ -0,0 +1,118 @@
+import asyncio
+import json
+import threading
+import unittest
+
+from src.backends import PlaywrightBackend
+from src.playwright_engine import EXTRACT_FUNCTION, PlaywrightEngine
+from src.waits import WaitRecorder
+
+
+class FakePage:
+
+    def __init__(self, browser):
+        self.browser = browser
+        self.url = None
+
+    async def goto(self, url, wait_until=None, timeout=None):
+        self.url = url
+        await asyncio.sleep(0.01)
+
+    async def evaluate(self, function, args):
+        if function == EXTRACT_FUNCTION:
+            rows = [{"title": "Python", "link": "https://www.python.org/", "snippet": self.url}]
+            return json.dumps({"rows": rows, "yield": {"blocks": {"div.g": 1}, "snippets": {}}})
+        return {"ok": True}
+
+
+class FakeContext:
+
+    def __init__(self, browser):
+        self.browser = browser
+
+    async def new_page(self):
+        return FakePage(self.browser)
+
+    async def close(self):
+        self.browser.open -= 1
+
+
+class FakeBrowser:
+
+    def __init__(self):
+        self.open = 0
+        self.peak = 0
+        self.contexts = 0
+
+    async def new_context(self, **kwargs):
+        self.open += 1
+        self.contexts += 1
+        self.peak = max(self.peak, self.open)
+        return FakeContext(self)
+
+    async def close(self):
+        pass
+
+
+class FakeEngine(PlaywrightEngine):
+    """Engine whose browsers are in-memory fakes, so no Chromium is needed."""
+
+    async def _start(self):
+        self._browsers = [FakeBrowser() for _ in range(self.processes)]
+        self._active = [0] * self.processes
+        self._slots = asyncio.Semaphore(self.capacity)
+
+
+class TestPlaywrightEngine(unittest.TestCase):
+
+    def test_concurrent_fetches_share_processes_within_capacity(self):
+        engine = FakeEngine(processes=2, contexts_per_process=3)
+        recorder = WaitRecorder()
+        results = []
+        with engine:
+            browsers = list(engine._browsers)
+            threads = [
+                threading.Thread(target=lambda i=i: results.append(
+                    engine.fetch(f"http://serp/search?q={i}", recorder=recorder)))
+                for i in range(12)
+            ]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            stats = engine.stats()
+
+        self.assertEqual(len(results), 12)
+        self.assertEqual(results[0][0]["position"], 1)
+        self.assertEqual(stats["contexts_opened"], 12)
+        self.assertLessEqual(stats["peak_in_flight"], 6)
+        self.assertTrue(all(b.peak <= 3 and b.contexts > 0 and b.open == 0 for b in browsers))
+        self.assertEqual(recorder.summary()["navigate"]["count"], 12)
+
+    def test_close_is_idempotent_and_validates_sizes(self):
+        engine = FakeEngine().start()
+        engine.close()
+        engine.close()
+        with self.assertRaises(ValueError):
+            PlaywrightEngine(contexts_per_process=0)
+
+
+class TestPlaywrightBackend(unittest.TestCase):
+
+    def test_fetch_offsets_positions_and_keeps_shared_engine_open(self):
+        engine = FakeEngine()
+        backend = PlaywrightBackend(engine=engine, search_url="http://127.0.0.1:1/search")
+        backend.available = lambda: True  # the fake engine needs no playwright package
+        try:
+            rows = backend.fetch("python", start=10)
+        finally:
+            backend.close()
+        self.assertEqual(rows[0]["position"], 11)
+        self.assertEqual((rows[0]["query"], rows[0]["backend"]), ("python", "playwright"))
+        self.assertIn("http://127.0.0.1:1/search?q=python", rows[0]["snippet"])
+        self.assertIsNotNone(engine._loop)
+        engine.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
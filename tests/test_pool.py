@@ -0,0 +1,99 @@
+import threading
+import unittest
+
+from src.pool import DriverPool
+
+
+class FakeDriver:
+    def __init__(self):
+        self.alive = True
+        self.quit_called = False
+
+    def execute_script(self, script):
+        if not self.alive:
+            raise RuntimeError("session deleted")
+        return 1
+
+    def quit(self):
+        self.quit_called = True
+
+
+class TestDriverPool(unittest.TestCase):
+
+    def setUp(self):
+        self.made = []
+
+        def factory():
+            driver = FakeDriver()
+            self.made.append(driver)
+            return driver
+
+        self.factory = factory
+
+    def test_reuses_warm_session(self):
+        pool = DriverPool(size=1, factory=self.factory)
+        with pool.lease() as first:
+            pass
+        with pool.lease() as second:
+            pass
+        self.assertIs(first, second)
+        self.assertEqual(len(self.made), 1)
+        self.assertEqual(pool.stats()["leases"], 2)
+
+    def test_recycles_after_max_pages(self):
+        pool = DriverPool(size=1, factory=self.factory, max_pages=2)
+        for _ in range(3):
+            with pool.lease():
+                pass
+        self.assertEqual(len(self.made), 2)
+        self.assertTrue(self.made[0].quit_called)
+        self.assertEqual(pool.stats()["recycled"]["pages"], 1)
+
+    def test_replaces_unhealthy_session(self):
+        pool = DriverPool(size=1, factory=self.factory)
+        with pool.lease() as driver:
+            pass
+        driver.alive = False
+        with pool.lease() as replacement:
+            self.assertIsNot(replacement, driver)
+        self.assertEqual(pool.stats()["recycled"]["unhealthy"], 1)
+
+    def test_never_exceeds_size(self):
+        pool = DriverPool(size=2, factory=self.factory)
+        in_use = []
+        peak = []
+        lock = threading.Lock()
+
+        def work():
+            with pool.lease() as driver:
+                with lock:
+                    in_use.append(driver)
+                    peak.append(len(in_use))
+                with lock:
+                    in_use.remove(driver)
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertLessEqual(max(peak), 2)
+        self.assertLessEqual(len(self.made), 2)
+
+    def test_lease_times_out_when_exhausted(self):
+        pool = DriverPool(size=1, factory=self.factory)
+        with pool.lease():
+            with self.assertRaises(TimeoutError):
+                with pool.lease(timeout=0.05):
+                    pass
+
+    def test_close_quits_idle_sessions(self):
+        pool = DriverPool(size=2, factory=self.factory)
+        pool.warm()
+        pool.close()
+        self.assertTrue(all(d.quit_called for d in self.made))
+        self.assertEqual(pool.stats()["alive"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
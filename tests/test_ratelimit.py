@@ -0,0 +1,101 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+from src.backends import QuotaExhausted, SearchBackend
+from src.ratelimit import Limit, QuotaLedger, RateScheduler, TokenBucket, parse_limit
+
+
+class TestTokenBucket(unittest.TestCase):
+
+    def test_burst_then_exact_spacing_across_threads(self):
+        bucket = TokenBucket(rate=100, burst=5)
+        t0 = time.monotonic()
+        threads = [threading.Thread(target=lambda: [bucket.acquire() for _ in range(5)]) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.monotonic() - t0
+        # 20 calls: 5 from the burst, 15 more at 100/s.
+        self.assertGreaterEqual(elapsed, 0.14)
+        self.assertLess(elapsed, 0.5)
+
+    def test_max_wait_refunds(self):
+        bucket = TokenBucket(rate=1, burst=1)
+        bucket.acquire()
+        with self.assertRaises(TimeoutError):
+            bucket.acquire(max_wait=0.01)
+        self.assertLess(bucket.reserve(), 1.1)
+
+
+class TestParseLimit(unittest.TestCase):
+
+    def test_specs(self):
+        self.assertEqual(parse_limit("2").rate, 2)
+        self.assertEqual(parse_limit("30/min").rate, 0.5)
+        limit = parse_limit("1000/day:20")
+        self.assertAlmostEqual(limit.rate, 1000 / 86400)
+        self.assertEqual(limit.burst, 20)
+        with self.assertRaises(ValueError):
+            parse_limit("fast")
+        with self.assertRaises(ValueError):
+            parse_limit("3/fortnight")
+
+
+class TestQuotaLedger(unittest.TestCase):
+
+    def test_daily_limit_survives_restart_and_resets_next_day(self):
+        day = ["2024-05-01"]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "quota.sqlite")
+            ledger = QuotaLedger(path, today=lambda: day[0])
+            self.assertEqual(ledger.consume("serpapi", limit=2), 1)
+            ledger.close()
+
+            ledger = QuotaLedger(path, today=lambda: day[0])
+            ledger.consume("serpapi", limit=2)
+            with self.assertRaises(QuotaExhausted):
+                ledger.consume("serpapi", limit=2)
+            self.assertEqual(ledger.usage(), {"serpapi": 2})
+            day[0] = "2024-05-02"
+            self.assertEqual(ledger.consume("serpapi", limit=2), 1)
+            ledger.close()
+
+
+class TestRateScheduler(unittest.TestCase):
+
+    def test_resolves_urls_to_host_keys(self):
+        scheduler = RateScheduler({"monday.com": Limit(rate=10), "serpapi": Limit(rate=1)})
+        self.assertEqual(scheduler.resolve("https://api.monday.com/v2"), "monday.com")
+        self.assertEqual(scheduler.resolve("SerpAPI"), "serpapi")
+        self.assertEqual(scheduler.resolve("https://example.org/x"), "example.org")
+        self.assertEqual(scheduler.acquire("https://example.org/x"), 0.0)
+
+    def test_daily_quota_is_checked_before_waiting(self):
+        scheduler = RateScheduler({"serpapi": Limit(rate=1000, burst=2, daily=3)})
+        for _ in range(3):
+            scheduler.acquire("serpapi")
+        with self.assertRaises(QuotaExhausted):
+            scheduler.acquire("serpapi")
+        self.assertEqual(scheduler.remaining("serpapi"), 0)
+        self.assertEqual(scheduler.stats()["serpapi"]["calls"], 3)
+
+    def test_backend_paced_and_unavailable_when_quota_used(self):
+        class Echo(SearchBackend):
+            name = "echo"
+
+            def _fetch(self, query, num, hl, gl, start):
+                return [{"position": 1, "title": query, "link": "https://x/", "snippet": ""}]
+
+        backend = Echo()
+        backend.scheduler = RateScheduler({"echo": Limit(daily=1)})
+        self.assertTrue(backend.available())
+        backend.fetch("a")
+        self.assertFalse(backend.available())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import os
+import tempfile
+import unittest
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+from src.parsers import get_parser
+from src.replay import ReplayServer, load_corpus, replay, save_page, score, slugify
+
+CORPUS = os.path.join(os.path.dirname(__file__), "fixtures", "serp")
+
+
+class TestCorpus(unittest.TestCase):
+
+    def test_fixture_corpus_has_metadata(self):
+        pages = load_corpus(CORPUS)
+        self.assertEqual([p.name for p in pages], ["python_programming"])
+        self.assertEqual(pages[0].query, "python programming")
+        self.assertEqual(len(pages[0].expected), 5)
+
+    def test_save_and_load_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            save_page(tmp, "Top universities in India", "<html></html>", start=10, results=[], hl="en")
+            page, = load_corpus(tmp)
+        self.assertEqual(page.name, "top_universities_in_india_start10")
+        self.assertEqual((page.query, page.start, page.expected, page.meta["hl"]),
+                         ("Top universities in India", 10, [], "en"))
+        self.assertEqual(slugify("C++ / Rust?"), "c_rust")
+
+    def test_replay_scores_extractor(self):
+        pages = load_corpus(CORPUS)
+        report = replay(get_parser("stdlib"), pages, repeat=2)
+        self.assertEqual((report["precision"], report["recall"], report["results"]), (1.0, 1.0, 5))
+        self.assertGreater(report["pages_per_sec"], 0)
+
+        half = replay(lambda html: get_parser("stdlib")(html, limit=2), pages)
+        self.assertEqual(half["recall"], 0.4)
+
+    def test_score(self):
+        expected = [{"link": "https://a.com/"}, {"link": "https://b.com/"}]
+        self.assertEqual(score([{"link": "http://www.a.com"}, {"link": "https://c.com/"}], expected),
+                         {"precision": 0.5, "recall": 0.5})
+        self.assertEqual(score([], []), {"precision": 1.0, "recall": 1.0})
+
+
+class TestReplayServer(unittest.TestCase):
+
+    def test_serves_recorded_pages(self):
+        with ReplayServer(CORPUS) as server:
+            with urlopen(f"{server.search_url}?q=Python+Programming&hl=en") as resp:
+                html = resp.read().decode("utf-8")
+            with urlopen(f"{server.base_url}/pages/python_programming.html") as resp:
+                self.assertEqual(resp.read().decode("utf-8"), html)
+            with self.assertRaises(HTTPError) as ctx:
+                urlopen(f"{server.search_url}?q=python+programming&start=10")
+            self.assertEqual(ctx.exception.code, 404)
+        self.assertEqual(len(get_parser("stdlib")(html)), 5)
+        self.assertEqual(server.requests, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,179 @@
+import random
+import unittest
+
+from src.backends import BackendError, CircuitOpen, RequestRejected, SearchBackend, _request_error
+from src.helpers import make_result
+from src.resilience import CircuitBreaker, RetryBudget, RetryPolicy
+from src.router import BackendRouter
+
+
+class Flaky:
+    def __init__(self, failures, error=BackendError):
+        self.failures = failures
+        self.error = error
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise self.error("boom")
+        return "ok"
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeBackend(SearchBackend):
+    def __init__(self, name, latency, down=False):
+        super().__init__()
+        self.name = name
+        self.expected_latency = latency
+        self.down = down
+        self.calls = 0
+
+    def _fetch(self, query, num, hl, gl, start):
+        self.calls += 1
+        if self.down:
+            raise BackendError("503")
+        return [make_result(1, query, "https://example.com/")]
+
+
+def policy(**kwargs):
+    sleeps = []
+    kwargs.setdefault("rng", random.Random(1))
+    return RetryPolicy(sleep=sleeps.append, **kwargs), sleeps
+
+
+class TestRetryPolicy(unittest.TestCase):
+
+    def test_retries_with_capped_jittered_backoff(self):
+        retry, sleeps = policy(attempts=5, base=1, cap=3)
+        self.assertEqual(retry.call(Flaky(4)), "ok")
+        self.assertEqual(len(sleeps), 4)
+        for n, delay in enumerate(sleeps, 1):
+            self.assertLessEqual(delay, min(3, 2 ** (n - 1)))
+        self.assertEqual(retry.stats()["recovered"], 1)
+
+    def test_gives_up_after_attempts_and_on_rejected_requests(self):
+        retry, sleeps = policy(attempts=3)
+        fn = Flaky(10)
+        with self.assertRaises(BackendError):
+            retry.call(fn)
+        self.assertEqual(fn.calls, 3)
+
+        fn = Flaky(10, error=RequestRejected)
+        with self.assertRaises(RequestRejected):
+            retry.call(fn)
+        self.assertEqual(fn.calls, 1)
+
+    def test_budget_limits_retries_to_a_share_of_calls(self):
+        retry, sleeps = policy(attempts=3, budget=RetryBudget(ratio=0.1, reserve=2))
+        for _ in range(5):
+            with self.assertRaises(BackendError):
+                retry.call(Flaky(10))
+        self.assertEqual(retry.stats()["retries"], 2)
+        self.assertEqual(retry.stats()["budget_denied"], 4)
+
+    def test_http_client_errors_are_rejected(self):
+        class Response:
+            status_code = 401
+
+        error = Exception("unauthorized")
+        error.response = Response()
+        self.assertIsInstance(_request_error("serpapi", error), RequestRejected)
+        Response.status_code = 429
+        self.assertNotIsInstance(_request_error("serpapi", error), RequestRejected)
+
+
+class TestCircuitBreaker(unittest.TestCase):
+
+    def test_opens_fails_fast_and_recovers_through_one_probe(self):
+        clock = Clock()
+        breaker = CircuitBreaker("api", failures=2, reset_timeout=10, clock=clock)
+        fn = Flaky(3)
+        for _ in range(2):
+            with self.assertRaises(BackendError):
+                breaker.call(fn)
+        self.assertEqual(breaker.state, "open")
+        with self.assertRaises(CircuitOpen):
+            breaker.call(fn)
+        self.assertEqual(fn.calls, 2)
+
+        clock.now = 10
+        self.assertEqual(breaker.state, "half_open")
+        with self.assertRaises(BackendError):
+            breaker.call(fn)
+        self.assertEqual(breaker.state, "open")
+
+        clock.now = 20
+        breaker.before()
+        self.assertFalse(breaker.allows())  # the probe is in flight
+        breaker.success()
+        self.assertEqual(breaker.state, "closed")
+        self.assertEqual(breaker.stats()["opened"], 2)
+
+    def test_rejected_requests_do_not_open_the_circuit(self):
+        breaker = CircuitBreaker("api", failures=2)
+        for _ in range(3):
+            with self.assertRaises(RequestRejected):
+                breaker.call(Flaky(1, error=RequestRejected))
+        self.assertEqual(breaker.state, "closed")
+
+    def test_rejected_probe_frees_the_half_open_slot(self):
+        clock = Clock()
+        breaker = CircuitBreaker("api", failures=1, reset_timeout=10, clock=clock)
+        with self.assertRaises(BackendError):
+            breaker.call(Flaky(1))
+        clock.now = 10
+        with self.assertRaises(RequestRejected):
+            breaker.call(Flaky(1, error=RequestRejected))
+        self.assertTrue(breaker.allows())
+
+
+class TestRouterResilience(unittest.TestCase):
+
+    def test_down_backend_is_taken_out_of_rotation(self):
+        down = FakeBackend("fast", latency=0.1, down=True)
+        spare = FakeBackend("slow", latency=2.0)
+        router = BackendRouter([down, spare])
+        retry, sleeps = policy(attempts=2)
+        router.attach_resilience(retry, failures=2, reset_timeout=60)
+
+        for i in range(5):
+            rows = router.search(f"q{i}")
+            self.assertEqual(rows[0]["backend"], "slow")
+
+        # Two attempts on the first query open the circuit; later queries skip it.
+        self.assertEqual(down.calls, 2)
+        self.assertEqual(spare.calls, 5)
+        self.assertEqual(len(sleeps), 1)
+        report = {s["backend"]: s for s in router.report()}
+        self.assertEqual(report["fast"]["circuit"], "open")
+        with self.assertRaises(CircuitOpen):
+            down.fetch("direct")
+
+    def test_backend_rejecting_bad_requests_stays_in_rotation(self):
+        class Rejecting(FakeBackend):
+            def _fetch(self, query, num, hl, gl, start):
+                self.calls += 1
+                raise RequestRejected("400 bad request")
+
+        backend = Rejecting("api", latency=0.1)
+        router = BackendRouter([backend])
+        retry, sleeps = policy(attempts=3)
+        router.attach_resilience(retry, failures=2)
+        for i in range(4):
+            with self.assertRaises(BackendError):
+                router.search(f"q{i}")
+        self.assertEqual(backend.calls, 4)
+        self.assertEqual(sleeps, [])
+        self.assertEqual(backend.breaker.state, "closed")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+
+from src.backends import BackendError, SearchBackend
+from src.helpers import make_result
+from src.router import BackendRouter
+
+
+class FakeBackend(SearchBackend):
+    def __init__(self, name, latency, cost=0.0, quota=None, fail=False):
+        super().__init__(quota=quota)
+        self.name = name
+        self.expected_latency = latency
+        self.cost_per_request = cost
+        self.fail = fail
+        self.calls = 0
+
+    def _fetch(self, query, num, hl, gl, start):
+        self.calls += 1
+        if self.fail:
+            raise BackendError("down")
+        return [make_result(i, f"{query} {i}", f"https://example.com/{i}") for i in range(1, num + 1)]
+
+
+class TestRouter(unittest.TestCase):
+
+    def test_prefers_fast_api_over_slow_browser(self):
+        browser = FakeBackend("selenium", latency=5.0)
+        api = FakeBackend("api", latency=0.3, cost=0.005)
+        router = BackendRouter([browser, api], usd_per_second=0.01)
+
+        rows = router.search("python", num=10)
+
+        self.assertEqual(api.calls, 1)
+        self.assertEqual(browser.calls, 0)
+        self.assertEqual(rows[0]["backend"], "api")
+        self.assertEqual(rows[0]["query"], "python")
+
+    def test_expensive_backend_loses_when_time_is_cheap(self):
+        browser = FakeBackend("selenium", latency=5.0)
+        api = FakeBackend("api", latency=0.3, cost=0.05)
+        router = BackendRouter([browser, api], usd_per_second=0.001)
+
+        self.assertEqual(router.rank()[0].name, "selenium")
+
+    def test_skips_exhausted_quota_and_counts_down(self):
+        api = FakeBackend("api", latency=0.3, quota=1)
+        browser = FakeBackend("selenium", latency=5.0)
+        router = BackendRouter([api, browser])
+
+        router.search("a")
+        router.search("b")
+
+        self.assertEqual(api.quota, 0)
+        self.assertEqual(api.calls, 1)
+        self.assertEqual(browser.calls, 1)
+
+    def test_falls_back_when_backend_fails(self):
+        broken = FakeBackend("api", latency=0.1, fail=True)
+        browser = FakeBackend("selenium", latency=5.0)
+        router = BackendRouter([broken, browser])
+
+        rows = router.search("python", num=3)
+
+        self.assertEqual(len(rows), 3)
+        report = {s["backend"]: s for s in router.report()}
+        self.assertEqual(report["api"]["failures"], 1)
+        self.assertEqual(report["selenium"]["calls"], 1)
+
+    def test_raises_when_nothing_answers(self):
+        router = BackendRouter([FakeBackend("api", latency=0.1, fail=True)])
+        with self.assertRaises(BackendError):
+            router.search("python")
+
+
+if __name__ == "__main__":
+    unittest.main()
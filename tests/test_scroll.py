@@ -0,0 +1,61 @@
+import json
+import unittest
+
+from src.scroll import iter_scroll_results
+
+
+class ScrollingDriver:
+    """Serves ``batches`` of new results, one batch per scroll step."""
+
+    def __init__(self, batches):
+        self.batches = list(batches)
+        self.steps = 0
+
+    def set_script_timeout(self, seconds):
+        pass
+
+    def execute_async_script(self, script, scroll, limit, *args):
+        self.steps += 1
+        rows = self.batches.pop(0)[:limit] if self.batches else []
+        return json.dumps({"rows": rows, "grew": bool(rows), "height": 1000 * self.steps})
+
+
+def batch(start, n):
+    return [{"title": f"T{i}", "link": f"https://example.com/{i}", "snippet": ""} for i in range(start, start + n)]
+
+
+class TestIterScrollResults(unittest.TestCase):
+
+    def test_stops_scrolling_once_limit_is_reached(self):
+        driver = ScrollingDriver([batch(0, 10), batch(10, 10), batch(20, 10), batch(30, 10)])
+
+        rows = list(iter_scroll_results(driver, limit=15))
+
+        self.assertEqual(len(rows), 15)
+        self.assertEqual(driver.steps, 2)
+        self.assertEqual([r["position"] for r in rows], list(range(1, 16)))
+
+    def test_stops_when_page_stops_growing(self):
+        driver = ScrollingDriver([batch(0, 10), batch(10, 5)])
+        stats = {}
+
+        rows = list(iter_scroll_results(driver, limit=100, stats=stats))
+
+        self.assertEqual(len(rows), 15)
+        self.assertEqual(stats["stopped"], "exhausted")
+        self.assertEqual(driver.steps, 3)
+
+    def test_yields_before_scrolling(self):
+        driver = ScrollingDriver([batch(0, 10), batch(10, 10)])
+        first = next(iter_scroll_results(driver, limit=100))
+        self.assertEqual(first["title"], "T0")
+        self.assertEqual(driver.steps, 1)
+
+    def test_duplicates_are_dropped(self):
+        driver = ScrollingDriver([batch(0, 3), batch(2, 3)])
+        rows = list(iter_scroll_results(driver, limit=100, max_scrolls=1))
+        self.assertEqual([r["title"] for r in rows], ["T0", "T1", "T2", "T3", "T4"])
+
+
+if __name__ == "__main__":
+    unittest.main()
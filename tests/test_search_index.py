@@ -0,0 +1,70 @@
+import json
+import os
+import tempfile
+import unittest
+
+from src.search_index import SearchIndex, fts_query
+
+
+def rows(query, *pairs):
+    return [{"query": query, "position": i, "title": title, "link": link, "snippet": ""}
+            for i, (title, link) in enumerate(pairs, 1)]
+
+
+class TestSearchIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.index = SearchIndex(os.path.join(self.tmp.name, "results.sqlite"))
+        self.addCleanup(self.index.close)
+
+    def test_fts_query_escapes_syntax(self):
+        self.assertEqual(fts_query('C++ "AND" python.org'), '"c"* "and"* "python"* "org"*')
+        self.assertEqual(fts_query("***"), "")
+
+    def test_search_returns_query_and_timestamp(self):
+        self.index.add(rows("python", ("Welcome to Python.org", "https://www.python.org/")), fetched=0)
+        self.index.add(rows("java", ("Java Downloads", "https://java.com/")), fetched=0)
+        hits = self.index.search("welcome pyth")
+        self.assertEqual(len(hits), 1)
+        self.assertEqual(hits[0]["query"], "python")
+        self.assertEqual(hits[0]["fetched"], "1970-01-01T00:00:00+00:00")
+        self.assertEqual(self.index.search("java", domain="python.org"), [])
+
+    def test_queries_for_domain_includes_subdomains(self):
+        self.index.add(rows("python", ("Python", "https://www.python.org/"), ("Docs", "https://docs.python.org/3/")))
+        self.index.add(rows("tutorial", ("Tutorial", "https://docs.python.org/3/tutorial/")))
+        self.index.add(rows("pythonic", ("Other", "https://notpython.org/")))
+        found = self.index.queries_for_domain("python.org")
+        self.assertEqual([(r["query"], r["hits"], r["best_position"]) for r in found],
+                         [("python", 2, 1), ("tutorial", 1, 1)])
+
+    def test_ingest_is_incremental(self):
+        folder = os.path.join(self.tmp.name, "results")
+        os.makedirs(folder)
+        path = os.path.join(folder, "nit_placements_results.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump([{"title": "NIT Placements", "link": "https://nit.ac.in/", "snippet": "highest package"}], f)
+        self.assertEqual(self.index.ingest([folder])["rows"], 1)
+        self.assertEqual(self.index.ingest([folder])["rows"], 0)
+        self.assertEqual(self.index.search("package")[0]["query"], "nit placements")
+        self.assertEqual(self.index.stats()["files"], 1)
+
+    def test_reingesting_an_appended_file_replaces_its_rows(self):
+        path = os.path.join(self.tmp.name, "batch.ndjson")
+        first = rows("python", ("Python", "https://www.python.org/"), ("Wiki", "https://en.wikipedia.org/"))
+        with open(path, "w", encoding="utf-8") as f:
+            f.writelines(json.dumps(row) + "\n" for row in first[:1])
+        self.index.ingest([path])
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(first[1]) + "\n")
+        os.utime(path, (1, 1))
+        self.assertEqual(self.index.ingest([path])["rows"], 2)
+        self.assertEqual(self.index.stats()["rows"], 2)
+        self.assertEqual(self.index.queries_for_domain("python.org")[0]["hits"], 1)
+        self.assertEqual(len(self.index.search("python")), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
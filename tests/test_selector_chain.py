@@ -0,0 +1,90 @@
+import json
+import unittest
+
+from src import extract
+from src.selector_chain import SelectorChain
+
+
+class FakeElement:
+    """Answers find_elements from a {selector: [elements]} map and counts lookups."""
+
+    def __init__(self, matches):
+        self.matches = matches
+        self.lookups = 0
+
+    def find_elements(self, by, selector):
+        self.lookups += 1
+        return self.matches.get(selector, [])
+
+
+class TestSelectorChain(unittest.TestCase):
+
+    def test_reorders_by_hits(self):
+        chain = SelectorChain("snippet", ["a", "b", "c"])
+        self.assertEqual(chain.combined, "a, b, c")
+        chain.record({"c": 3, "b": 1}, evaluations=5)
+        self.assertEqual(chain.ordered(), ["c", "b", "a"])
+        self.assertEqual(chain.misses(), 1)
+        yields = chain.yields()
+        self.assertEqual(yields["c"], {"hits": 3, "hit_rate": 0.6, "share": 0.75, "rank": 1})
+        self.assertEqual(yields["a"]["rank"], 3)
+
+    def test_duplicates_and_unknown_selectors(self):
+        chain = SelectorChain("block", ["a", "a", "b"])
+        self.assertEqual(chain.selectors, ["a", "b"])
+        chain.record({"zzz": 4})
+        self.assertEqual(sum(y["hits"] for y in chain.yields().values()), 0)
+        with self.assertRaises(ValueError):
+            SelectorChain("empty", [])
+
+    def test_find_first_learns_to_try_the_hit_first(self):
+        try:
+            import selenium  # noqa: F401
+        except ImportError:
+            self.skipTest("selenium not installed")
+        chain = SelectorChain("snippet", ["div.old", "div.VwiC3b"])
+        block = FakeElement({"div.VwiC3b": ["snippet"]})
+        self.assertEqual(chain.find_first(block), "snippet")
+        self.assertEqual(block.lookups, 2)
+        block.lookups = 0
+        chain.find_first(block)
+        self.assertEqual(block.lookups, 1)
+
+
+class YieldingDriver:
+
+    def __init__(self):
+        self.args = None
+
+    def set_script_timeout(self, seconds):
+        pass
+
+    def execute_async_script(self, script, limit, blocks, snippets, timeout):
+        self.args = (blocks, snippets)
+        rows = [{"title": "T", "link": "https://a.com/", "snippet": "s"}]
+        return json.dumps({"rows": rows, "yield": {"blocks": {"div.g": 1}, "snippets": {"span.aCOpRe": 1}}})
+
+
+class TestExtractYield(unittest.TestCase):
+
+    def setUp(self):
+        saved = extract.BLOCK_CHAIN, extract.SNIPPET_CHAIN
+        self.addCleanup(lambda: setattr(extract, "BLOCK_CHAIN", saved[0])
+                        or setattr(extract, "SNIPPET_CHAIN", saved[1]))
+        extract.BLOCK_CHAIN = SelectorChain("block", extract.RESULT_BLOCK_SELECTORS)
+        extract.SNIPPET_CHAIN = SelectorChain("snippet", extract.SNIPPET_SELECTORS)
+
+    def test_script_reports_yield_and_chains_reorder(self):
+        driver = YieldingDriver()
+        extract.extract_results(driver)
+        self.assertEqual(driver.args[0], ["div.tF2Cxc", "div.MjjYud", "div.g"])
+        extract.extract_results(driver)
+        self.assertEqual(driver.args[0][0], "div.g")
+        self.assertEqual(driver.args[1][0], "span.aCOpRe")
+        yields = extract.selector_yields()
+        self.assertEqual(yields["block"]["div.g"]["hits"], 2)
+        self.assertEqual(yields["snippet"]["span.aCOpRe"]["hit_rate"], 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
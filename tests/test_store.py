@@ -0,0 +1,85 @@
+import importlib.util
+import json
+import os
+import tempfile
+import unittest
+
+from src.store import ResultStore, domain_of, import_files, load_result_file
+
+HAS_PYARROW = importlib.util.find_spec("pyarrow") is not None
+
+
+def rows(query, *links):
+    return [{"query": query, "position": i, "title": link, "link": link, "snippet": ""}
+            for i, link in enumerate(links, 1)]
+
+
+class TestLegacyFiles(unittest.TestCase):
+
+    def test_domain_of(self):
+        self.assertEqual(domain_of("https://WWW.Python.org/about"), "python.org")
+        self.assertEqual(domain_of("not a url"), "")
+
+    def test_load_result_file_fills_query_and_position(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "google_swe_results.json")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump([{"title": "a", "link": "https://a", "snippet": ""},
+                           {"title": "b", "link": "https://b", "snippet": ""}], f)
+            loaded = load_result_file(path)
+        self.assertEqual([r["query"] for r in loaded], ["google swe", "google swe"])
+        self.assertEqual([r["position"] for r in loaded], [1, 2])
+
+
+@unittest.skipUnless(HAS_PYARROW, "pyarrow not installed")
+class TestResultStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.root = os.path.join(self.tmp.name, "serp")
+
+    def test_partitions_and_column_reads(self):
+        with ResultStore(self.root) as store:
+            store.append(rows("python", "https://www.python.org/", "https://docs.python.org/"),
+                         backend="selenium", date="2024-05-01")
+            store.append(rows("java", "https://java.com/"), backend="serpapi", date="2024-06-01")
+        table = ResultStore(self.root).read(columns=["domain"], dates=("2024-05-01", "2024-05-31"))
+        self.assertEqual(table.column_names, ["domain"])
+        self.assertEqual(sorted(table.column("domain").to_pylist()), ["docs.python.org", "python.org"])
+        self.assertEqual(ResultStore(self.root).read(backends=["serpapi"]).num_rows, 1)
+
+    def test_compact_merges_small_files(self):
+        store = ResultStore(self.root)
+        for i in range(3):
+            store.append(rows(f"q{i}", f"https://x.com/{i}"), backend="selenium", date="2024-05-01")
+            store.flush()
+        self.assertEqual(store.stats()["files"], 3)
+        report = store.compact()
+        self.assertEqual(report, {"partitions": 1, "files_before": 3, "files_after": 1})
+        self.assertEqual(store.stats()["rows"], 3)
+
+    def test_rows_reach_disk_before_close(self):
+        store = ResultStore(self.root, flush_rows=2, flush_interval=3600)
+        store.append(rows("python", "https://a.com/", "https://b.com/", "https://c.com/"), backend="selenium")
+        self.assertEqual(store.files_written, 1)
+        store.flush_interval = 0
+        store.append(rows("java", "https://java.com/"), backend="serpapi")
+        self.assertEqual(ResultStore(self.root).read().num_rows, 4)
+
+    def test_import_skips_csv_twin_of_json(self):
+        legacy = os.path.join(self.tmp.name, "results")
+        os.makedirs(legacy)
+        for ext in ("json", "csv"):
+            with open(os.path.join(legacy, f"nit_results.{ext}"), "w", encoding="utf-8") as f:
+                if ext == "json":
+                    json.dump(rows("nit", "https://nit.ac.in/"), f)
+                else:
+                    f.write("title,snippet,link\nNIT,,https://nit.ac.in/\n")
+        store = ResultStore(self.root)
+        paths = [os.path.join(legacy, name) for name in os.listdir(legacy)]
+        self.assertEqual(import_files(store, paths), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import json
+import os
+import tempfile
+import unittest
+
+from src import tracing
+from src.tracing import Tracer, percentile, span
+
+
+class TestTracer(unittest.TestCase):
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 0.5), 50)
+        self.assertEqual(percentile(values, 0.99), 99)
+        self.assertEqual(percentile([3.0], 0.95), 3.0)
+        self.assertEqual(percentile([], 0.5), 0.0)
+
+    def test_nested_spans_are_linked_and_written(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "trace.jsonl")
+            tracer = Tracer(trace_path=path)
+            with tracer.span("fetch", query="python") as outer:
+                with tracer.span("navigate"):
+                    pass
+                outer.set(rows=10)
+            tracer.close()
+            with open(path, encoding="utf-8") as f:
+                navigate, fetch = [json.loads(line) for line in f]
+        self.assertEqual(navigate["parent"], fetch["span"])
+        self.assertIsNone(fetch["parent"])
+        self.assertEqual((fetch["query"], fetch["rows"], fetch["status"]), ("python", 10, "ok"))
+
+    def test_errors_are_recorded_and_raised(self):
+        tracer = Tracer()
+        with self.assertRaises(KeyError):
+            with tracer.span("extract"):
+                raise KeyError("x")
+        self.assertEqual(tracer.summary()["extract"]["errors"], 1)
+
+    def test_prometheus_textfile(self):
+        tracer = Tracer()
+        for _ in range(4):
+            with tracer.span("ready"):
+                pass
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "metrics", "scraper.prom")
+            tracer.write_prometheus(path)
+            with open(path, encoding="utf-8") as f:
+                text = f.read()
+        self.assertIn("# TYPE scraper_phase_seconds summary", text)
+        self.assertIn('scraper_phase_seconds{phase="ready",quantile="0.99"}', text)
+        self.assertIn('scraper_phase_seconds_count{phase="ready"} 4', text)
+        self.assertIn('scraper_phase_errors_total{phase="ready"} 0', text)
+
+    def test_module_span_uses_installed_tracer(self):
+        with span("noop") as s:
+            s.set(ignored=True)
+        tracer = Tracer()
+        tracing.install(tracer)
+        try:
+            with span("parse"):
+                pass
+        finally:
+            tracing.install(None)
+        self.assertEqual(list(tracer.summary()), ["parse"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+
+from src.urls import BloomFilter, UrlDeduper, canonicalize, dedup_key, unwrap_redirect
+
+
+class TestCanonicalize(unittest.TestCase):
+
+    def test_unwraps_redirects(self):
+        self.assertEqual(canonicalize("/url?q=https://a.com/x&sa=U&ved=2ah"), "https://a.com/x")
+        self.assertEqual(canonicalize("https://www.google.co.in/url?url=https://a.com/"), "https://a.com/")
+        self.assertEqual(unwrap_redirect("https://l.facebook.com/l.php?u=https%3A%2F%2Fa.com%2Fp"), "https://a.com/p")
+        self.assertEqual(canonicalize("/search?q=more"), "")
+
+    def test_strips_tracking_and_normalizes_host(self):
+        self.assertEqual(canonicalize("HTTPS://WWW.Example.com:443/a?utm_source=x&id=1&srsltid=y#top"),
+                         "https://www.example.com/a?id=1")
+        self.assertEqual(canonicalize("http://example.com:8080"), "http://example.com:8080/")
+        self.assertEqual(canonicalize("https://bücher.de/"), "https://xn--bcher-kva.de/")
+
+    def test_keeps_query_encoding(self):
+        self.assertEqual(canonicalize("https://a.com/s?q=a%2Fb&gclid=1"), "https://a.com/s?q=a%2Fb")
+
+    def test_rejects_non_http(self):
+        for url in ["", None, "mailto:a@b.com", "javascript:void(0)", "https://"]:
+            self.assertEqual(canonicalize(url), "")
+
+    def test_dedup_key_merges_variants(self):
+        variants = ["https://www.a.com/x/", "http://a.com/x", "https://a.com/x?utm_medium=cpc",
+                    "/url?q=https://a.com/x"]
+        self.assertEqual({dedup_key(u) for u in variants}, {"a.com/x"})
+        self.assertEqual(dedup_key("https://a.com/x?b=2&a=1"), dedup_key("https://a.com/x?a=1&b=2"))
+        self.assertNotEqual(dedup_key("https://a.com/x"), dedup_key("https://a.com/y"))
+
+
+class TestUrlDeduper(unittest.TestCase):
+
+    def test_exact(self):
+        seen = UrlDeduper()
+        rows = [{"link": "https://www.a.com/"}, {"link": "https://a.com"}, {"link": "https://b.com/"}, {"link": ""}]
+        self.assertEqual([r["link"] for r in seen.filter(rows)], ["https://www.a.com/", "https://b.com/"])
+        self.assertIn("http://a.com/", seen)
+        self.assertEqual(seen.stats(), {"mode": "exact", "unique": 2, "duplicates": 1})
+
+    def test_bloom_has_no_false_negatives_and_few_false_positives(self):
+        seen = UrlDeduper(capacity=5000, error_rate=0.01)
+        urls = [f"https://a.com/{i}" for i in range(5000)]
+        for url in urls:
+            seen.add(url)
+        self.assertTrue(all(url in seen for url in urls))
+        false_positives = sum(f"https://b.com/{i}" in seen for i in range(5000))
+        self.assertLess(false_positives, 150)
+        self.assertEqual(seen.stats()["mode"], "bloom")
+
+    def test_bloom_sizing(self):
+        bloom = BloomFilter(1_000_000, 0.001)
+        self.assertEqual(bloom.hashes, 10)
+        self.assertLess(len(bloom.bits), 2_000_000)
+        with self.assertRaises(ValueError):
+            BloomFilter(10, 1.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import unittest
+
+from src.waits import WaitRecorder, wait_for_selector, wait_ready, wait_until
+
+
+class FakeDriver:
+    def __init__(self, ok=True):
+        self.ok = ok
+        self.calls = []
+
+    def set_script_timeout(self, seconds):
+        self.timeout = seconds
+
+    def execute_async_script(self, script, selector, quiet_ms, timeout_ms):
+        self.calls.append((selector, quiet_ms, timeout_ms))
+        return {"ok": self.ok, "matched": self.ok, "waited_ms": 12}
+
+
+class TestWaits(unittest.TestCase):
+
+    def test_wait_ready_records_phase(self):
+        driver = FakeDriver()
+        recorder = WaitRecorder()
+
+        self.assertTrue(wait_ready(driver, selector="#search h3", quiet_ms=200, timeout=5, recorder=recorder))
+
+        self.assertEqual(driver.calls, [("#search h3", 200, 5000)])
+        summary = recorder.summary()
+        self.assertEqual(summary["ready"]["count"], 1)
+        self.assertEqual(summary["ready"]["timeouts"], 0)
+
+    def test_timeout_is_reported_not_raised(self):
+        recorder = WaitRecorder()
+        self.assertFalse(wait_for_selector(FakeDriver(ok=False), "h3", timeout=1, recorder=recorder))
+        self.assertEqual(recorder.summary()["selector"]["timeouts"], 1)
+
+    def test_wait_until(self):
+        calls = iter([None, None, "handle"])
+        self.assertEqual(wait_until(lambda: next(calls), timeout=1, poll=0), "handle")
+        with self.assertRaises(TimeoutError):
+            wait_until(lambda: False, timeout=0.01, poll=0)
+
+    def test_phase_context(self):
+        recorder = WaitRecorder()
+        with recorder.phase("navigate"):
+            pass
+        with recorder.phase("navigate"):
+            pass
+        self.assertEqual(recorder.summary()["navigate"]["count"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import csv
+import json
+import os
+import tempfile
+import unittest
+
+from src.writers import CsvWriter, JsonArrayWriter, NdjsonWriter, open_writer
+
+
+def read(path):
+    with open(path, encoding="utf-8", newline="") as f:
+        return f.read()
+
+
+class TestWriters(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def path(self, name):
+        return os.path.join(self.tmp.name, "out", name)
+
+    def test_ndjson_flushes_in_batches(self):
+        path = self.path("rows.ndjson")
+        writer = NdjsonWriter(path, flush_every=3, flush_interval=60)
+        writer.write_many({"i": i} for i in range(4))
+        self.assertEqual(len(read(path).splitlines()), 3)
+        writer.close()
+        self.assertEqual([json.loads(line)["i"] for line in read(path).splitlines()], [0, 1, 2, 3])
+        self.assertEqual(writer.flushes, 2)
+
+    def test_flush_interval(self):
+        path = self.path("rows.ndjson")
+        with NdjsonWriter(path, flush_every=1000, flush_interval=0) as writer:
+            writer.write({"i": 1})
+            self.assertEqual(read(path), '{"i": 1}\n')
+
+    def test_csv_appends_without_repeating_header(self):
+        path = self.path("leads.csv")
+        with CsvWriter(path) as writer:
+            writer.write({"title": "a", "position": 1, "link": "x", "snippet": "", "query": "q"})
+        with CsvWriter(path) as writer:
+            writer.write({"position": 2, "title": "b", "link": "y", "snippet": "", "query": "q", "extra": 1})
+        with open(path, encoding="utf-8", newline="") as f:
+            rows = list(csv.reader(f))
+        self.assertEqual(rows[0], ["position", "title", "link", "snippet", "query"])
+        self.assertEqual([r[1] for r in rows[1:]], ["a", "b"])
+
+    def test_json_array_is_valid_after_close(self):
+        path = self.path("rows.json")
+        with JsonArrayWriter(path, flush_every=1) as writer:
+            writer.write({"i": 1})
+            writer.write({"i": 2})
+        self.assertEqual(json.loads(read(path)), [{"i": 1}, {"i": 2}])
+        JsonArrayWriter(path).close()
+        self.assertEqual(json.loads(read(path)), [])
+
+    def test_interrupt_still_closes_file(self):
+        path = self.path("rows.json")
+        with self.assertRaises(KeyboardInterrupt):
+            with open_writer(path) as writer:
+                writer.write({"i": 1})
+                raise KeyboardInterrupt
+        self.assertEqual(json.loads(read(path)), [{"i": 1}])
+        with self.assertRaises(ValueError):
+            writer.write({"i": 2})
+
+    def test_open_writer_picks_format(self):
+        for name, cls in [("a.csv", CsvWriter), ("a.jsonl", NdjsonWriter), ("a.json", JsonArrayWriter),
+                          ("a.txt", NdjsonWriter)]:
+            writer = open_writer(self.path(name))
+            writer.close()
+            self.assertIsInstance(writer, cls)
+        with self.assertRaises(ValueError):
+            open_writer(self.path("a.csv"), "xml")
+
+
+if __name__ == "__main__":
+    unittest.main()